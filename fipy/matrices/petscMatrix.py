@@ -5,12 +5,114 @@ __docformat__ = 'restructuredtext'
 
 __all__ = []
 
+import weakref
+
 from petsc4py import PETSc
 
 from fipy.tools import numerix
 from fipy.matrices.sparseMatrix import (_SparseMatrix, _RowMesh2Matrix,
                                         _ColMesh2Matrix, _RowColMesh2Matrix)
 
+class _PETScSparsityPattern(object):
+    """Local nonzero structure of a `_PETScMatrix` assembled from triplets
+
+    Holds the CSR `indptr` and `indices` of the rows owned by this
+    process, the map that scatters each triplet into the CSR values, and
+    a `template` matrix, preallocated for exactly this structure.
+    Matrices with the same (`id1`, `id2`) structure are assembled by
+    duplicating the structure of the `template`, without its values, and
+    inserting the summed triplet values with a single `setValuesCSR`, so
+    that PETSc neither has to guess the preallocation nor allocate more
+    memory during assembly.
+
+    >>> L = _PETScMatrixFromShape(rows=2, cols=3)
+    >>> pattern = _PETScSparsityPattern(id1=[1, 0, 1, 0], id2=[1, 2, 1, 0],
+    ...                                 matrix=L.matrix)
+    >>> print(numerix.asarray(pattern.indptr))
+    [0 2 3]
+    >>> print(numerix.asarray(pattern.indices))
+    [0 2 1]
+    >>> L.matrix = pattern.assemble([1., 2., 3., 4.])
+    >>> print(L)
+     4.000000      ---     2.000000  
+        ---     4.000000      ---    
+    >>> print(pattern.matches(id1=[1, 0, 1, 0], id2=[1, 2, 1, 0], matrix=L.matrix))
+    True
+    >>> print(pattern.matches(id1=[1, 0, 1, 0], id2=[1, 2, 0, 0], matrix=L.matrix))
+    False
+    """
+
+    def __init__(self, id1, id2, matrix):
+        """
+        :Parameters:
+          - `id1`: The global row indices of the triplets.
+          - `id2`: The global column indices of the triplets.
+          - `matrix`: A `PETSc.Mat` with the sizes and the distribution
+            of the matrices to assemble.
+        """
+        self.id1 = numerix.array(id1, dtype=numerix.int64)
+        self.id2 = numerix.array(id2, dtype=numerix.int64)
+        self.sizes = matrix.getSizes()
+
+        (rows, globalRows), (cols, globalCols) = self.sizes
+        start_row, end_row = matrix.getOwnershipRange()
+
+        # each process only assembles the rows it owns
+        self.local = (self.id1 >= start_row) & (self.id1 < end_row)
+
+        keys, self.scatter = numerix.unique((self.id1[self.local] - start_row) * globalCols
+                                            + self.id2[self.local],
+                                            return_inverse=True)
+        self.scatter = self.scatter.ravel()
+        self.nnz = len(keys)
+
+        counts = numerix.bincount(keys // globalCols, minlength=end_row - start_row)
+        # note: PETSc (at least via pip) only seems to handle 32 bit addressing
+        self.indptr = numerix.concatenate(([0], numerix.cumsum(counts))).astype('int32')
+        self.indices = (keys % globalCols).astype('int32')
+
+        self.template = PETSc.Mat().createAIJ(size=self.sizes,
+                                              csr=(self.indptr, self.indices,
+                                                   numerix.zeros((self.nnz,), 'd')),
+                                              comm=matrix.comm)
+        self.template.assemble()
+
+    def __del__(self):
+        self.template.destroy()
+
+    def matches(self, id1, id2, matrix):
+        """Whether triplets at (`id1`, `id2`) of `matrix` have this structure"""
+        return (matrix.getSizes() == self.sizes
+                and len(id1) == len(self.id1)
+                and numerix.array_equal(id1, self.id1)
+                and numerix.array_equal(id2, self.id2))
+
+    def assemble(self, vector):
+        """Sum triplet values into a new matrix with this structure
+
+        :Parameters:
+          - `vector`: The triplet values, in the order of `id1` and `id2`.
+
+        :Returns:
+          The assembled `PETSc.Mat`.
+        """
+        data = numerix.bincount(self.scatter,
+                                weights=numerix.asarray(vector, dtype=float)[self.local],
+                                minlength=self.nnz)
+
+        # the structure, with zero values
+        matrix = self.template.duplicate(copy=False)
+        # allow later insertions outside the structure, e.g., by `put()`
+        matrix.setOption(matrix.Option.NEW_NONZERO_ALLOCATION_ERR, False)
+        matrix.setValuesCSR(self.indptr, self.indices, data)
+        matrix.assemble()
+
+        return matrix
+
+# Sparsity patterns seen for each mesh, most recently used first
+_sparsityPatterns = weakref.WeakKeyDictionary()
+_maxSparsityPatterns = 16
+
 class _PETScMatrix(_SparseMatrix):
 
     def __init__(self, matrix):
@@ -25,7 +127,53 @@ class _PETScMatrix(_SparseMatrix):
         self.matrix = matrix
 
     def __del__(self):
-        self.matrix.destroy()
+        if hasattr(self, "_matrix"):
+            self._matrix.destroy()
+
+    @property
+    def matrix(self):
+        """The internal PETSc `Mat`
+
+        Contributions from `addAt()` are held as triplets until the
+        matrix is needed, then assembled all at once.
+        """
+        if self._triplets:
+            self._assemble()
+        return self._matrix
+
+    @matrix.setter
+    def matrix(self, matrix):
+        self._triplets = []
+        # whether `_matrix` is still empty, as created
+        self._pristine = False
+        # the `_PETScSparsityPattern` that `_matrix` has exactly the
+        # structure of, if known
+        self._sparsityPattern = None
+        self._matrix = matrix
+
+    @matrix.deleter
+    def matrix(self):
+        self._triplets = []
+        del self._matrix
+
+    def _getSparsityPattern(self, id1, id2):
+        return _PETScSparsityPattern(id1=id1, id2=id2, matrix=self._matrix)
+
+    def _assemble(self):
+        vector, id1, id2 = [numerix.concatenate(v) for v in zip(*self._triplets)]
+        self._triplets = []
+
+        if self._pristine:
+            pattern = self._getSparsityPattern(id1, id2)
+            matrix = pattern.assemble(vector)
+            self._matrix.destroy()
+            self.matrix = matrix
+            self._sparsityPattern = pattern
+        else:
+            self._matrix.assemble(self._matrix.AssemblyType.FLUSH)
+            self._matrix.setValuesCSR(*self._ijv2csr(id2, id1, vector),
+                                      addv=True)
+            self._sparsityPattern = None
 
     def copy(self):
         return _PETScMatrix(matrix=self.matrix.copy())
@@ -43,10 +191,22 @@ class _PETScMatrix(_SparseMatrix):
         return _SparseMatrix.__str__(self)
 
     def __iadd__(self, other):
-        self.matrix.assemble()
-        if other != 0:
+        return self._iadd(other)
+
+    def _iadd(self, other, sign=1):
+        if (isinstance(other, _PETScMatrix)
+            and other._pristine
+            and other._matrix.getSizes() == self._matrix.getSizes()):
+            # defer assembly by collecting the other matrix's triplets
+            self._triplets += [(sign * vector, id1, id2)
+                               for (vector, id1, id2) in other._triplets]
+        elif other != 0:
+            self.matrix.assemble()
             other.matrix.assemble()
-            self.matrix = self.matrix + other.matrix
+            if sign > 0:
+                self.matrix = self.matrix + other.matrix
+            else:
+                self.matrix = self.matrix - other.matrix
         return self
 
     def __add__(self, other):
@@ -93,11 +253,7 @@ class _PETScMatrix(_SparseMatrix):
         return -self + other
 
     def __isub__(self, other):
-        if other != 0:
-            self.matrix.assemble()
-            other.matrix.assemble()
-            self.matrix = self.matrix - other.matrix
-        return self
+        return self._iadd(other, sign=-1)
 
     def __mul__(self, other):
         """
@@ -175,7 +331,7 @@ class _PETScMatrix(_SparseMatrix):
 
     @property
     def _shape(self):
-        return self.matrix.sizes[0][0], self.matrix.sizes[1][1]
+        return self._matrix.sizes[0][0], self._matrix.sizes[1][1]
 
     @property
     def _range(self):
@@ -194,6 +350,8 @@ class _PETScMatrix(_SparseMatrix):
         """
         self.matrix.assemble(self.matrix.AssemblyType.FLUSH)
         self.matrix.setValuesCSR(*self._ijv2csr(id2, id1, vector))
+        self._pristine = False
+        self._sparsityPattern = None
 
     def _ijv2csr(self, i, j, v):
         """Convert arrays of matrix indices and values into CSR format
@@ -226,7 +384,7 @@ class _PETScMatrix(_SparseMatrix):
         i = numerix.asarray(i)
         j = numerix.asarray(j)
         v = numerix.asarray(v)
-        start_row, end_row = self.matrix.getOwnershipRange()
+        start_row, end_row = self._matrix.getOwnershipRange()
 
         ix = numerix.lexsort([i, j])
         ix = ix[(j[ix] >= start_row) & (j[ix] < end_row)]
@@ -287,9 +445,9 @@ class _PETScMatrix(_SparseMatrix):
                 ---     3.141593   2.960000  
              2.500000      ---     2.200000  
         """
-        self.matrix.assemble(self.matrix.AssemblyType.FLUSH)
-        self.matrix.setValuesCSR(*self._ijv2csr(id2, id1, vector),
-                                 addv=True)
+        self._triplets.append((numerix.array(vector, dtype=float).ravel(),
+                               numerix.asarray(id1).ravel(),
+                               numerix.asarray(id2).ravel()))
 
     def addAtDiagonal(self, vector):
         if isinstance(vector, (int, float)):
@@ -510,8 +668,12 @@ class _PETScMatrixFromShape(_PETScMatrix):
             matrix.setUp()
 #             matrix.setPreallocationNNZ(bandwidth) # FIXME: ??? None, bandwidth
 #             matrix.setOption(matrix.Option.NEW_NONZERO_ALLOCATION_ERR, False)
+            pristine = True
+        else:
+            pristine = False
 
         super(_PETScMatrixFromShape, self).__init__(matrix=matrix)
+        self._pristine = pristine
 
 class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
     def __init__(self, mesh, rows, cols, m2m, bandwidth=0, sizeHint=None, matrix=None):
@@ -596,7 +758,50 @@ class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
         """
         return self._ao.app2petsc(ids.astype('int32'))
 
-    def _fipy2petscGhost(self, var):
+    def _getSparsityPattern(self, id1, id2):
+        """Reuse the structure of a previous assembly on the same mesh
+
+        Terms rebuild their matrices from scratch on every sweep, but the
+        positions they contribute to only change if the mesh or the
+        composition of the equation changes.
+
+        >>> from fipy import Grid1D
+        >>> mesh = Grid1D(nx=3)
+        >>> for sweep in range(2):
+        ...     L = _PETScMeshMatrix(mesh=mesh)
+        ...     L.addAt([1., 2., 3.], [0, 1, 2], [0, 1, 2])
+        ...     L.addAt([4., 5.], [0, 1], [1, 2])
+        ...     print(L.matrix.getInfo()["nz_allocated"] == L.matrix.getInfo()["nz_used"])
+        True
+        True
+        >>> print(len(_sparsityPatterns[mesh]))
+        1
+        >>> print(L._sparsityPattern is _sparsityPatterns[mesh][0])
+        True
+        >>> print(L) # doctest: +SERIAL
+         1.000000   4.000000      ---    
+            ---     2.000000   5.000000  
+            ---        ---     3.000000  
+        """
+        patterns = _sparsityPatterns.setdefault(self.mesh, [])
+
+        for i, pattern in enumerate(patterns):
+            if pattern.matches(id1, id2, self._matrix):
+                break
+        else:
+            i = None
+
+        # creating a pattern is collective, so every process must agree
+        if self.mesh.communicator.all(numerix.array(i is not None)):
+            patterns.insert(0, patterns.pop(i))
+        else:
+            pattern = _PETScSparsityPattern(id1=id1, id2=id2, matrix=self._matrix)
+            patterns.insert(0, pattern)
+            del patterns[_maxSparsityPatterns:]
+
+        return pattern
+
+    def _fipy2petscGhost(self, var, vec=None):
         """Convert a FiPy Variable to a PETSc `GhostVec`
 
         Moves the ghosts to the end, as necessary.
@@ -622,16 +827,24 @@ class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
         v02 v03 v12 v13 (v01) (v11)   [1, 3]  processor 1
         ```
 
-        where the [a, b] are the global ghost indices
+        where the [a, b] are the global ghost indices.
+
+        If `vec` is a `GhostVec` obtained from an earlier conversion with
+        the same mesh and matrix layout, its values are replaced, rather
+        than creating a new one.
         """
         corporeal = numerix.asarray(var[..., self._m2m.bodies]).ravel()
         incorporeal = numerix.asarray(var[..., ~self._m2m.bodies]).ravel()
         array = numerix.concatenate([corporeal, incorporeal])
 
-        comm = self.mesh.communicator.petsc4py_comm
-        vec = PETSc.Vec().createGhostWithArray(ghosts=self._m2m.ghosts.astype('int32'),
-                                               array=array,
-                                               comm=comm)
+        if vec is None:
+            comm = self.mesh.communicator.petsc4py_comm
+            vec = PETSc.Vec().createGhostWithArray(ghosts=self._m2m.ghosts.astype('int32'),
+                                                   array=array,
+                                                   comm=comm)
+        else:
+            with vec.localForm() as lf:
+                lf.setArray(array)
 
         return vec
 
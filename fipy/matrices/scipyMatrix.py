@@ -4,11 +4,89 @@ __docformat__ = 'restructuredtext'
 
 __all__ = []
 
+import weakref
+
 import scipy.sparse as sp
 from fipy.tools import numerix
 
 from fipy.matrices.sparseMatrix import _SparseMatrix
 
+class _ScipySparsityPattern(object):
+    """Symbolic structure of a `_ScipyMatrix` assembled from COO triplets.
+
+    Holds the CSR `indptr` and `indices` of the assembled matrix, together
+    with the map that scatters each triplet into the CSR `data` array, so
+    that matrices with the same (`id1`, `id2`) structure can be assembled
+    with a single `bincount`, without sorting or reallocating the
+    structure.
+
+    >>> pattern = _ScipySparsityPattern(id1=[1, 0, 1, 0], id2=[1, 2, 1, 0],
+    ...                                 shape=(2, 3))
+    >>> print(pattern.indptr)
+    [0 2 3]
+    >>> print(pattern.indices)
+    [0 2 1]
+    >>> print(pattern.assemble([1., 2., 3., 4.]).toarray())
+    [[ 4.  0.  2.]
+     [ 0.  4.  0.]]
+    >>> print(pattern.matches(id1=[1, 0, 1, 0], id2=[1, 2, 1, 0], shape=(2, 3)))
+    True
+    >>> print(pattern.matches(id1=[1, 0, 1, 0], id2=[1, 2, 0, 0], shape=(2, 3)))
+    False
+    """
+
+    def __init__(self, id1, id2, shape):
+        self.id1 = numerix.array(id1, dtype=numerix.int64)
+        self.id2 = numerix.array(id2, dtype=numerix.int64)
+        self.shape = tuple(shape)
+
+        rows, cols = self.shape
+        keys, self.scatter = numerix.unique(self.id1 * cols + self.id2,
+                                            return_inverse=True)
+        self.scatter = self.scatter.ravel()
+        self.nnz = len(keys)
+
+        if max(rows, cols, self.nnz) < 2**31:
+            indexType = numerix.int32
+        else:
+            indexType = numerix.int64
+
+        counts = numerix.bincount(keys // cols, minlength=rows)
+        self.indptr = numerix.concatenate(([0], numerix.cumsum(counts))).astype(indexType)
+        self.indices = (keys % cols).astype(indexType)
+
+    def matches(self, id1, id2, shape):
+        """Whether triplets at (`id1`, `id2`) have this structure"""
+        return (tuple(shape) == self.shape
+                and len(id1) == len(self.id1)
+                and numerix.array_equal(id1, self.id1)
+                and numerix.array_equal(id2, self.id2))
+
+    def assemble(self, vector):
+        """Scatter-add triplet values into a new CSR matrix
+
+        Parameters
+        ----------
+        vector : array_like
+            The triplet values, in the order of `id1` and `id2`.
+
+        Returns
+        -------
+        ~scipy.sparse.csr_matrix
+        """
+        data = numerix.bincount(self.scatter,
+                                weights=numerix.asarray(vector, dtype=float),
+                                minlength=self.nnz)
+        matrix = sp.csr_matrix((data, self.indices.copy(), self.indptr.copy()),
+                               shape=self.shape)
+        matrix.has_canonical_format = True
+
+        return matrix
+
+# Sparsity patterns seen for each mesh, most recently used first
+_sparsityPatterns = weakref.WeakKeyDictionary()
+_maxSparsityPatterns = 16
+
 class _ScipyMatrix(_SparseMatrix):
 
     """class wrapper for a scipy sparse matrix.
@@ -30,6 +108,40 @@ class _ScipyMatrix(_SparseMatrix):
 
         super(_ScipyMatrix, self).__init__()
 
+    @property
+    def matrix(self):
+        """The internal SciPy matrix
+
+        Contributions from `addAt()` are held as COO triplets until the
+        matrix is needed, then assembled all at once.
+        """
+        if self._triplets:
+            self._assemble()
+        return self._matrix
+
+    @matrix.setter
+    def matrix(self, matrix):
+        self._triplets = []
+        self._matrix = matrix
+
+    @matrix.deleter
+    def matrix(self):
+        self._triplets = []
+        del self._matrix
+
+    def _getSparsityPattern(self, id1, id2):
+        return _ScipySparsityPattern(id1=id1, id2=id2, shape=self._matrix.shape)
+
+    def _assemble(self):
+        vector, id1, id2 = [numerix.concatenate(v) for v in zip(*self._triplets)]
+        self._triplets = []
+
+        matrix = self._getSparsityPattern(id1, id2).assemble(vector)
+        if self._matrix.nnz > 0:
+            matrix = self._matrix + matrix
+
+        self._matrix = matrix
+
     def copy(self):
         return _ScipyMatrix(matrix=self.matrix.copy())
 
@@ -44,7 +156,13 @@ class _ScipyMatrix(_SparseMatrix):
         return self._iadd(other)
 
     def _iadd(self, other, sign=1):
-        if hasattr(other, "matrix"):
+        if (isinstance(other, _ScipyMatrix)
+            and other._shape == self._shape
+            and other._matrix.nnz == 0):
+            # defer assembly by collecting the other matrix's triplets
+            self._triplets += [(sign * vector, id1, id2)
+                               for (vector, id1, id2) in other._triplets]
+        elif hasattr(other, "matrix"):
             self.matrix = self.matrix + (sign * other.matrix)
         elif isinstance(other, (float, int)):
             fillVec = numerix.repeat(other, self.matrix.nnz)
@@ -157,7 +275,7 @@ class _ScipyMatrix(_SparseMatrix):
 
     @property
     def _shape(self):
-        return self.matrix.shape
+        return self._matrix.shape
 
     @property
     def _range(self):
@@ -249,9 +367,9 @@ class _ScipyMatrix(_SparseMatrix):
         """
         assert len(id1) == len(id2) == len(vector)
 
-        temp = sp.csr_matrix((vector, (id1, id2)), self.matrix.shape)
-
-        self.matrix = self.matrix + temp
+        self._triplets.append((numerix.array(vector, dtype=float).ravel(),
+                               numerix.asarray(id1).ravel(),
+                               numerix.asarray(id2).ravel()))
 
     def addAtDiagonal(self, vector):
         if isinstance(vector, (int, float)):
@@ -429,6 +547,43 @@ class _ScipyBaseMeshMatrix(_ScipyMatrixFromShape):
                                                    matrix=matrix,
                                                    storeZeros=storeZeros)
 
+    def _getSparsityPattern(self, id1, id2):
+        """Reuse the structure of a previous assembly on the same mesh
+
+        Terms rebuild their matrices from scratch on every sweep, but the
+        positions they contribute to only change if the mesh or the
+        composition of the equation changes.
+
+        >>> from fipy import Grid1D
+        >>> mesh = Grid1D(nx=3)
+        >>> for sweep in range(2):
+        ...     L = _ScipyMeshMatrix(mesh=mesh)
+        ...     L.addAt([1., 2., 3.], [0, 1, 2], [0, 1, 2])
+        ...     L.addAt([4., 5.], [0, 1], [1, 2])
+        ...     print(L.matrix.nnz)
+        5
+        5
+        >>> print(len(_sparsityPatterns[mesh]))
+        1
+        >>> print(L)
+         1.000000   4.000000      ---    
+            ---     2.000000   5.000000  
+            ---        ---     3.000000  
+        """
+        patterns = _sparsityPatterns.setdefault(self.mesh, [])
+        shape = self._matrix.shape
+
+        for i, pattern in enumerate(patterns):
+            if pattern.matches(id1, id2, shape):
+                patterns.insert(0, patterns.pop(i))
+                break
+        else:
+            pattern = _ScipySparsityPattern(id1=id1, id2=id2, shape=shape)
+            patterns.insert(0, pattern)
+            del patterns[_maxSparsityPatterns:]
+
+        return pattern
+
     def _getGhostedValues(self, var):
         """Obtain current ghost values from across processes
 
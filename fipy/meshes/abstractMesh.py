@@ -8,6 +8,8 @@ __all__ = ["AbstractMesh"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
+import itertools
+
 from fipy.tools import serialComm
 from fipy.tools import numerix
 from fipy.tools.decorators import deprecate
@@ -36,6 +38,13 @@ class AbstractMesh(object):
     def _setGeometry(self):
         raise NotImplementedError
 
+    def _calcAllGeometry(self):
+        """Calculate all the geometry that has not been calculated yet
+
+        Meshes that calculate their geometry eagerly have nothing to do.
+        """
+        pass
+
     """
     Scale business
     """
@@ -64,6 +73,14 @@ class AbstractMesh(object):
     def getNearestCell(self, point):
         return self._getCellsByID([self._getNearestCellID(point)])[0]
 
+    def _getContainingCellID(self, points):
+        """IDs of the cells that contain `points`
+
+        The cells of a uniform grid are the Voronoi cells of their
+        centers, so the nearest cell is the one that contains the point.
+        """
+        return self._getNearestCellID(points)
+
     def _getCellFaceIDsInternal(self):
         return self._cellFaceIDs
 
@@ -201,6 +218,10 @@ class AbstractMesh(object):
            True
 
         """
+        ## the geometry is changed in place below, and only what depends
+        ## on the connection is recalculated
+        self._calcAllGeometry()
+
         ## check for errors
 
         ## check that faces are members of exterior faces
@@ -247,15 +268,17 @@ class AbstractMesh(object):
         ## get the cells adjacent to faces1
         faceCellIDs = MA.take(self.faceCellIDs[0], faces1)
         ## get all the adjacent faces for those particular cells
-        cellFaceIDs = numerix.take(self.cellFaceIDs, faceCellIDs, axis=1)
+        allCellFaceIDs = self.cellFaceIDs.copy()
+        cellFaceIDs = numerix.take(allCellFaceIDs, faceCellIDs, axis=1)
         for i in range(cellFaceIDs.shape[0]):
             ## if the faces is a member of faces1 then change the face to point at
             ## faces0
             cellFaceIDs[i] = MA.where(cellFaceIDs[i] == faces1,
                                       faces0,
                                       cellFaceIDs[i])
-            ## add those faces back to the main self.cellFaceIDs
-            numerix.put(self.cellFaceIDs[i], faceCellIDs, cellFaceIDs[i])
+            ## add those faces back to the cell faces
+            numerix.put(allCellFaceIDs[i], faceCellIDs, cellFaceIDs[i])
+        self.cellFaceIDs = allCellFaceIDs
 
         ## calculate new topology
         self._setTopology()
@@ -344,16 +367,12 @@ class AbstractMesh(object):
         self_XvertexCoords = selfc.vertexCoords[..., self_Xvertices]
         other_XvertexCoords = otherc.vertexCoords[..., other_Xvertices]
 
-        closest = numerix.nearest(self_XvertexCoords, other_XvertexCoords)
-
-        # just because they're closest, doesn't mean they're close
-        tmp = self_XvertexCoords[..., closest] - other_XvertexCoords
-        distance = numerix.sqrtDot(tmp, tmp)
         # only want vertex pairs that are 100x closer than the smallest
         # cell-to-cell distance
-        close = distance < resolution * min(selfc._cellToCellDistances.min(),
-                                            otherc._cellToCellDistances.min())
-        vertexCorrelates = numerix.array((self_Xvertices[closest[close]],
+        tolerance = resolution * min(selfc._cellToCellDistances.min(),
+                                     otherc._cellToCellDistances.min())
+        closest, close = _weldVertices(self_XvertexCoords, other_XvertexCoords, tolerance)
+        vertexCorrelates = numerix.array((self_Xvertices[closest],
                                           other_Xvertices[close]))
 
         # warn if meshes don't touch, but allow it
@@ -384,12 +403,16 @@ class AbstractMesh(object):
             self_faceVertexIDs = MA.masked_values(self_faceVertexIDs, -1)
 
         # want self's Faces for which all faceVertexIDs are in vertexCorrelates
-        self_matchingFaces = numerix.in1d(self_faceVertexIDs,
-                                          vertexCorrelates[0]).reshape(self_faceVertexIDs.shape).all(axis=0).nonzero()[0]
+        self_filled = MA.filled(self_faceVertexIDs, -1)
+        self_matchingFaces = ((self_filled == -1)
+                              | numerix.in1d(self_filled,
+                                             vertexCorrelates[0]).reshape(self_filled.shape)).all(axis=0).nonzero()[0]
 
         # want other's Faces for which all faceVertexIDs are in vertexCorrelates
-        other_matchingFaces = numerix.in1d(other_faceVertexIDs,
-                                           vertexCorrelates[1]).reshape(other_faceVertexIDs.shape).all(axis=0).nonzero()[0]
+        other_filled = MA.filled(other_faceVertexIDs, -1)
+        other_matchingFaces = ((other_filled == -1)
+                               | numerix.in1d(other_filled,
+                                              vertexCorrelates[1]).reshape(other_filled.shape)).all(axis=0).nonzero()[0]
 
         # map other's Vertex IDs to new Vertex IDs,
         # accounting for overlaps with self's Vertex IDs
@@ -398,41 +421,17 @@ class AbstractMesh(object):
         vertex_map[verticesToAdd] = numerix.arange(otherNumVertices - len(vertexCorrelates[1])) + selfNumVertices
         vertex_map[vertexCorrelates[1]] = vertexCorrelates[0]
 
-        # calculate hashes of faceVertexIDs for comparing Faces
-
-        if self_matchingFaces.shape[-1] == 0:
-            self_faceHash = numerix.empty(self_matchingFaces.shape[:-1] + (0,), dtype="str")
-        else:
-            # sort each of self's Face's vertexIDs for canonical comparison
-            self_faceHash = numerix.sort(self_faceVertexIDs[..., self_matchingFaces], axis=0)
-            # then hash the Faces for comparison (NumPy set operations are only for 1D arrays)
-            self_faceHash = numerix.apply_along_axis(str, axis=0, arr=self_faceHash)
-
-        face_sort = numerix.argsort(self_faceHash)
-        self_faceHash = self_faceHash[face_sort]
-        self_matchingFaces = self_matchingFaces[face_sort]
-
-        if other_matchingFaces.shape[-1] == 0:
-            other_faceHash = numerix.empty(other_matchingFaces.shape[:-1] + (0,), dtype="str")
-        else:
-            # convert each of other's Face's vertexIDs to new IDs
-            other_faceHash = vertex_map[other_faceVertexIDs[..., other_matchingFaces]]
-            # sort each of other's Face's vertexIDs for canonical comparison
-            other_faceHash = numerix.sort(other_faceHash, axis=0)
-            # then hash the Faces for comparison (NumPy set operations are only for 1D arrays)
-            other_faceHash = numerix.apply_along_axis(str, axis=0, arr=other_faceHash)
-
-        face_sort = numerix.argsort(other_faceHash)
-        other_faceHash = other_faceHash[face_sort]
-        other_matchingFaces = other_matchingFaces[face_sort]
+        # convert each of other's Face's vertexIDs to new IDs
+        other_matchingVertexIDs = other_filled[..., other_matchingFaces]
+        other_matchingVertexIDs = numerix.where(other_matchingVertexIDs == -1,
+                                                -1,
+                                                vertex_map[other_matchingVertexIDs])
 
-        self_matchingFaces = self_matchingFaces[numerix.in1d(self_faceHash,
-                                                             other_faceHash)]
-        other_matchingFaces = other_matchingFaces[numerix.in1d(other_faceHash,
-                                                               self_faceHash)]
+        self_matched, other_matched = _matchFaces(self_filled[..., self_matchingFaces],
+                                                  other_matchingVertexIDs)
 
-        faceCorrelates = numerix.array((self_matchingFaces,
-                                        other_matchingFaces))
+        faceCorrelates = numerix.array((self_matchingFaces[self_matched],
+                                        other_matchingFaces[other_matched]))
 
         # warn if meshes don't touch, but allow it
         if (selfc.numberOfFaces > 0
@@ -505,6 +504,116 @@ class AbstractMesh(object):
         else:
             return self._maxFacesPerCell * numerix.ones(cellFaceIDs.shape[-1], 'l')
 
+    @property
+    def _cellFaceIDsCSR(self):
+        """Faces of each cell in compressed sparse row form
+
+        Unlike `cellFaceIDs`, which is padded to the largest number of
+        faces of any cell, the faces of cell `i` are
+        `faceIDs[offsets[i]:offsets[i + 1]]`, with outward orientations
+        `orientations[offsets[i]:offsets[i + 1]]`.
+
+        A `Mesh` stores this form and derives the padded arrays from it.
+        The uniform grids, whose connectivity never changes, build it
+        from the padded arrays the first time it is needed.
+
+            >>> from fipy.meshes import Grid2D, Tri2D
+            >>> mesh = Grid2D(nx=1, ny=1) + (Tri2D(nx=1, ny=1) + ((1,), (0,)))
+            >>> offsets, faceIDs, orientations = mesh._cellFaceIDsCSR
+            >>> print(offsets)
+            [ 0  4  7 10 13 16]
+            >>> print(faceIDs[offsets[2]:offsets[3]])
+            [ 5  9 10]
+            >>> print(orientations[offsets[2]:offsets[3]])
+            [ 1  1 -1]
+        """
+        if not hasattr(self, '_cellFaceIDsCSRCache'):
+            offsets, faceIDs = _compressCellFaces(self.cellFaceIDs)
+            offsets, orientations = _compressCellFaces(self._cellToFaceOrientations)
+            self._cellFaceIDsCSRCache = (offsets, faceIDs, orientations)
+        return self._cellFaceIDsCSRCache
+
+    def _sumOverCellFaces(self, faceValues):
+        """Sum of `faceValues`, oriented outward, over the faces of each cell
+
+        Equivalent to taking `faceValues` at `cellFaceIDs`, multiplying by
+        `_cellToFaceOrientations` and summing over the faces, but without
+        the masked temporaries.
+
+            >>> from fipy.meshes import Grid2D, Tri2D
+            >>> mesh = Grid2D(nx=1, ny=1) + (Tri2D(nx=1, ny=1) + ((1,), (0,)))
+            >>> faceValues = numerix.arange(2 * mesh.numberOfFaces).reshape((2, -1))
+            >>> contributions = (numerix.take(faceValues, mesh.cellFaceIDs, axis=-1)
+            ...                  * mesh._cellToFaceOrientations)
+            >>> print(numerix.allequal(mesh._sumOverCellFaces(faceValues),
+            ...                        MA.filled(MA.sum(contributions, axis=-2))))
+            True
+
+        Parameters
+        ----------
+        faceValues : array_like
+            Values of shape `(..., numberOfFaces)`.
+
+        Returns
+        -------
+        ndarray
+            Sums of shape `(..., numberOfCells)`.
+        """
+        offsets, faceIDs, orientations = self._cellFaceIDsCSR
+        contributions = numerix.take(numerix.asarray(faceValues), faceIDs, axis=-1) * orientations
+        return _sumSegments(contributions, offsets)
+
+    def _cellGradientsAt(self, cellValues, cellIDs):
+        """Gauss gradients of `cellValues` at the cells `cellIDs` only
+
+        The same as the `grad` of an unconstrained `CellVariable`, taken at
+        `cellIDs`, but at a cost proportional to the number of `cellIDs`
+        rather than of cells in the mesh.
+
+            >>> from fipy.meshes import Grid2D, Tri2D
+            >>> from fipy.variables.cellVariable import CellVariable
+            >>> mesh = Grid2D(nx=3, ny=3) + (Tri2D(nx=1, ny=1) + ((3,), (0,)))
+            >>> x, y = mesh.cellCenters
+            >>> var = CellVariable(mesh=mesh, value=x**2 + y)
+            >>> cellIDs = numerix.array([4, 0, 10, 8])
+            >>> print(numerix.allclose(mesh._cellGradientsAt(var.value, cellIDs),
+            ...                        var.grad.value[..., cellIDs]))
+            True
+
+        Parameters
+        ----------
+        cellValues : array_like
+            Values of shape `(numberOfCells,)`.
+        cellIDs : ndarray of int
+            The cells to take the gradients at.
+
+        Returns
+        -------
+        ndarray
+            Gradients of shape `(dim, len(cellIDs))`.
+        """
+        cellValues = numerix.asarray(cellValues)
+        cellIDs = numerix.asarray(cellIDs)
+        offsets, faceIDs, orientations = self._cellFaceIDsCSR
+        counts = offsets[cellIDs + 1] - offsets[cellIDs]
+        if counts.sum() == 0:
+            return numerix.zeros((self.dim, len(cellIDs)))
+
+        # positions in `faceIDs` of the faces of each of `cellIDs`
+        localOffsets = numerix.concatenate(([0], numerix.cumsum(counts)))
+        positions = (numerix.arange(counts.sum())
+                     + numerix.repeat(offsets[cellIDs] - localOffsets[:-1], counts))
+        faces = faceIDs[positions]
+
+        id1, id2 = [ids[faces] for ids in self._adjacentCellIDs]
+        alpha = self._faceToCellDistanceRatio[faces]
+        faceValues = (cellValues[id2] - cellValues[id1]) * alpha + cellValues[id1]
+
+        contributions = (orientations[positions] * faceValues
+                         * numerix.take(self._areaProjections, faces, axis=-1))
+        return (_sumSegments(contributions, localOffsets)
+                / numerix.take(self.cellVolumes, cellIDs))
+
     @property
     def _maxFacesPerCell(self):
         raise NotImplementedError
@@ -1242,6 +1351,260 @@ class AbstractMesh(object):
 
         return self.communicator.MaxAll(maxx)
 
+def _compressCellFaces(cellValues):
+    """Unpadded values of each cell, in compressed sparse row form
+
+    >>> cellValues = MA.masked_values([[0, 3, 6],
+    ...                                [1, 4, 7],
+    ...                                [2, 5, -1],
+    ...                                [-1, 8, -1]], -1)
+    >>> offsets, values = _compressCellFaces(cellValues)
+    >>> print(offsets)
+    [0 3 7 9]
+    >>> print(values)
+    [0 1 2 3 4 5 8 6 7]
+
+    Parameters
+    ----------
+    cellValues : array_like
+        Values of shape `(maxFacesPerCell, numberOfCells)`, masked where a
+        cell has fewer faces.
+
+    Returns
+    -------
+    offsets : ndarray
+        The values of cell `i` are `values[offsets[i]:offsets[i + 1]]`.
+    values : ndarray
+        The unmasked values, cell by cell.
+    """
+    cellValues = MA.array(cellValues)
+    present = ~MA.getmaskarray(cellValues).T
+    values = MA.getdata(cellValues).T[present]
+    offsets = numerix.zeros((present.shape[0] + 1,),
+                            dtype=numerix._indexDtype(len(values) + 1))
+    numerix.cumsum(present.sum(axis=-1), out=offsets[1:])
+    return offsets, values
+
+def _padCellFaces(offsets, values, maxFacesPerCell):
+    """Padded and masked form of values in compressed sparse row form
+
+    The inverse of `_compressCellFaces`.  When every cell has
+    `maxFacesPerCell` values, the result is a view of `values`.
+
+    >>> offsets = numerix.array([0, 3, 7, 9])
+    >>> values = numerix.array([0, 1, 2, 3, 4, 5, 8, 6, 7])
+    >>> print(_padCellFaces(offsets, values, 4))
+    [[0 3 6]
+     [1 4 7]
+     [2 5 --]
+     [-- 8 --]]
+    >>> padded = _padCellFaces(offsets[:3], values[:6], 3)
+    >>> print(padded)
+    [[0 3]
+     [1 4]
+     [2 5]]
+    >>> print(numerix.may_share_memory(MA.getdata(padded), values))
+    True
+
+    Parameters
+    ----------
+    offsets : ndarray
+        The values of cell `i` are `values[offsets[i]:offsets[i + 1]]`.
+    values : ndarray
+        The values, cell by cell.
+    maxFacesPerCell : int
+        Number of rows to pad to.
+
+    Returns
+    -------
+    ~numpy.ma.MaskedArray
+        Values of shape `(maxFacesPerCell, numberOfCells)`.
+    """
+    numberOfCells = len(offsets) - 1
+    if len(values) == maxFacesPerCell * numberOfCells:
+        return MA.array(values.reshape((numberOfCells, maxFacesPerCell)).T, copy=False)
+
+    counts = offsets[1:] - offsets[:-1]
+    mask = numerix.arange(maxFacesPerCell) >= counts[..., numerix.newaxis]
+    data = numerix.zeros((numberOfCells, maxFacesPerCell), dtype=values.dtype)
+    data[~mask] = values
+    return MA.array(data.T, mask=mask.T)
+
+def _sumSegments(values, offsets):
+    """Sums of `values[..., offsets[i]:offsets[i + 1]]`
+
+    Unlike `numerix.add.reduceat`, the sum of an empty segment is zero.
+
+    >>> print(_sumSegments(numerix.arange(1, 6), numerix.array([0, 2, 2, 5, 5])))
+    [ 3  0 12  0]
+
+    Parameters
+    ----------
+    values : ndarray
+        Values of shape `(..., offsets[-1])`.
+    offsets : ndarray
+        Nondecreasing bounds of the segments.
+
+    Returns
+    -------
+    ndarray
+        Sums of shape `(..., len(offsets) - 1)`.
+    """
+    if values.shape[-1] == 0:
+        return numerix.zeros(values.shape[:-1] + (len(offsets) - 1,),
+                             dtype=values.dtype)
+    # `reduceat` takes a single element for an empty segment and cannot
+    # start a segment at the end of `values`, so only reduce the others
+    nonempty = offsets[1:] > offsets[:-1]
+    sums = numerix.zeros(values.shape[:-1] + (len(offsets) - 1,), dtype=values.dtype)
+    sums[..., nonempty] = numerix.add.reduceat(values, offsets[:-1][nonempty], axis=-1)
+    return sums
+
+def _weldVertices(data, points, tolerance):
+    r"""Find the `data` vertex closest to each of `points`, if it is closer than `tolerance`
+
+    Vertices are binned on a grid, so only the vertices in neighboring
+    bins need to be compared.  Finding
+    the bins by sorting takes :math:`O(N \log N)` operations, rather
+    than the :math:`O(N^2)` of comparing every pair.
+
+    >>> data = numerix.array([[0., 1., 2., 3.],
+    ...                       [0., 0., 0., 1.]])
+    >>> points = numerix.array([[2.001, 5., 0., 3., 0.995],
+    ...                         [0., 0., 1e-4, 0.99, 0.]])
+    >>> closest, close = _weldVertices(data, points, tolerance=0.01)
+    >>> print(closest)
+    [2 0 1]
+    >>> print(close)
+    [0 2 4]
+
+    Parameters
+    ----------
+    data : array_like
+        (D, N) coordinates to search
+    points : array_like
+        (D, M) coordinates to find the closest `data` to
+    tolerance : float
+        Distance below which vertices are the same
+
+    Returns
+    -------
+    closest : ndarray
+        Indices of the `data` vertices that are close to `points`
+    close : ndarray
+        Indices of the `points` that are close to `data`
+    """
+    data = numerix.asarray(data)
+    points = numerix.asarray(points)
+    D = data.shape[0]
+
+    nothing = numerix.zeros((0,), dtype=numerix.INT_DTYPE)
+    if data.shape[-1] == 0 or points.shape[-1] == 0 or not tolerance > 0:
+        return nothing, nothing
+
+    # bins are twice as wide as `tolerance`, so the vertices close to a
+    # point are in its bin or in the neighboring bins on the side of the
+    # bin that it is closest to
+    width = 2 * tolerance
+    origin = numerix.minimum(data.min(axis=1), points.min(axis=1)) - width
+    origin = origin[..., numerix.newaxis]
+
+    def bins(coords):
+        return numerix.floor((coords - origin) / width).astype(numerix.INT_DTYPE)
+
+    dataBins = bins(data)
+    pointBins = bins(points)
+    nearUpper = ((points - origin) / width - pointBins) >= 0.5
+
+    # number the bins with one integer, if there are few enough of them,
+    # or else compare them lexicographically as structured values
+    span = numerix.maximum(dataBins.max(axis=1), pointBins.max(axis=1)) + 2
+    if numerix.prod(span.astype(float)) < 2.**62:
+        strides = numerix.cumprod(numerix.concatenate(([1], span[:-1])))[..., numerix.newaxis]
+
+        def keys(bins):
+            return (bins * strides).sum(axis=0)
+    else:
+        fields = numerix.dtype([(text_to_native_str("x%d" % d), numerix.INT_DTYPE)
+                                for d in range(D)])
+
+        def keys(bins):
+            return numerix.ascontiguousarray(bins.swapaxes(0, 1)).view(fields).ravel()
+
+    dataKeys = keys(dataBins)
+    order = numerix.argsort(dataKeys, kind="mergesort")
+    dataKeys = dataKeys[order]
+
+    closest = -numerix.ones(points.shape[-1], dtype=numerix.INT_DTYPE)
+    distances = numerix.inf * numerix.ones(points.shape[-1])
+    for neighbor in itertools.product((False, True), repeat=D):
+        offset = numerix.where(numerix.array(neighbor)[..., numerix.newaxis],
+                               numerix.where(nearUpper, 1, -1), 0)
+        pointKeys = keys(pointBins + offset)
+        first = numerix.searchsorted(dataKeys, pointKeys, side="left")
+        last = numerix.searchsorted(dataKeys, pointKeys, side="right")
+
+        # bins generally hold no more than one vertex
+        candidates = numerix.nonzero(first < last)[0]
+        while len(candidates) > 0:
+            IDs = order[first[candidates]]
+            distance = numerix.sqrt(((data[..., IDs] - points[..., candidates])**2).sum(axis=0))
+            closer = distance < distances[candidates]
+            distances[candidates[closer]] = distance[closer]
+            closest[candidates[closer]] = IDs[closer]
+
+            first[candidates] += 1
+            candidates = candidates[first[candidates] < last[candidates]]
+
+    close = numerix.nonzero(distances < tolerance)[0]
+
+    return closest[close], close
+
+def _matchFaces(faces0, faces1):
+    """Find the faces that have the same vertices in two sets of faces
+
+    Faces are compared by sorting their vertex IDs, rather than by
+    comparing every pair of faces.
+
+    >>> faces0 = numerix.array([[0, 1, 4, 7],
+    ...                         [1, 2, 5, -1],
+    ...                         [-1, -1, 6, 8]])
+    >>> faces1 = numerix.array([[8, 2, 5, 1],
+    ...                         [7, 1, 4, 0],
+    ...                         [-1, -1, 3, -1]])
+    >>> matched0, matched1 = _matchFaces(faces0, faces1)
+    >>> print(matched0)
+    [0 1 3]
+    >>> print(matched1)
+    [3 1 0]
+
+    Parameters
+    ----------
+    faces0, faces1 : array_like
+        Vertex IDs of the faces in each set, one face per column, padded
+        with -1.  No face can appear more than once in either set.
+
+    Returns
+    -------
+    matched0, matched1 : ndarray
+        Indices of the matching faces in each set
+    """
+    N0 = faces0.shape[-1]
+    keys = numerix.concatenate((numerix.sort(faces0, axis=0),
+                                numerix.sort(faces1, axis=0)), axis=1)
+    source = numerix.concatenate((numerix.zeros((N0,), dtype=numerix.INT_DTYPE),
+                                  numerix.ones((faces1.shape[-1],), dtype=numerix.INT_DTYPE)))
+
+    # lexsort treats its last key as the most significant
+    order = numerix.lexsort(numerix.concatenate((source[numerix.newaxis], keys[::-1]), axis=0))
+    keys = keys[..., order]
+    same = numerix.nonzero((keys[..., 1:] == keys[..., :-1]).all(axis=0))[0]
+    matched0 = order[same]
+    matched1 = order[same + 1]
+    pairs = (matched0 < N0) & (matched1 >= N0)
+
+    return matched0[pairs], matched1[pairs] - N0
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
@@ -29,6 +29,9 @@ class CylindricalNonUniformGrid2D(NonUniformGrid2D):
         super(CylindricalNonUniformGrid2D, self).__init__(dx=dx, dy=dy, nx=nx, ny=ny, overlap=overlap,
                         communicator=communicator, *args, **kwargs)
 
+        # the rest of the geometry is based on the planar face areas,
+        # and already accounts for `origin`
+        self._calcAllGeometry()
         self._faceAreas *= self.faceCenters[0].value
 
         self._scaledFaceAreas = self._scale['area'] * self._faceAreas
@@ -7,8 +7,11 @@ from builtins import range
 from builtins import str
 __docformat__ = 'restructuredtext'
 
+import json
 import logging
+import mmap
 import os
+import re
 from subprocess import Popen, PIPE
 import sys
 import tempfile
@@ -17,6 +20,7 @@ import warnings
 
 _log = logging.getLogger(__name__)
 
+from fipy.tools import backgroundOutput
 from fipy.tools import numerix as nx
 from fipy.tools import parallelComm
 from fipy.tools import serialComm
@@ -155,16 +159,17 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
         else:
             # Gmsh isn't picky about file extensions,
             # so we peek at the start of the file to deduce the type
-            f = open(name, 'r')
+            # (binary files cannot be read as text)
+            f = open(name, 'rb')
             filetype = f.readline().strip()
             f.close()
-            if filetype == "$MeshFormat":
+            if filetype == b"$MeshFormat":
                 geoFile = None
                 mshFile = name
                 gmshOutput = ""
-            elif filetype == "$NOD":
+            elif filetype == b"$NOD":
                 raise SyntaxError("Gmsh MSH file format version 1.0 is not supported")
-            elif filetype == "$PostFormat":
+            elif filetype == b"$PostFormat":
                 raise SyntaxError("Gmsh POS post-processing format cannot be used to generate a Mesh")
             else:
                 # must be a Gmsh script file
@@ -318,6 +323,7 @@ class GmshFile(object):
         pass
 
     def close(self):
+        backgroundOutput.flush()
         self.fileobj.close()
 
     def __del__(self):
@@ -483,7 +489,7 @@ class POSFile(GmshFile):
         self.fileobj.write("\n".join([" ".join(datum) for datum in data]) + "\n")
 
 class MSHFile(GmshFile):
-    """
+    r"""
     Class responsible for parsing a Gmsh file and then readying
     its contents for use by a `Mesh` constructor.
 
@@ -493,9 +499,111 @@ class MSHFile(GmshFile):
     or multiline string.
 
     Does not support gmsh versions < 2. If partitioning, gmsh
-    version must be >= 2.5.
+    version must be >= 2.5. Reads both ASCII and binary `.msh` files.
+
+    Nodes and elements are read in bulk, so the nodes need not be in
+    order
+
+    >>> import struct
+    >>> from fipy.tools import numerix, serialComm
+
+    >>> ascii = '''$MeshFormat
+    ... 2.2 0 8
+    ... $EndMeshFormat
+    ... $PhysicalNames
+    ... 2
+    ... 1 3 "left"
+    ... 2 1 "inside"
+    ... $EndPhysicalNames
+    ... $Nodes
+    ... 5
+    ... 5 1 0 0
+    ... 1 0 0 0
+    ... 9 2 0.5 0
+    ... 2 0 1 0
+    ... 7 1 1 0
+    ... $EndNodes
+    ... $Elements
+    ... 3
+    ... 1 3 2 1 11 1 5 7 2
+    ... 2 2 2 1 12 5 9 7
+    ... 3 1 2 3 13 1 2
+    ... $EndElements
+    ... '''.encode("ascii")
+
+    >>> import os
+    >>> import tempfile
+    >>> def parse(content):
+    ...     (f, name) = tempfile.mkstemp('.msh')
+    ...     _ = os.write(f, content)
+    ...     os.close(f)
+    ...     msh = MSHFile(name, dimensions=None, communicator=serialComm)
+    ...     parsed = msh.read()
+    ...     msh.close()
+    ...     os.remove(name)
+    ...     return msh, parsed
+
+    >>> msh, parsed = parse(ascii)
+    >>> vertexCoords, facesToVertexIDs, cellsToFaceIDs = parsed[:3]
+    >>> print(msh.dimensions)
+    2
+    >>> print(vertexCoords)
+    [[ 0.   0.   1.   1.   2. ]
+     [ 0.   1.   0.   1.   0.5]]
+    >>> print(facesToVertexIDs)
+    [[2 3 1 0 4 3]
+     [0 2 3 1 2 4]]
+    >>> print(cellsToFaceIDs)
+    [[ 0  4]
+     [ 1  5]
+     [ 2  1]
+     [ 3 -1]]
+    >>> print(msh.physicalFaceMap)
+    [0 0 0 3 0 0]
+    >>> print(msh.geometricalCellMap)
+    [11 12]
+    >>> print(msh.physicalNames[1])
+    {'left': 3}
+
+    Binary files, which store elements in blocks of the same type, give
+    the same mesh
+
+    >>> def block(elType, tags, elements):
+    ...     data = struct.pack("<3i", elType, len(elements), len(tags))
+    ...     for id, nodes in elements:
+    ...         data += struct.pack("<%di" % (1 + len(tags) + len(nodes)),
+    ...                             id, *(tags + nodes))
+    ...     return data
+    >>> binary = (b"$MeshFormat\n2.2 1 8\n" + struct.pack("<i", 1)
+    ...           + b"\n$EndMeshFormat\n"
+    ...           + ascii[ascii.index(b"$PhysicalNames"):ascii.index(b"$Nodes")]
+    ...           + b"$Nodes\n5\n"
+    ...           + b"".join([struct.pack("<i3d", id, x, y, 0.)
+    ...                       for id, x, y in [(5, 1., 0.), (1, 0., 0.), (9, 2., .5),
+    ...                                        (2, 0., 1.), (7, 1., 1.)]])
+    ...           + b"\n$EndNodes\n$Elements\n3\n"
+    ...           + block(3, [1, 11], [(1, [1, 5, 7, 2])])
+    ...           + block(2, [1, 12], [(2, [5, 9, 7])])
+    ...           + block(1, [3, 13], [(3, [1, 2])])
+    ...           + b"\n$EndElements\n")
+
+    >>> binaryMsh, binaryParsed = parse(binary)
+    >>> print(all([numerix.allclose(a, b) for a, b in zip(parsed, binaryParsed)]))
+    True
+    >>> print((binaryMsh.physicalFaceMap == msh.physicalFaceMap).all())
+    True
+
+    and can be opened just like ASCII files
 
-    TODO: Refactor face extraction functions.
+    >>> (f, name) = tempfile.mkstemp('.msh')
+    >>> _ = os.write(f, binary)
+    >>> os.close(f)
+    >>> mesh = Gmsh2D(name, communicator=serialComm) # doctest: +GMSH
+    >>> print(mesh.numberOfCells) # doctest: +GMSH
+    2
+    >>> print(numerix.allclose(mesh.cellVolumes, (1., .5))) # doctest: +GMSH
+    True
+    >>> os.remove(name)
     """
     def __init__(self, filename,
                        dimensions,
@@ -536,344 +644,488 @@ class MSHFile(GmshFile):
 
         GmshFile.__init__(self, filename=filename, communicator=communicator, mode=mode, fileIsTemporary=fileIsTemporary)
 
+    # number of nodes of each Gmsh element type
+    _nodesPerElement = { 1: 2,  2: 3,  3: 4,  4: 4,  5: 8,  6: 6,  7: 5,  8: 3,
+                         9: 6, 10: 9, 11: 10, 12: 27, 13: 18, 14: 14, 15: 1, 16: 8,
+                        17: 20, 18: 15, 19: 13, 20: 9, 21: 10, 22: 12, 23: 15, 24: 15,
+                        25: 21, 26: 4, 27: 5, 28: 6, 29: 20, 30: 35, 31: 56, 92: 64,
+                        93: 125}
+
     def _getMetaData(self):
         """
         Extracts `gmshVersion`, file-type, and data-size in that
         order.
         """
-        self._seekForHeader("MeshFormat")
-        metaData = self.fileobj.readline().split()
-        self.fileobj.seek(0)
-        return [float(x) for x in metaData]
+        # binary files cannot be read as text
+        with open(self.filename, 'rb') as f:
+            for line in f:
+                if line.startswith(b"$MeshFormat"):
+                    metaData = f.readline().split()
+                    return [float(x) for x in metaData]
 
-    def _isolateData(self, title):
+        raise EOFError("No `MeshFormat' header found!")
+
+    def _findSection(self, content, title):
         """
-        Gets all data between $[title] and $End[title], writes
-        it out to its own file.
+        Position of the line following the `$[title]` header in `content`,
+        the contents of the file.
         """
-        newF, newPath = tempfile.mkstemp(title, text=True)
-        newF = os.fdopen(newF, 'w')
-        try:
-            self._seekForHeader(title)
-        except Exception as e:
-            newF.close()
-            os.unlink(newPath)
-            raise
+        header = re.search(br"^\$" + title.encode("ascii") + br"[ \t\r]*$",
+                           content, re.MULTILINE)
+        if header is None:
+            raise EOFError("No `%s' header found!" % title)
 
-        # extract the actual data within section
-        while True:
-            line = self.fileobj.readline()
-            if ("$End%s" % title) not in line:
-                newF.write(line)
-            else: break
+        return header.end() + 1
+
+    @staticmethod
+    def _readLine(content, start):
+        """
+        Returns the line of `content` beginning at `start` and the position
+        of the next line.
+        """
+        end = content.find(b"\n", start)
+        if end == -1:
+            end = len(content)
 
-        self.fileobj.seek(0)
-        newF.close()
-        return newPath
+        return content[start:end].decode("ascii"), end + 1
 
-    def _seekForHeader(self, title):
+    def _sectionText(self, content, title):
         """
-        Iterate through a file until we end up at the section header
-        for `title`. Function has obvious side-effects on `self.fileobj`.
+        Gets all data between $[title] and $End[title], after the line
+        giving the number of entries.
         """
-        while True:
-            line = self.fileobj.readline()
-            if len(line) == 0:
-                raise EOFError("No `%s' header found!" % title)
-                break
-            elif (("$%s" % title) not in line):
-                continue
-            else:
-                break # found header
+        start = self._findSection(content, title)
+        _, start = self._readLine(content, start)
+        end = content.find(b"$End" + title.encode("ascii"), start)
 
-    def _deriveCellsAndFaces(self, cellsToVertIDs, shapeTypes, numCells):
+        return content[start:end]
+
+    def _byteOrder(self, content):
         """
-        Uses element information obtained from `_parseElementFile` to deliver
-        `facesToVertices` and `cellsToFaces`.
+        Byte order of a binary file, from the integer 1 that follows the
+        `$MeshFormat` data.
         """
+        start = self._findSection(content, "MeshFormat")
+        _, start = self._readLine(content, start)
+        one = int(nx.frombuffer(content, dtype="<i4", count=1, offset=start)[0])
 
-        allShapes  = nx.unique(shapeTypes).tolist()
-        maxFaces   = max([self.numFacesPerCell[x] for x in allShapes])
+        return "<" if one == 1 else ">"
 
-        # `cellsToFaces` must be padded with -1; see mesh.py
-        currNumFaces = 0
-        cellsToFaces = nx.ones((numCells, maxFaces), 'l') * -1
-        facesDict    = {}
-        uniqueFaces  = []
-
-        # we now build `cellsToFaces` and `uniqueFaces`,
-        # the latter will result in `facesToVertices`.
-        for cellIdx in range(numCells):
-            shapeType = shapeTypes[cellIdx]
-            cell = cellsToVertIDs[cellIdx]
-
-            if shapeType in [5, 12, 17]: # hexahedron
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3], # ordering of vertices gleaned from
-                                                                 [4, 5, 6, 7], # a one-cube Grid3D example
-                                                                 [0, 1, 5, 4],
-                                                                 [3, 2, 6, 7],
-                                                                 [0, 3, 7, 4],
-                                                                 [1, 2, 6, 5]])
-            elif shapeType in [6, 13, 18]: # prism
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2],
-                                                                 [5, 4, 3],
-                                                                 [3, 4, 1, 0],
-                                                                 [4, 5, 2, 1],
-                                                                 [5, 3, 0, 2]])
-            elif shapeType in [7, 14, 19]: # pyramid
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3],
-                                                                 [0, 1, 4],
-                                                                 [1, 2, 4],
-                                                                 [2, 3, 4],
-                                                                 [3, 0, 4]])
-            else:
-                if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
-                    faceLength = 2 # triangle
-                elif shapeType in [3, 10, 16]:
-                    faceLength = 2 # quadrangle
-                elif shapeType in [4, 11, 29, 30, 31]:
-                    faceLength = 3 # tetrahedron
-
-                faces = self._extractRegularFaces(cell=cell,
-                                                  faceLength=faceLength,
-                                                  facesPerCell=self.numFacesPerCell[shapeType])
-
-            for faceIdx in range(len(faces)):
-                # NB: currFace is sorted for the key to spot duplicates
-                currFace = faces[faceIdx]
-                keyStr   = ' '.join([str(x) for x in sorted(currFace)])
-
-                if keyStr in facesDict:
-                    cellsToFaces[cellIdx][faceIdx] = facesDict[keyStr]
-                else: # new face
-                    facesDict[keyStr] = currNumFaces
-                    cellsToFaces[cellIdx][faceIdx] = currNumFaces
-                    uniqueFaces.append(currFace)
-                    currNumFaces += 1
-
-        # pad short faces with -1
-        maxFaceLen = max([len(f) for f in uniqueFaces])
-        uniqueFaces = [[-1] * (maxFaceLen - len(f)) + f for f in uniqueFaces]
-
-        facesToVertices = nx.array(uniqueFaces, dtype=nx.INT_DTYPE)
-
-        return facesToVertices.swapaxes(0, 1)[::-1], cellsToFaces.swapaxes(0, 1).copy('C'), facesDict
+    def _readNodes(self, content, byteOrder=None):
+        """
+        Returns the Gmsh IDs of the nodes and their coordinates, one node
+        per row, read from the `$Nodes` section in bulk.
+        """
+        if byteOrder is None:
+            nodes = nx.fromstring(self._sectionText(content, "Nodes"), dtype=float, sep=" ")
+            nodes = nodes.reshape((-1, 4))
 
-    def _translateNodesToVertices(self, entitiesNodes, vertexMap):
-        """Translates e`ntitiesNodes` from Gmsh node IDs to `vertexCoords` indices.
+            return nodes[:, 0].astype(nx.INT_DTYPE), nodes[:, 1:]
+        else:
+            start = self._findSection(content, "Nodes")
+            line, start = self._readLine(content, start)
+            dtype = nx.dtype([("id", byteOrder + "i4"),
+                              ("coords", byteOrder + "f%d" % self.dataSize, (3,))])
+            nodes = nx.frombuffer(content, dtype=dtype, count=int(line), offset=start)
+
+            return nodes["id"].astype(nx.INT_DTYPE), nodes["coords"].astype(float)
+
+    def _numberOfNodes(self, elType):
+        try:
+            return self._nodesPerElement[elType]
+        except KeyError:
+            raise GmshException("Gmsh element type %d is not supported" % elType)
+
+    def _readElements(self, content, byteOrder=None):
         """
-        entitiesVertices = []
+        Returns the elements of the `$Elements` section in blocks of the
+        same type and number of tags.
 
-        for entity in entitiesNodes:
-            try:
-                vertIndices = vertexMap[nx.array(entity)]
-            except IndexError:
-                vertIndices = nx.ones((len(entity),), 'l') * -1
-            entitiesVertices.append(vertIndices)
+        Each block is a tuple of the Gmsh IDs of its elements, their type,
+        their tags (one element per row), and their nodes (one element per
+        row).
+        """
+        blocks = []
+
+        if byteOrder is None:
+            ints = nx.fromstring(self._sectionText(content, "Elements"),
+                                 dtype=nx.INT_DTYPE, sep=" ")
 
-        return entitiesVertices
+            position = 0
+            while position < len(ints):
+                elType, numTags = int(ints[position + 1]), int(ints[position + 2])
+                length = 3 + numTags + self._numberOfNodes(elType)
 
-    def _extractRegularFaces(self, cell, faceLength, facesPerCell):
-        """Return faces for a regular poly(gon|hedron)
+                # Gmsh writes runs of elements of the same type,
+                # so look for the end of the run in ever larger strides
+                count = 1
+                stride = 1
+                while True:
+                    check = min(stride, (len(ints) - position) // length - count)
+                    if check <= 0:
+                        break
+                    starts = position + (count + nx.arange(check)) * length
+                    same = (ints[starts + 1] == elType) & (ints[starts + 2] == numTags)
+                    if not same.all():
+                        count += int(nx.argmin(same))
+                        break
+                    count += check
+                    stride *= 2
 
-        Given `cell`, defined by node IDs, returns an array of
-        `facesPerCell` faces of length `faceLength` in terms of nodes.
+                records = ints[position:position + count * length].reshape((count, length))
+                blocks.append((records[:, 0], elType,
+                               records[:, 3:3 + numTags], records[:, 3 + numTags:]))
+                position += count * length
+        else:
+            start = self._findSection(content, "Elements")
+            line, start = self._readLine(content, start)
+            numElements = int(line)
+
+            # binary elements come in blocks, each with a header of
+            # their type, number, and number of tags
+            read = 0
+            while read < numElements:
+                elType, count, numTags = [int(i) for i in nx.frombuffer(content,
+                                                                        dtype=byteOrder + "i4",
+                                                                        count=3,
+                                                                        offset=start)]
+                length = 1 + numTags + self._numberOfNodes(elType)
+                records = nx.frombuffer(content, dtype=byteOrder + "i4",
+                                        count=count * length, offset=start + 12)
+                records = records.reshape((count, length)).astype(nx.INT_DTYPE)
+                blocks.append((records[:, 0], elType,
+                               records[:, 1:1 + numTags], records[:, 1 + numTags:]))
+                start += 4 * (3 + count * length)
+                read += count
+
+        return blocks
+
+    # vertices of the faces of cells that are not regular poly(gon|hedra),
+    # ordering of vertices gleaned from a one-cube Grid3D example
+    _faceOrderings = {
+        "hexahedron": [[0, 1, 2, 3],
+                       [4, 5, 6, 7],
+                       [0, 1, 5, 4],
+                       [3, 2, 6, 7],
+                       [0, 3, 7, 4],
+                       [1, 2, 6, 5]],
+        "prism": [[0, 1, 2],
+                  [5, 4, 3],
+                  [3, 4, 1, 0],
+                  [4, 5, 2, 1],
+                  [5, 3, 0, 2]],
+        "pyramid": [[0, 1, 2, 3],
+                    [0, 1, 4],
+                    [1, 2, 4],
+                    [2, 3, 4],
+                    [3, 0, 4]]
+    }
+
+    def _cellFaceOrderings(self, shapeType):
         """
-        faces = []
-        for i in range(facesPerCell):
-            aFace = []
-            for j in range(faceLength):
-                aVertex = (i + j) % len(cell) # we may wrap
-                aFace.append(int(cell[aVertex]))
-            faces.append(aFace)
-        return faces
-
-    def _extractOrderedFaces(self, cell, faceOrderings):
-        """Return faces for a 8-node hexahedron cell.
+        Vertices of each face of a cell of `shapeType`, in terms of the
+        position of its nodes. Only the corner nodes of higher order
+        elements are used.
         """
-        def orderingToFace(vertList):
-            aFace = []
-            for i in vertList:
-                aFace.append(int(cell[i]))
-            return aFace
+        if shapeType in [5, 12, 17]:
+            return self._faceOrderings["hexahedron"]
+        elif shapeType in [6, 13, 18]:
+            return self._faceOrderings["prism"]
+        elif shapeType in [7, 14, 19]:
+            return self._faceOrderings["pyramid"]
+        else:
+            if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
+                faceLength = 2 # triangle
+            elif shapeType in [3, 10, 16]:
+                faceLength = 2 # quadrangle
+            elif shapeType in [4, 11, 29, 30, 31]:
+                faceLength = 3 # tetrahedron
+
+            # regular poly(gon|hedra) have as many faces as corners
+            facesPerCell = self.numFacesPerCell[shapeType]
+            return [[(i + j) % facesPerCell for j in range(faceLength)]
+                    for i in range(facesPerCell)]
+
+    def _deriveCellsAndFaces(self, cellsToVertIDs, shapeTypes, numCells, namedFacesToVertIDs):
+        """
+        Uses element information obtained from `_parseElements` to deliver
+        `facesToVertices` and `cellsToFaces`, and which of those faces each
+        of the Gmsh faces in `namedFacesToVertIDs` is (or -1).
 
-        return [orderingToFace(o) for o in faceOrderings]
+        Faces are identified by their sorted vertices, and numbered in the
+        order they are first encountered in the cells.
+        """
+        allShapes = nx.unique(shapeTypes).tolist()
+        orderings = dict((shape, self._cellFaceOrderings(shape)) for shape in allShapes)
+        maxFaces = max([len(orderings[shape]) for shape in allShapes])
+        maxFaceLen = max([len(face) for shape in allShapes for face in orderings[shape]])
+
+        # the faces of every cell, with short faces padded with -1 at the front
+        padding = cellsToVertIDs.shape[1]
+        vertices = nx.concatenate((cellsToVertIDs,
+                                   -nx.ones((numCells, 1), dtype=cellsToVertIDs.dtype)),
+                                  axis=1)
+        cellFaces = -nx.ones((numCells, maxFaces, maxFaceLen), dtype=nx.INT_DTYPE)
+        hasFace = nx.zeros((numCells, maxFaces), dtype=bool)
+        for shape in allShapes:
+            ordering = [[padding] * (maxFaceLen - len(face)) + list(face)
+                        for face in orderings[shape]]
+            cells = nx.nonzero(shapeTypes == shape)[0]
+            cellFaces[cells, :len(ordering)] = vertices[cells][:, ordering]
+            hasFace[cells, :len(ordering)] = True
+        faces = cellFaces[hasFace]
+
+        # Gmsh faces that cannot be faces of any cell are not looked up
+        named = _padded([namedFacesToVertIDs], width=max(maxFaceLen,
+                                                         namedFacesToVertIDs.shape[1]))
+        lookup = (named[:, maxFaceLen:] == -1).all(axis=1)
+        named = named[lookup, :maxFaceLen]
+
+        first, inverse = _uniqueRows(nx.sort(nx.concatenate((faces, named)), axis=1))
+
+        # number the faces of cells, but not faces only named by Gmsh,
+        # in the order they first appear
+        cellGroups = nx.nonzero(first < len(faces))[0]
+        cellGroups = cellGroups[nx.argsort(first[cellGroups])]
+        faceIDs = -nx.ones(len(first), dtype=nx.INT_DTYPE)
+        faceIDs[cellGroups] = nx.arange(len(cellGroups))
+
+        facesToVertices = faces[first[cellGroups]]
 
-    def read(self):
+        # `cellsToFaces` must be padded with -1; see mesh.py
+        cellsToFaces = -nx.ones((numCells, maxFaces), 'l')
+        cellsToFaces[hasFace] = faceIDs[inverse[:len(faces)]]
+
+        namedFaceIDs = -nx.ones(len(namedFacesToVertIDs), dtype=nx.INT_DTYPE)
+        namedFaceIDs[lookup] = faceIDs[inverse[len(faces):]]
+
+        return (facesToVertices.swapaxes(0, 1)[::-1],
+                cellsToFaces.swapaxes(0, 1).copy('C'),
+                namedFaceIDs)
+
+    def _translateNodesToVertices(self, entitiesNodes, vertexMap):
+        """Translates `entitiesNodes`, padded with -1, from Gmsh node IDs
+        to `vertexCoords` indices. Nodes that are not vertices are also -1.
         """
-        0. Build `cellsToVertices`
-        1. Recover needed `vertexCoords` and mapping from file using
-           `cellsToVertices`
-        2. Build `cellsToVertIDs` proper from `vertexCoords` and vertex map
-        3. Build faces
-        4. Build `cellsToFaces`
+        known = (entitiesNodes >= 0) & (entitiesNodes < len(vertexMap))
+
+        return nx.where(known, vertexMap[nx.where(known, entitiesNodes, 0)], -1)
+
+    # results of parsing, in the order returned by `read()`
+    _parsedNames = ("vertexCoords",
+                    "facesToVertexIDs",
+                    "cellsToFaceIDs",
+                    "cellGlobalIDMap",
+                    "ghostCellGlobalIDMap",
+                    "cellsToVertexIDs")
+
+    # attributes set by parsing
+    _parsedAttributes = ("dimensions",
+                         "coordDimensions",
+                         "physicalCellMap",
+                         "geometricalCellMap",
+                         "physicalFaceMap",
+                         "geometricalFaceMap")
 
-        Isolate relevant data into three files, store in
-        `self.nodesPath` for `$Nodes`,
-        `self.elemsPath` for `$Elements`.
-        `self.namesFile` for `$PhysicalNames`.
+    def read(self):
+        """Parse the file, unless the result of parsing it is already in
+        the :mod:`~fipy.meshes.meshCache`.
 
         Returns `vertexCoords`, `facesToVertexID`, `cellsToFaceID`,
-                `cellGlobalIDMap`, `ghostCellGlobalIDMap`.
+                `cellGlobalIDMap`, `ghostCellGlobalIDMap`,
+                `cellsToVertexIDs`.
         """
         self.version, self.fileType, self.dataSize = self._getMetaData()
-        self.nodesPath = self._isolateData("Nodes")
-        self.elemsPath = self._isolateData("Elements")
-        try:
-            self.namesPath = self._isolateData("PhysicalNames")
-        except EOFError as e:
-            self.namesPath = None
 
-        try:
-            if self.dimensions is None:
-                nodesFile = open(self.nodesPath, 'r')
-                nodesFile.readline() # skip number of nodes
+        from fipy.meshes import meshCache
+        key = None
+        if meshCache.cacheDirectory is not None:
+            key = meshCache._key(self.__class__.__name__,
+                                 meshCache._fileDigest(self.filename),
+                                 self.dimensions,
+                                 self.coordDimensions,
+                                 self.communicator.procID,
+                                 self.communicator.Nproc)
+        cached = meshCache._load(key)
+
+        if cached is None:
+            parsed = self._parse()
+
+            arrays = dict(zip(self._parsedNames, parsed))
+            for name in self._parsedAttributes:
+                arrays[name] = getattr(self, name)
+            arrays["physicalNames"] = json.dumps(self.physicalNames)
+            meshCache._save(key, arrays)
+        else:
+            parsed = [cached[name] for name in self._parsedNames]
+            # global ID maps are lists
+            parsed[3] = parsed[3].tolist()
+            parsed[4] = parsed[4].tolist()
 
-                # We assume we have a 2D file unless we find a node
-                # with a non-zero Z coordinate
-                self.dimensions = 2
-                for node in nodesFile:
-                    line   = node.split()
+            for name in self._parsedAttributes:
+                setattr(self, name, cached[name])
+            self.dimensions = int(self.dimensions)
+            self.coordDimensions = int(self.coordDimensions)
+            self.physicalNames = dict((int(dim), names) for dim, names
+                                      in json.loads(str(cached["physicalNames"])).items())
 
-                    newVert = [float(x) for x in line]
+        return tuple(parsed)
 
-                    if newVert[2] != 0.0:
-                        self.dimensions = 3
-                        break
+    def _parse(self):
+        """
+        0. Read nodes and elements in bulk
+        1. Build `cellsToVertices`
+        2. Recover needed `vertexCoords` and mapping from file using
+           `cellsToVertices`
+        3. Build `cellsToVertIDs` proper from `vertexCoords` and vertex map
+        4. Build faces
+        5. Build `cellsToFaces`
 
-                nodesFile.close()
-
-            self.coordDimensions = self.coordDimensions or self.dimensions
-
-            # we need a conditional here so we don't pick up 2D shapes in 3D
-            if self.dimensions == 2:
-                self.numVertsPerFace = {1: 2, # 2-node line
-                                        8: 2} # 3-node line
-                self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 faces)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-            elif self.dimensions == 3:
-                self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 vertices)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-                self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
-                                        11: 4, # 10-node tetrahedron (we only read 1st 4)
-                                        29: 4, # 20-node tetrahedron (we only read 1st 4)
-                                        30: 4, # 35-node tetrahedron (we only read 1st 4)
-                                        31: 4, # 56-node tetrahedron (we only read 1st 4)
-                                         5: 6, # 8-node hexahedron (6 faces)
-                                        12: 6, # 27-node tetrahedron (we only read 1st 6)
-                                        17: 6, # 20-node tetrahedron (we only read 1st 6)
-                                         6: 5, # 6-node prism (5 faces)
-                                        13: 5, # 18-node prism (we only read 1st 6)
-                                        18: 5, # 15-node prism (we only read 1st 6)
-                                         7: 5, # 5-node pyramid (5 faces)
-                                        14: 5, # 14-node pyramid (we only read 1st 5)
-                                        19: 5} # 13-node pyramid (we only read 1st 5)
+        Returns `vertexCoords`, `facesToVertexID`, `cellsToFaceID`,
+                `cellGlobalIDMap`, `ghostCellGlobalIDMap`.
+        """
+        with open(self.filename, 'rb') as f:
+            content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if self.fileType == 1:
+                if self.dataSize != 8:
+                    raise GmshException("Binary MSH files must store coordinates as doubles")
+                byteOrder = self._byteOrder(content)
             else:
-                raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
-
-            _log.debug("Parsing elements.")
-            (cellsData,
-             ghostsData,
-             facesData) = self._parseElementFile()
-
-            cellsToGmshVerts = cellsData.nodes + ghostsData.nodes
-            numCellsTotal    = len(cellsData.nodes) + len(ghostsData.nodes)
-            allShapeTypes    = cellsData.shapes + ghostsData.shapes
-            allShapeTypes    = nx.array(allShapeTypes)
-            allShapeTypes    = nx.delete(allShapeTypes, nx.s_[numCellsTotal:])
-            self.physicalCellMap = nx.array(cellsData.physicalEntities
-                                            + ghostsData.physicalEntities)
-            self.geometricalCellMap = nx.array(cellsData.geometricalEntities
-                                               + ghostsData.geometricalEntities)
-
-            if numCellsTotal < 1:
-                errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
-                errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
-                raise GmshException(errStr)
-
-            _log.debug("Recovering coords.")
-            _log.debug("numcells %d" % numCellsTotal)
-            vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts)
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
-                                                            vertIDtoIdx)
-
-            _log.debug("Building cells and faces.")
-            (facesToV,
-             cellsToF,
-             facesDict) = self._deriveCellsAndFaces(cellsToVertIDs,
-                                                    allShapeTypes,
-                                                    numCellsTotal)
-
-            # cell entities were easy to record on parsing
-            # but we don't use Gmsh faces, so we need to correlate the nodes
-            # that make up the Gmsh faces with the vertex IDs of the FiPy faces
-            # so that we can check if any are named
-            faceEntitiesDict = dict()
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
-                                                            vertIDtoIdx)
-
-            for face, physicalEntity, geometricalEntity in zip(facesToVertIDs,
-                                                               facesData.physicalEntities,
-                                                               facesData.geometricalEntities):
-                faceEntitiesDict[' '.join([str(x) for x in sorted(face)])] = (physicalEntity, geometricalEntity)
-
-            self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            for face in list(facesDict.keys()):
-                # not all faces are necessarily tagged
-                if face in faceEntitiesDict:
-                    self.physicalFaceMap[facesDict[face]] = faceEntitiesDict[face][0]
-                    self.geometricalFaceMap[facesDict[face]] = faceEntitiesDict[face][1]
-
-            self.physicalNames = self._parseNamesFile()
+                byteOrder = None
+
+            nodeIDs, nodeCoords = self._readNodes(content, byteOrder)
+            elementBlocks = self._readElements(content, byteOrder)
 
+            try:
+                names = self._sectionText(content, "PhysicalNames").decode("utf-8")
+            except EOFError:
+                names = None
         finally:
-            os.unlink(self.nodesPath)
-            os.unlink(self.elemsPath)
-            if self.namesPath is not None:
-                os.unlink(self.namesPath)
+            content.close()
+
+        if self.dimensions is None:
+            # We assume we have a 2D file unless we find a node
+            # with a non-zero Z coordinate
+            if (nodeCoords[:, 2] != 0.0).any():
+                self.dimensions = 3
+            else:
+                self.dimensions = 2
 
-        # convert lists of cell vertices to a properly oriented masked array
-        maxVerts = max([len(v) for v in cellsToVertIDs])
-        # ticket:539 - NumPy 1.7 casts to array before concatenation and empty array defaults to float
-        cellsToVertIDs = [nx.concatenate((v, nx.array([-1] * (maxVerts-len(v)), dtype=nx.INT_DTYPE))) for v in cellsToVertIDs]
-        cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs, value=-1).swapaxes(0, 1)
+        self.coordDimensions = self.coordDimensions or self.dimensions
+
+        # we need a conditional here so we don't pick up 2D shapes in 3D
+        if self.dimensions == 2:
+            self.numVertsPerFace = {1: 2, # 2-node line
+                                    8: 2} # 3-node line
+            self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 faces)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+        elif self.dimensions == 3:
+            self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 vertices)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+            self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
+                                    11: 4, # 10-node tetrahedron (we only read 1st 4)
+                                    29: 4, # 20-node tetrahedron (we only read 1st 4)
+                                    30: 4, # 35-node tetrahedron (we only read 1st 4)
+                                    31: 4, # 56-node tetrahedron (we only read 1st 4)
+                                     5: 6, # 8-node hexahedron (6 faces)
+                                    12: 6, # 27-node tetrahedron (we only read 1st 6)
+                                    17: 6, # 20-node tetrahedron (we only read 1st 6)
+                                     6: 5, # 6-node prism (5 faces)
+                                    13: 5, # 18-node prism (we only read 1st 6)
+                                    18: 5, # 15-node prism (we only read 1st 6)
+                                     7: 5, # 5-node pyramid (5 faces)
+                                    14: 5, # 14-node pyramid (we only read 1st 5)
+                                    19: 5} # 13-node pyramid (we only read 1st 5)
+        else:
+            raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
+
+        _log.debug("Parsing elements.")
+        (cellsData,
+         ghostsData,
+         facesData) = self._parseElements(elementBlocks)
+
+        cellsToGmshVerts = _padded(cellsData.nodes + ghostsData.nodes)
+        numCellsTotal    = len(cellsToGmshVerts)
+        allShapeTypes    = nx.concatenate((cellsData.shapes, ghostsData.shapes))
+        self.physicalCellMap = nx.concatenate((cellsData.physicalEntities,
+                                               ghostsData.physicalEntities))
+        self.geometricalCellMap = nx.concatenate((cellsData.geometricalEntities,
+                                                  ghostsData.geometricalEntities))
+
+        if numCellsTotal < 1:
+            errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
+            errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
+            raise GmshException(errStr)
+
+        _log.debug("Recovering coords.")
+        _log.debug("numcells %d" % numCellsTotal)
+        vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts,
+                                                             nodeIDs, nodeCoords)
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
+                                                        vertIDtoIdx)
+
+        # cell entities were easy to record on parsing
+        # but we don't use Gmsh faces, so we need to correlate the nodes
+        # that make up the Gmsh faces with the vertex IDs of the FiPy faces
+        # so that we can check if any are named
+        facesToGmshVerts = _padded(facesData.nodes)
+        facesToVertIDs = self._translateNodesToVertices(facesToGmshVerts,
+                                                        vertIDtoIdx)
+
+        # faces with nodes that are not vertices of any cell are not
+        # faces of any cell
+        complete = ((facesToVertIDs >= 0) == (facesToGmshVerts >= 0)).all(axis=1)
+        facesToVertIDs[~complete] = -1
+
+        _log.debug("Building cells and faces.")
+        (facesToV,
+         cellsToF,
+         namedFaceIDs) = self._deriveCellsAndFaces(cellsToVertIDs,
+                                                   allShapeTypes,
+                                                   numCellsTotal,
+                                                   facesToVertIDs)
+
+        # not all faces are necessarily tagged
+        named = namedFaceIDs >= 0
+        self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.physicalFaceMap[namedFaceIDs[named]] = facesData.physicalEntities[named]
+        self.geometricalFaceMap[namedFaceIDs[named]] = facesData.geometricalEntities[named]
+
+        self.physicalNames = self._parseNames(names)
+
+        # convert cell vertices to a properly oriented masked array
+        cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs.astype(nx.INT_DTYPE),
+                                            value=-1).swapaxes(0, 1)
 
         _log.debug("Done with cells and faces.")
         return (vertexCoords, facesToV, cellsToF,
-                cellsData.idmap, ghostsData.idmap,
+                cellsData.idmap.tolist(), ghostsData.idmap.tolist(),
                 cellsToVertIDs)
 
     def write(self, obj, time=0.0, timeindex=0):
-        if not self.formatWritten:
-            self._writeMeshFormat()
-            self.formatWritten = True
-
         from fipy.meshes.abstractMesh import AbstractMesh
         from fipy.variables.cellVariable import CellVariable
 
@@ -881,6 +1133,9 @@ class MSHFile(GmshFile):
             mesh = obj
         elif isinstance(obj, CellVariable):
             mesh = obj.mesh
+            # `_write` may happen in the background, after `obj` changes
+            obj = CellVariable(mesh=mesh, name=obj.name, value=nx.array(obj.value),
+                               elementshape=obj.shape[:-1])
         else:
             raise TypeError("Unable to write %s to a MSH file" % type(obj))
 
@@ -895,7 +1150,16 @@ class MSHFile(GmshFile):
             # it's not worth the bookkeeping to be able to write more than one.
             raise ValueError("Only one Mesh can be written to a MSH file")
 
-        coords = mesh.vertexCoords
+        backgroundOutput._submit(self._write, obj, time, timeindex)
+
+    def _write(self, obj, time, timeindex):
+        from fipy.variables.cellVariable import CellVariable
+
+        if not self.formatWritten:
+            self._writeMeshFormat()
+            self.formatWritten = True
+
+        coords = self.mesh.vertexCoords
         dimensions, numNodes = coords.shape
 
         if not self.meshWritten:
@@ -996,50 +1260,44 @@ class MSHFile(GmshFile):
 
         self.fileobj.write("$EndElementData\n")
 
-    def _vertexCoordsAndMap(self, cellsToGmshVerts):
+    def _vertexCoordsAndMap(self, cellsToGmshVerts, nodeIDs, nodeCoords):
         """
         Returns `vertexCoords` and mapping from Gmsh ID to `vertexCoords`
         indices (same as in `MSHFile`).
 
-        Unlike parent, doesn't use `genfromtxt`
-        because we want to avoid loading the entire `.msh` file into memory.
+        Only the nodes used by `cellsToGmshVerts` become vertices.
         """
-        allVerts     = [v for c in cellsToGmshVerts for v in c] # flatten
-        allVerts     = nx.unique(nx.array(allVerts, dtype=nx.INT_DTYPE)) # remove dups
-        allVerts     = nx.sort(allVerts)
+        allVerts     = nx.unique(cellsToGmshVerts[cellsToGmshVerts >= 0]) # sorted set
         maxVertIdx   = allVerts[-1] + 1 # add one to offset zero
         vertGIDtoIdx = nx.ones(maxVertIdx, 'l') * -1 # gmsh ID -> vertexCoords idx
-        vertexCoords = nx.empty((len(allVerts), self.coordDimensions))
-        nodeCount    = 0
 
         # establish map. This works because allVerts is a sorted set.
         vertGIDtoIdx[allVerts] = nx.arange(len(allVerts))
 
-        nodesFile = open(self.nodesPath, 'r')
-        nodesFile.readline() # skip number of nodes
-
-        # now we walk through node file with a sorted unique list of vertices
-        # in hand. When we encounter 0th element in `allVerts`, save it
-        # to `vertexCoords` then pop its ID off `allVerts`.
-        for node in nodesFile:
-            line   = node.split()
-            nodeID = int(line[0])
-
-            if nodeID == allVerts[nodeCount]:
-                newVert = [float(x) for x in line[1:self.coordDimensions+1]]
-                vertexCoords[nodeCount,:] = nx.array(newVert)
-                nodeCount += 1
-
-            if len(allVerts) == nodeCount:
-                break
-
-        nodesFile.close()
+        # find the rows of the nodes, which need not be in order
+        order = nx.argsort(nodeIDs)
+        rows = nx.searchsorted(nodeIDs[order], allVerts)
+        rows = order[nx.minimum(rows, len(order) - 1)]
+        if len(order) == 0 or (nodeIDs[rows] != allVerts).any():
+            raise GmshException("Elements refer to nodes that are not in the file")
 
         # transpose for FiPy
-        transCoords = vertexCoords.swapaxes(0, 1)
+        transCoords = nodeCoords[rows, :self.coordDimensions].swapaxes(0, 1)
         return transCoords, vertGIDtoIdx
 
-    def _parseElementFile(self):
+    @staticmethod
+    def _entityTags(tags):
+        """
+        Splits the `tags` of elements into their physical entities, their
+        geometrical entities, and any remaining tags.
+        """
+        if tags.shape[1] >= 2:
+            return tags[:, 0], tags[:, 1], tags[:, 2:]
+        else:
+            none = -nx.ones(len(tags), dtype=nx.INT_DTYPE)
+            return none, none, tags
+
+    def _parseElements(self, blocks):
         """
         Return three objects, the first for non-ghost cells, the second for
         ghost cells, and the third for faces.
@@ -1048,108 +1306,88 @@ class MSHFile(GmshFile):
         calculation is consolidated here: if we were ever to need to CALCULATE
         GHOST CELLS OURSELVES, the only code we'd have to change is in here.
         """
-
-        def _parseTags(offset, currLineInts):
-            if offset == -1:
-                # if first valid shape
-                offset = currLineInts[0]
-
-            numTags = currLineInts[2]
-            tags    = currLineInts[3:(3+numTags)]
-
-            # the partition tags for don't seem to always be present
-            # and don't always make much sense when they are
-
-            if len(tags) >= 2:
-                physicalEntity = tags.pop(0)
-                geometricalEntity = tags.pop(0)
-            else:
-                physicalEntity = geometricalEntity = -1
-
-            return offset, tags, physicalEntity, geometricalEntity
-
-
         cellsData = _ElementData()
         ghostsData = _ElementData()
         facesData = _ElementData()
 
-        cellOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        faceOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
+        cellOffset = None # this will be subtracted from gmsh ID to obtain global ID
+        faceOffset = None # this will be subtracted from gmsh ID to obtain global ID
         pid = self.communicator.procID + 1
 
-        elemsFile = open(self.elemsPath, 'r')
+        for ids, elType, tags, nodes in blocks:
+            if elType in self.numFacesPerCell:
+                # elements are cells
 
-        elemsFile.readline() # skip number of elements
-        for el in elemsFile:
-            currLineInts = [int(x) for x in el.split()]
-            elemType     = currLineInts[1]
+                if cellOffset is None:
+                    # if first valid shape
+                    cellOffset = ids[0]
+                ids = ids - cellOffset
 
-            if elemType in list(self.numFacesPerCell.keys()):
-                # element is a cell
+                (physicalEntities,
+                 geometricalEntities,
+                 tags) = self._entityTags(tags)
 
-                (cellOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=cellOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= cellOffset
+                # the partition tags for don't seem to always be present
+                # and don't always make much sense when they are
 
-                if len(tags) > 0:
+                if tags.shape[1] > 0:
                     # next item is a count
-                    if tags[0] != len(tags) - 1:
-                        warnings.warn("Partition count %d does not agree with number of remaining tags %d." % (tags[0], len(tags) - 1),
+                    wrong = nx.nonzero(tags[:, 0] != tags.shape[1] - 1)[0]
+                    if len(wrong) > 0:
+                        warnings.warn("Partition count %d does not agree with number of remaining tags %d."
+                                      % (tags[wrong[0], 0], tags.shape[1] - 1),
                                       SyntaxWarning, stacklevel=2)
-                    tags = tags[1:]
+                    tags = tags[:, 1:]
 
                 if self.communicator.Nproc > 1:
-                    for tag in tags:
-                        if -tag == pid:
-                            # if we're collecting ghost cells and this is our ghost cell
-                            ghostsData.add(currLine=currLineInts, elType=elemType,
-                                           physicalEntity=physicalEntity,
-                                           geometricalEntity=geometricalEntity)
-                        elif tag == pid:
-                            # el is in this processor's partition or we collect all cells
-                            cellsData.add(currLine=currLineInts, elType=elemType,
-                                          physicalEntity=physicalEntity,
-                                          geometricalEntity=geometricalEntity)
+                    # if we're collecting ghost cells and this is our ghost cell
+                    ghosts = (-tags == pid).any(axis=1)
+                    ghostsData.add(ids=ids[ghosts], elType=elType, nodes=nodes[ghosts],
+                                   physicalEntities=physicalEntities[ghosts],
+                                   geometricalEntities=geometricalEntities[ghosts])
+
+                    # el is in this processor's partition or we collect all cells
+                    cells = (tags == pid).any(axis=1)
+                    cellsData.add(ids=ids[cells], elType=elType, nodes=nodes[cells],
+                                  physicalEntities=physicalEntities[cells],
+                                  geometricalEntities=geometricalEntities[cells])
                 else:
                     # we collect all cells
-                    cellsData.add(currLine=currLineInts, elType=elemType,
-                                  physicalEntity=physicalEntity,
-                                  geometricalEntity=geometricalEntity)
-            elif elemType in list(self.numVertsPerFace.keys()):
-                # element is a face
-
-                (faceOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=faceOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= faceOffset
-
-                facesData.add(currLine=currLineInts, elType=elemType,
-                              physicalEntity=physicalEntity,
-                              geometricalEntity=geometricalEntity)
-
-        elemsFile.close()
+                    cellsData.add(ids=ids, elType=elType, nodes=nodes,
+                                  physicalEntities=physicalEntities,
+                                  geometricalEntities=geometricalEntities)
+            elif elType in self.numVertsPerFace:
+                # elements are faces
+
+                if faceOffset is None:
+                    faceOffset = ids[0]
+                ids = ids - faceOffset
+
+                (physicalEntities,
+                 geometricalEntities,
+                 tags) = self._entityTags(tags)
+
+                # only the corners of higher order faces are vertices
+                facesData.add(ids=ids, elType=elType,
+                              nodes=nodes[:, :self.numVertsPerFace[elType]],
+                              physicalEntities=physicalEntities,
+                              geometricalEntities=geometricalEntities)
 
         return cellsData, ghostsData, facesData
 
 
-    def _parseNamesFile(self):
+    def _parseNames(self, names):
         physicalNames = {
             0: dict(),
             1: dict(),
             2: dict(),
             3: dict()
         }
-        if self.namesPath is not None:
-            namesFile = open(self.namesPath, 'r')
-
-            namesFile.readline() # skip number of elements
-            for nm in namesFile:
+        if names is not None:
+            for nm in names.splitlines():
                 nm = nm.split()
+                if len(nm) == 0:
+                    continue
                 if self.version > 2.0:
                     dim = [int(nm.pop(0))]
                 else:
@@ -1162,10 +1400,7 @@ class MSHFile(GmshFile):
                 for d in dim:
                     physicalNames[d][name] = int(num)
 
-            namesFile.close()
-
         return physicalNames
-
     def makeMapVariables(self, mesh):
         """Utility function to make `MeshVariables` that define different domains in the mesh
         """
@@ -1268,31 +1503,82 @@ class MSHFile(GmshFile):
         """
         pass
 
+def _padded(arrays, width=None):
+    """Stack arrays of different numbers of columns, padded with -1
+    """
+    if width is None:
+        width = max([a.shape[1] for a in arrays] + [0])
+    padded = -nx.ones((sum([len(a) for a in arrays]), width), dtype=nx.INT_DTYPE)
+    row = 0
+    for a in arrays:
+        padded[row:row + len(a), :a.shape[1]] = a
+        row += len(a)
+
+    return padded
+
+def _uniqueRows(rows):
+    """Groups identical `rows`
+
+    Returns the index of the first of each group of rows, with the groups in
+    lexicographical order, and the group of each row.
+    """
+    # lexsort is stable, so the first of each group is its first occurrence
+    order = nx.lexsort(rows.T[::-1])
+    sortedRows = rows[order]
+    new = nx.ones(len(rows), dtype=bool)
+    new[1:] = (sortedRows[1:] != sortedRows[:-1]).any(axis=1)
+
+    inverse = nx.empty(len(rows), dtype=nx.INT_DTYPE)
+    inverse[order] = nx.cumsum(new) - 1
+
+    return order[new], inverse
+
 class _ElementData(object):
     """
     Bookkeeping for cells. Declared as own class for generality.
 
+    Elements are added in blocks of the same type.
+
     :Properties:
-    - `nodes`: A Python list of the vertices that make up this element
-    - `shapes`: A `shapeTypes` Python list
-    - `idmap`: A Python list which maps `vertexCoords` index to global ID
-    - `physicalEntities`: A Python list of the Gmsh physical entities each element is in
-    - `geometricalEntities`: A Python list of the Gmsh geometrical entities each element is in
+    - `nodes`: A Python list of arrays of the vertices that make up the elements of each block
+    - `shapes`: An array of `shapeTypes`
+    - `idmap`: An array which maps `vertexCoords` index to global ID
+    - `physicalEntities`: An array of the Gmsh physical entities each element is in
+    - `geometricalEntities`: An array of the Gmsh geometrical entities each element is in
     """
     def __init__(self):
         self.nodes = []
-        self.shapes = []
-        self.idmap = [] # vertexCoords idx -> gmsh ID (global ID)
-        self.physicalEntities = []
-        self.geometricalEntities = []
-
-    def add(self, currLine, elType, physicalEntity, geometricalEntity):
-        numTags = currLine[2]
-        self.nodes.append(currLine[(numTags+3):])
-        self.shapes.append(elType)
-        self.idmap.append(currLine[0])
-        self.physicalEntities.append(physicalEntity)
-        self.geometricalEntities.append(geometricalEntity)
+        self._shapes = []
+        self._idmap = [] # vertexCoords idx -> gmsh ID (global ID)
+        self._physicalEntities = []
+        self._geometricalEntities = []
+
+    def add(self, ids, elType, nodes, physicalEntities, geometricalEntities):
+        self.nodes.append(nodes)
+        self._shapes.append(nx.zeros(len(ids), dtype=nx.INT_DTYPE) + elType)
+        self._idmap.append(ids)
+        self._physicalEntities.append(physicalEntities)
+        self._geometricalEntities.append(geometricalEntities)
+
+    @staticmethod
+    def _concatenate(arrays):
+        return nx.concatenate([nx.zeros((0,), dtype=nx.INT_DTYPE)] + arrays).astype('l')
+
+    @property
+    def shapes(self):
+        return self._concatenate(self._shapes)
+
+    @property
+    def idmap(self):
+        return self._concatenate(self._idmap)
+
+    @property
+    def physicalEntities(self):
+        return self._concatenate(self._physicalEntities)
+
+    @property
+    def geometricalEntities(self):
+        return self._concatenate(self._geometricalEntities)
 
 class _GmshTopology(_MeshTopology):
 
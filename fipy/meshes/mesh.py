@@ -3,7 +3,7 @@ from __future__ import unicode_literals
 from builtins import range
 __docformat__ = 'restructuredtext'
 
-from fipy.meshes.abstractMesh import AbstractMesh
+from fipy.meshes.abstractMesh import AbstractMesh, _compressCellFaces, _padCellFaces
 from fipy.meshes.representations.meshRepresentation import _MeshRepresentation
 from fipy.meshes.topologies.meshTopology import _MeshTopology
 
@@ -19,6 +19,42 @@ __all__ = [text_to_native_str(n) for n in __all__]
 class MeshAdditionError(Exception):
     pass
 
+class _LazyGeometry(object):
+    """Geometry of a `Mesh` that is calculated when it is first needed
+
+    The value returned by the `calc` method of the mesh is kept in the
+    instance dictionary of the mesh, which hides this (non-data) descriptor,
+    until `Mesh._forgetGeometry()` removes it.
+
+    Parameters
+    ----------
+    name : str
+        Name of the geometry attribute
+    calc : str
+        Name of the method of the mesh that calculates the geometry
+    names : tuple of str, optional
+        Names of all the geometry attributes, in order, if `calc` returns
+        several of them
+    """
+    def __init__(self, name, calc, names=None):
+        self.name = name
+        self.calc = calc
+        self.names = names or (name,)
+
+    def __get__(self, mesh, owner=None):
+        if mesh is None:
+            return self
+
+        values = getattr(mesh, self.calc)()
+        if len(self.names) == 1:
+            values = (values,)
+
+        # keep all the geometry that is calculated together
+        for name, value in zip(self.names, values):
+            mesh.__dict__[name] = value
+
+        return mesh.__dict__[self.name]
+
 class Mesh(AbstractMesh):
     """Generic mesh class using numerix to do the calculations
 
@@ -35,8 +71,10 @@ class Mesh(AbstractMesh):
         """faceVertexIds and cellFacesIds must be padded with minus ones."""
 
         self.vertexCoords = vertexCoords
-        self.faceVertexIDs = MA.masked_values(faceVertexIDs, -1)
-        self.cellFaceIDs = MA.masked_values(cellFaceIDs, -1)
+        self.faceVertexIDs = MA.masked_values(faceVertexIDs, -1).astype(
+            numerix._indexDtype(numerix.shape(vertexCoords)[-1]))
+        self.cellFaceIDs = MA.masked_values(cellFaceIDs, -1).astype(
+            numerix._indexDtype(numerix.shape(faceVertexIDs)[-1]))
 
         self.dim = self.vertexCoords.shape[0]
 
@@ -49,10 +87,74 @@ class Mesh(AbstractMesh):
         if not hasattr(self, "globalNumberOfFaces"):
             self.globalNumberOfFaces = self.numberOfFaces
 
-        self.faceCellIDs = self._calcFaceCellIDs()
+        from fipy.meshes import meshCache
+        key = meshCache._key(self.__class__.__module__, self.__class__.__name__,
+                             vertexCoords, faceVertexIDs, cellFaceIDs,
+                             self.communicator.procID, self.communicator.Nproc,
+                             self._cacheableAttributes())
+        cached = meshCache._load(key)
+
+        if cached is None:
+            self.faceCellIDs = self._calcFaceCellIDs()
+
+            self._setTopology()
+            self._setGeometry(scaleLength = 1.)
+
+            if key is not None:
+                # caching needs all of the geometry now
+                meshCache._save(key, dict((name, getattr(self, name))
+                                          for name in ("faceCellIDs",) + self._geometryNames))
+        else:
+            self.faceCellIDs = cached.pop("faceCellIDs")
+
+            self._setTopology()
+            self.__dict__.update(cached)
+            self._setScaledGeometry(self.scale['length'])
+
+    def _getCellFaceIDsInternal(self):
+        return _padCellFaces(self._cellFaceOffsets, self._cellFaceIDsCompressed,
+                             self._cellFacePadding)
+
+    def _setCellFaceIDsInternal(self, newVal):
+        newVal = MA.array(newVal)
+        self._cellFacePadding = newVal.shape[0]
+        self._cellFaceOffsets, self._cellFaceIDsCompressed = _compressCellFaces(newVal)
+
+    cellFaceIDs = property(_getCellFaceIDsInternal, _setCellFaceIDsInternal,
+                           doc="""Faces of each cell, padded to the largest number of
+                           faces of any cell and masked where a cell has fewer
+
+                           Derived from the compressed sparse row form in which
+                           the faces are stored, which it is a view of when every
+                           cell has the same number of faces.
+                           """)
+
+    def _getCellToFaceOrientations(self):
+        return _padCellFaces(self._cellFaceOffsets, self._cellToFaceOrientationsCompressed,
+                             self._cellFacePadding)
 
-        self._setTopology()
-        self._setGeometry(scaleLength = 1.)
+    def _setCellToFaceOrientations(self, newVal):
+        newVal = MA.array(newVal, mask=MA.getmaskarray(self.cellFaceIDs))
+        _, self._cellToFaceOrientationsCompressed = _compressCellFaces(newVal)
+
+    _cellToFaceOrientations = property(_getCellToFaceOrientations, _setCellToFaceOrientations)
+
+    @property
+    def _maxFacesPerCell(self):
+        return self._cellFacePadding
+
+    @property
+    def _cellFaceIDsCSR(self):
+        return (self._cellFaceOffsets,
+                self._cellFaceIDsCompressed,
+                self._cellToFaceOrientationsCompressed)
+
+    def _cacheableAttributes(self):
+        """Attributes, set by subclasses before `Mesh.__init__`, that
+        geometric calculations may depend on
+        """
+        return dict((name, value) for name, value in self.__dict__.items()
+                    if name not in ("communicator", "representation", "topology"))
 
     """
     Topology set and calculate
@@ -95,7 +197,8 @@ class Mesh(AbstractMesh):
 
     def _calcCellToFaceOrientations(self):
         tmp = numerix.take(self.faceCellIDs[0], self.cellFaceIDs)
-        return (tmp == MA.indices(tmp.shape)[-1]) * 2 - 1
+        orientations = (tmp == MA.indices(tmp.shape, tmp.dtype)[-1]) * 2 - 1
+        return orientations.astype(numerix.int8)
 
     def _calcAdjacentCellIDs(self):
         return (MA.filled(self.faceCellIDs[0]),
@@ -112,7 +215,8 @@ class Mesh(AbstractMesh):
     def _calcCellToCellIDsFilled(self):
         N = self.numberOfCells
         M = self._maxFacesPerCell
-        cellIDs = numerix.repeat(numerix.arange(N)[numerix.newaxis, ...], M, axis=0)
+        cellIDs = numerix.repeat(numerix.arange(N, dtype=self._cellToCellIDs.dtype)[numerix.newaxis, ...],
+                                 M, axis=0)
         return MA.where(MA.getmaskarray(self._cellToCellIDs), cellIDs,
                         self._cellToCellIDs)
 
@@ -120,26 +224,118 @@ class Mesh(AbstractMesh):
     Geometry set and calculate
     """
 
+    # spatial index of the cell centers, built on demand
+    _cellCenterTree = None
+
+    # outward normals and heights of the cell faces, built on demand
+    _cellHalfSpaces = None
+
+    # unscaled geometry, calculated when first needed
+    _geometryNames = ("_faceCenters",
+                      "_faceAreas",
+                      "_cellCenters",
+                      "_internalFaceToCellDistances",
+                      "_cellToFaceDistanceVectors",
+                      "_internalCellDistances",
+                      "_cellDistanceVectors",
+                      "faceNormals",
+                      "_orientedFaceNormals",
+                      "_cellVolumes",
+                      "_faceCellToCellNormals",
+                      "_faceTangents1",
+                      "_faceTangents2",
+                      "_cellToCellDistances",
+                      "_cellAreas",
+                      "_cellNormals")
+
+    _faceCenters = _LazyGeometry("_faceCenters", "_calcFaceCenters")
+    _faceAreas = _LazyGeometry("_faceAreas", "_calcFaceAreas")
+    _cellCenters = _LazyGeometry("_cellCenters", "_calcCellCenters")
+    _internalFaceToCellDistances = _LazyGeometry("_internalFaceToCellDistances",
+                                                 "_calcFaceToCellDistAndVec",
+                                                 names=("_internalFaceToCellDistances", "_cellToFaceDistanceVectors"))
+    _cellToFaceDistanceVectors = _LazyGeometry("_cellToFaceDistanceVectors",
+                                               "_calcFaceToCellDistAndVec",
+                                               names=("_internalFaceToCellDistances", "_cellToFaceDistanceVectors"))
+    _internalCellDistances = _LazyGeometry("_internalCellDistances",
+                                           "_calcCellDistAndVec",
+                                           names=("_internalCellDistances", "_cellDistanceVectors"))
+    _cellDistanceVectors = _LazyGeometry("_cellDistanceVectors",
+                                         "_calcCellDistAndVec",
+                                         names=("_internalCellDistances", "_cellDistanceVectors"))
+    faceNormals = _LazyGeometry("faceNormals", "_calcFaceNormals")
+    _orientedFaceNormals = _LazyGeometry("_orientedFaceNormals", "_calcOrientedFaceNormals")
+    _cellVolumes = _LazyGeometry("_cellVolumes", "_calcCellVolumes")
+    _faceCellToCellNormals = _LazyGeometry("_faceCellToCellNormals", "_calcFaceCellToCellNormals")
+    _faceTangents1 = _LazyGeometry("_faceTangents1",
+                                   "_calcFaceTangents",
+                                   names=("_faceTangents1", "_faceTangents2"))
+    _faceTangents2 = _LazyGeometry("_faceTangents2",
+                                   "_calcFaceTangents",
+                                   names=("_faceTangents1", "_faceTangents2"))
+    _cellToCellDistances = _LazyGeometry("_cellToCellDistances", "_calcCellToCellDist")
+    _cellAreas = _LazyGeometry("_cellAreas", "_calcCellAreas")
+    _cellNormals = _LazyGeometry("_cellNormals", "_calcCellNormals")
+
     def _setGeometry(self, scaleLength = 1.):
-        self._faceCenters = self._calcFaceCenters()
-        self._faceAreas = self._calcFaceAreas()
-        self._cellCenters = self._calcCellCenters()
-        (self._internalFaceToCellDistances,
-         self._cellToFaceDistanceVectors) = self._calcFaceToCellDistAndVec()
-        (self._internalCellDistances,
-         self._cellDistanceVectors) = self._calcCellDistAndVec()
-        self.faceNormals = self._calcFaceNormals()
-        self._orientedFaceNormals = self._calcOrientedFaceNormals()
-        self._cellVolumes = self._calcCellVolumes()
-        self._faceCellToCellNormals = self._calcFaceCellToCellNormals()
-        (self._faceTangents1,
-         self._faceTangents2) = self._calcFaceTangents()
-        self._cellToCellDistances = self._calcCellToCellDist()
+        """Forget any geometry calculated so far
 
+        It will be calculated again when it is next needed.
+        """
+        self._forgetGeometry(self._geometryNames)
         self._setScaledGeometry(self.scale['length'])
 
-        self._cellAreas = self._calcCellAreas()
-        self._cellNormals = self._calcCellNormals()
+    def _forgetGeometry(self, names):
+        for name in names:
+            self.__dict__.pop(name, None)
+
+    def _calcAllGeometry(self):
+        """Calculate all the geometry that has not been calculated yet
+
+        Needed before changing `vertexCoords` or the geometry in place,
+        when the rest of the geometry must not see the change.
+        """
+        for name in self._geometryNames + self._scaledGeometryNames:
+            getattr(self, name)
+
+    @property
+    def _geometryNbytes(self):
+        """Memory used by each part of the geometry calculated so far
+
+        Nothing is calculated until it is needed, unless the geometry is
+        cached
+
+        >>> from fipy.meshes import meshCache
+        >>> cacheDirectory, meshCache.cacheDirectory = meshCache.cacheDirectory, None
+        >>> from fipy.meshes.tri2D import Tri2D
+        >>> mesh = Tri2D(nx=10, ny=10)
+        >>> print(mesh._geometryNbytes)
+        {}
+
+        and only what is needed is calculated
+
+        >>> volumes = mesh.cellVolumes
+        >>> print(mesh._geometryNbytes["_cellVolumes"])
+        3200
+        >>> print("_faceTangents1" in mesh._geometryNbytes)
+        False
+
+        until the geometry changes
+
+        >>> mesh._setGeometry()
+        >>> print(mesh._geometryNbytes)
+        {}
+
+        >>> meshCache.cacheDirectory = cacheDirectory
+        """
+        nbytes = {}
+        for name in self._geometryNames + self._scaledGeometryNames:
+            if name in self.__dict__:
+                value = self.__dict__[name]
+                nbytes[name] = numerix.asarray(MA.getdata(value)).nbytes
+                if MA.getmask(value) is not MA.nomask:
+                    nbytes[name] += MA.getmask(value).nbytes
+        return nbytes
 
     def _calcFaceAreas(self):
         faceVertexIDs = MA.filled(self.faceVertexIDs, -1)
@@ -326,20 +522,61 @@ class Mesh(AbstractMesh):
         self._scale['volume'] = self._calcVolumeScale()
         self._setScaledValues()
 
+    # scaled geometry, calculated when first needed
+    _scaledGeometryNames = ("_scaledFaceAreas",
+                            "_scaledCellVolumes",
+                            "_scaledCellCenters",
+                            "_scaledFaceToCellDistances",
+                            "_scaledCellDistances",
+                            "_scaledCellToCellDistances",
+                            "_areaProjections",
+                            "_orientedAreaProjections",
+                            "_faceToCellDistanceRatio",
+                            "_faceAspectRatios")
+
+    # the scaled geometry that depends on the connections between faces
+    _faceDependentScaledGeometryNames = _scaledGeometryNames[5:]
+
+    _scaledFaceAreas = _LazyGeometry("_scaledFaceAreas", "_calcScaledFaceAreas")
+    _scaledCellVolumes = _LazyGeometry("_scaledCellVolumes", "_calcScaledCellVolumes")
+    _scaledCellCenters = _LazyGeometry("_scaledCellCenters", "_calcScaledCellCenters")
+    _scaledFaceToCellDistances = _LazyGeometry("_scaledFaceToCellDistances", "_calcScaledFaceToCellDistances")
+    _scaledCellDistances = _LazyGeometry("_scaledCellDistances", "_calcScaledCellDistances")
+    _scaledCellToCellDistances = _LazyGeometry("_scaledCellToCellDistances", "_calcScaledCellToCellDistances")
+    _areaProjections = _LazyGeometry("_areaProjections", "_calcAreaProjections")
+    _orientedAreaProjections = _LazyGeometry("_orientedAreaProjections", "_calcOrientedAreaProjections")
+    _faceToCellDistanceRatio = _LazyGeometry("_faceToCellDistanceRatio", "_calcFaceToCellDistanceRatio")
+    _faceAspectRatios = _LazyGeometry("_faceAspectRatios", "_calcFaceAspectRatios")
+
     def _setScaledValues(self):
-        self._scaledFaceAreas = self._scale['area'] * self._faceAreas
-        self._scaledCellVolumes = self._scale['volume'] * self._cellVolumes
-        self._scaledCellCenters = self._scale['length'] * self._cellCenters
-        self._scaledFaceToCellDistances = self._scale['length'] * self._faceToCellDistances
-        self._scaledCellDistances = self._scale['length'] * self._cellDistances
-        self._setFaceDependentScaledValues()
+        # the scale may change before the scaled geometry is calculated
+        self._geometryScale = dict(self._scale)
+        self._forgetGeometry(self._scaledGeometryNames)
+        # cell centers may have moved
+        self._cellCenterTree = None
+        self._cellHalfSpaces = None
 
     def _setFaceDependentScaledValues(self):
-        self._scaledCellToCellDistances = self._scale['length'] * self._cellToCellDistances
-        self._areaProjections = self._calcAreaProjections()
-        self._orientedAreaProjections = self._calcOrientedAreaProjections()
-        self._faceToCellDistanceRatio = self._calcFaceToCellDistanceRatio()
-        self._faceAspectRatios = self._calcFaceAspectRatios()
+        self._geometryScale = dict(self._scale)
+        self._forgetGeometry(self._faceDependentScaledGeometryNames)
+
+    def _calcScaledFaceAreas(self):
+        return self._geometryScale['area'] * self._faceAreas
+
+    def _calcScaledCellVolumes(self):
+        return self._geometryScale['volume'] * self._cellVolumes
+
+    def _calcScaledCellCenters(self):
+        return self._geometryScale['length'] * self._cellCenters
+
+    def _calcScaledFaceToCellDistances(self):
+        return self._geometryScale['length'] * self._faceToCellDistances
+
+    def _calcScaledCellDistances(self):
+        return self._geometryScale['length'] * self._cellDistances
+
+    def _calcScaledCellToCellDistances(self):
+        return self._geometryScale['length'] * self._cellToCellDistances
 
     def _calcAreaScale(self):
         return self.scale['length']**2
@@ -420,16 +657,16 @@ class Mesh(AbstractMesh):
         True
 
         """
-        self._cellToCellDistances = self._calcCellToCellDist()
-        self._faceCellToCellNormals = self._calcFaceCellToCellNormals()
+        self._forgetGeometry(("_cellToCellDistances", "_faceCellToCellNormals"))
         self._setFaceDependentScaledValues()
 
     """calculate Topology methods"""
 
     def _calcFaceCellIDs(self):
-        array = MA.array(MA.indices(self.cellFaceIDs.shape, 'l')[1],
+        dtype = numerix._indexDtype(self.numberOfCells)
+        array = MA.array(MA.indices(self.cellFaceIDs.shape, dtype)[1],
                          mask=MA.getmask(self.cellFaceIDs))
-        faceCellIDs = MA.zeros((2, self.numberOfFaces), 'l')
+        faceCellIDs = MA.zeros((2, self.numberOfFaces), dtype)
 
         ## Nasty bug: MA.put(arr, ids, values) fills its ids and
         ## values arguments when masked!  This was not the behavior
@@ -453,10 +690,6 @@ class Mesh(AbstractMesh):
 
     """get Topology methods"""
 
-    @property
-    def _maxFacesPerCell(self):
-        return self.cellFaceIDs.shape[0]
-
     @property
     def _cellVertexIDs(self):
         ## Get all the vertices from all the faces for each cell
@@ -543,8 +776,154 @@ class Mesh(AbstractMesh):
            >>> print(m0._getNearestCellID(m1.cellCenters.globalValue))
            [4 5 7 8]
 
+        The spatial index of the cell centers is kept for later searches,
+        until the geometry of the mesh changes
+
+           >>> tree = m0._cellCenterTree
+           >>> print(m0._getNearestCellID(([0.05], [5.])))
+           [6]
+           >>> print(m0._cellCenterTree is tree)
+           True
+           >>> m0._setScaledValues()
+           >>> print(m0._cellCenterTree is None)
+           True
+
+        """
+        cellCenters = self.cellCenters.globalValue
+
+        return numerix.nearest(data=cellCenters, points=points,
+                               tree=self._getCellCenterTree(cellCenters))
+
+    def _getCellCenterTree(self, cellCenters):
+        if self._cellCenterTree is None and not isinstance(cellCenters, PhysicalField):
+            self._cellCenterTree = numerix._kdtree(cellCenters)
+
+        return self._cellCenterTree
+
+    def _getContainingCellID(self, points, max_mem=1e8):
+        """IDs of the cells that contain `points`
+
+        The nearest cell center does not generally identify the cell that
+        contains a point of an unstructured or graded mesh.  The cells whose
+        centers are closest to each point are tested for containment;
+        points that lie in none of these cells, such as those outside the
+        mesh, are assigned to the cell with the nearest center.
+
+        Test cases
+
+           >>> from fipy import *
+           >>> m = Grid1D(dx=(.1, 1., 10.))
+           >>> print(m._getNearestCellID(([3.],)))
+           [1]
+           >>> print(m._getContainingCellID(([3.],)))
+           [2]
+           >>> print(m._getContainingCellID(([-1., 0., 1.1, 20.],)))
+           [0 0 1 2]
+
+        Triangles are located exactly, even when they are long and thin
+
+           >>> m = Tri2D(nx=5, ny=1, dx=1., dy=0.01)
+           >>> x, y = numerix.random.RandomState(1).random_sample((2, 1000)) * [[5.], [0.01]]
+           >>> ids = m._getContainingCellID((x, y), max_mem=1e4)
+           >>> print((ids != m._getNearestCellID((x, y))).any())
+           True
+           >>> exhaustive = m._findContainingCells(numerix.array((x, y)),
+           ...                                         k=m.numberOfCells)
+           >>> print(numerix.allequal(ids, exhaustive))
+           True
+
+        Cells that are distorted by periodic connection are never
+        misidentified
+
+           >>> m = PeriodicGrid1D(nx=3)
+           >>> print(m._getContainingCellID(([0.05, 1.5, 2.9, 3.5],)))
+           [0 1 2 2]
+
+        """
+        cellCenters = self.cellCenters.globalValue
+        tree = self._getCellCenterTree(cellCenters)
+        if (tree is None
+            or self.communicator.Nproc > 1
+            or isinstance(points, PhysicalField)):
+            return self._getNearestCellID(points)
+
+        points = numerix.asarray(points)
+        if points.ndim != 2 or points.shape[0] != self.dim:
+            return self._getNearestCellID(points)
+        points = numerix.asarray(points, dtype=float)
+
+        N = cellCenters.shape[-1]
+        k = min(N, 2**(self.dim + 1))
+        cellIDs = self._findContainingCells(points, k=k, max_mem=max_mem)
+
+        # look further afield for points in cells with distant centers
+        missing = numerix.nonzero(cellIDs < 0)[0]
+        if len(missing) > 0 and k < N:
+            cellIDs[missing] = self._findContainingCells(points[..., missing],
+                                                         k=min(N, 4 * k),
+                                                         max_mem=max_mem)
+            missing = numerix.nonzero(cellIDs < 0)[0]
+
+        if len(missing) > 0:
+            cellIDs[missing] = self._getNearestCellID(points[..., missing])
+
+        return cellIDs
+
+    def _getCellHalfSpaces(self):
+        """Face IDs, outward normals and heights of every cell
+
+        A point lies in a (convex) cell when it is below all of the planes
+        of the cell's faces.  Missing faces of a cell are replaced by its
+        first face.
+        """
+        if self._cellHalfSpaces is None:
+            faceIDs = MA.filled(self.cellFaceIDs, -1)
+            faceIDs = numerix.where(faceIDs < 0, faceIDs[0], faceIDs)
+            orientations = MA.filled(self._cellToFaceOrientations, 0)
+            orientations = numerix.where(orientations == 0,
+                                         orientations[0], orientations)
+            normals = self.faceNormals[..., faceIDs] * orientations
+            heights = numerix.sum((self._faceCenters[..., faceIDs]
+                                   - self._cellCenters[..., numerix.newaxis, :])
+                                  * normals, axis=0)
+            self._cellHalfSpaces = (faceIDs, normals, heights)
+
+        return self._cellHalfSpaces
+
+    def _findContainingCells(self, points, k, max_mem=1e8, tolerance=1e-10):
+        """Search the `k` cells with the nearest centers to each point
+
+        Returns `-1` for points that are in none of these cells.
         """
-        return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        faceIDs, normals, heights = self._getCellHalfSpaces()
+        cellCenters = self._cellCenters
+        faceCenters = self._faceCenters
+        D, M = points.shape
+        F = faceIDs.shape[0]
+
+        numChunks = int(round(2 * D * F * k * points.itemsize * M / max_mem + 0.5))
+
+        cellIDs = numerix.empty((M,), dtype=numerix.INT_DTYPE)
+        for chunk in numerix.array_split(numerix.arange(M), numChunks):
+            chunkOfPoints = points[..., chunk]
+            _, candidates = self._cellCenterTree.query(chunkOfPoints.T, k=k)
+            # break ties in favor of the lowest cell ID, as `nearest` does
+            candidates = numerix.sort(candidates.reshape((len(chunk), k)), axis=-1)
+
+            offsets = numerix.sum((chunkOfPoints[..., numerix.newaxis, :, numerix.newaxis]
+                                   - faceCenters[..., faceIDs[..., candidates]])
+                                  * normals[..., candidates], axis=0)
+            inside = numerix.logical_and.reduce(offsets <= tolerance * heights[..., candidates],
+                                                axis=0)
+
+            distances = cellCenters[..., candidates] - chunkOfPoints[..., numerix.newaxis]
+            distances = numerix.where(inside, numerix.sum(distances * distances, axis=0),
+                                      numerix.inf)
+            closest = candidates[numerix.arange(len(chunk)),
+                                 numerix.argmin(distances, axis=-1)]
+            cellIDs[chunk] = numerix.where(inside.any(axis=-1), closest, -1)
+
+        return cellIDs
 
     def _test(self):
         """
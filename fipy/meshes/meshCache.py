@@ -0,0 +1,224 @@
+"""Persistent storage of expensive mesh calculations
+
+Unstructured meshes recalculate their topology and geometry every time they
+are constructed, and :class:`~fipy.meshes.gmshMesh.Gmsh2D` and
+:class:`~fipy.meshes.gmshMesh.Gmsh3D` also re-parse their `.msh` file.
+When the :envvar:`FIPY_MESH_CACHE` environment variable names a directory
+(or `cacheDirectory` is assigned), the results of these calculations are
+stored there as `.npz` files, keyed by a digest of everything they were
+calculated from, and are loaded, rather than recalculated, the next time
+the same mesh is built.
+
+    >>> import shutil
+    >>> import tempfile
+    >>> from fipy.meshes import meshCache
+    >>> from fipy.meshes.tri2D import Tri2D
+    >>> meshCache.cacheDirectory = tempfile.mkdtemp()
+    >>> mesh = Tri2D(nx=3, ny=2)
+    >>> print(len(os.listdir(meshCache.cacheDirectory)))
+    1
+
+A mesh with the same description does not recalculate anything
+
+    >>> def recalculate(self):
+    ...     raise AssertionError("geometry was recalculated")
+    >>> Tri2D._calcFaceCellIDs = recalculate
+    >>> cached = Tri2D(nx=3, ny=2)
+    >>> del Tri2D._calcFaceCellIDs
+    >>> print(numerix.allclose(cached.cellVolumes, mesh.cellVolumes))
+    True
+    >>> print(numerix.allclose(cached._cellToCellDistances, mesh._cellToCellDistances))
+    True
+    >>> print((cached.faceCellIDs.mask == mesh.faceCellIDs.mask).all())
+    True
+    >>> print(cached._orientedFaceNormals is cached.faceNormals)
+    True
+    >>> print((cached.exteriorFaces == mesh.exteriorFaces).all())
+    True
+
+but a different mesh is calculated and stored separately
+
+    >>> other = Tri2D(nx=3, ny=2, dx=0.5)
+    >>> print(len(os.listdir(meshCache.cacheDirectory)))
+    2
+    >>> print(numerix.allclose(other.cellVolumes, mesh.cellVolumes / 2))
+    True
+
+A damaged cache file is ignored and replaced
+
+    >>> for name in os.listdir(meshCache.cacheDirectory):
+    ...     with open(os.path.join(meshCache.cacheDirectory, name), "w") as f:
+    ...         _ = f.write("garbage")
+    >>> damaged = Tri2D(nx=3, ny=2)
+    >>> print(numerix.allclose(damaged.cellVolumes, mesh.cellVolumes))
+    True
+
+    >>> shutil.rmtree(meshCache.cacheDirectory)
+    >>> meshCache.cacheDirectory = os.environ.get("FIPY_MESH_CACHE")
+"""
+from __future__ import unicode_literals
+from builtins import str
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+import hashlib
+import logging
+import os
+import tempfile
+import zipfile
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+
+_log = logging.getLogger(__name__)
+
+cacheDirectory = os.environ.get("FIPY_MESH_CACHE")
+
+# change whenever the content of the stored calculations changes
+_cacheFormat = 1
+
+_maskSuffix = "__mask"
+_aliasSuffix = "__alias"
+
+def _update(digest, obj):
+    """Add a description of `obj` to `digest`"""
+    if isinstance(obj, (numerix.ndarray, numerix.generic)):
+        data = numerix.ascontiguousarray(MA.getdata(obj))
+        digest.update(("array %s %s" % (data.dtype.str, data.shape)).encode("utf-8"))
+        digest.update(data.tobytes())
+        mask = MA.getmask(obj)
+        if mask is not MA.nomask:
+            digest.update(numerix.ascontiguousarray(mask).tobytes())
+    elif isinstance(obj, (tuple, list)):
+        digest.update(("sequence %d" % len(obj)).encode("utf-8"))
+        for item in obj:
+            _update(digest, item)
+    elif isinstance(obj, dict):
+        digest.update(("mapping %d" % len(obj)).encode("utf-8"))
+        for key in sorted(obj.keys(), key=str):
+            _update(digest, key)
+            _update(digest, obj[key])
+    elif obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        digest.update(("%s %r" % (type(obj).__name__, obj)).encode("utf-8"))
+    elif isinstance(obj, bytes):
+        digest.update(b"bytes " + obj)
+    else:
+        # objects that cannot be described only contribute their type
+        digest.update(("object %s.%s" % (type(obj).__module__,
+                                         type(obj).__name__)).encode("utf-8"))
+
+def _key(*items):
+    """Digest of everything a stored calculation depends on
+
+    Returns
+    -------
+    str or None
+        `None` if caching is disabled.
+    """
+    if cacheDirectory is None:
+        return None
+
+    digest = hashlib.sha1()
+    _update(digest, _cacheFormat)
+    for item in items:
+        _update(digest, item)
+
+    return digest.hexdigest()
+
+def _fileDigest(filename):
+    """Digest of the contents of `filename`"""
+    digest = hashlib.sha1()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+def _path(key):
+    return os.path.join(cacheDirectory, key + ".npz")
+
+def _load(key):
+    """Retrieve the arrays stored under `key`
+
+    Returns
+    -------
+    dict or None
+        `None` if nothing usable is stored.
+    """
+    if key is None or not os.path.exists(_path(key)):
+        return None
+
+    try:
+        with numerix.load(_path(key), allow_pickle=False) as data:
+            stored = dict((name, data[name]) for name in data.files)
+    except (IOError, OSError, ValueError, KeyError, zipfile.BadZipfile) as e:
+        _log.info("Ignoring unreadable mesh cache %s: %s", _path(key), e)
+        return None
+
+    arrays = {}
+    for name, value in stored.items():
+        if name.endswith(_maskSuffix) or name.endswith(_aliasSuffix):
+            continue
+        elif name + _maskSuffix in stored:
+            mask = stored[name + _maskSuffix]
+            if mask.shape == ():
+                mask = MA.nomask
+            value = MA.array(value, mask=mask)
+        arrays[name] = value
+
+    for name, value in stored.items():
+        if name.endswith(_aliasSuffix):
+            arrays[name[:-len(_aliasSuffix)]] = arrays[str(value)]
+
+    _log.debug("Loaded mesh cache %s", _path(key))
+
+    return arrays
+
+def _save(key, arrays):
+    """Store `arrays`, a `dict` of (possibly masked) arrays, under `key`
+
+    Failure to store is not an error; the calculation will simply be
+    repeated next time.
+    """
+    if key is None:
+        return
+
+    stored = {}
+    names = {}
+    for name in sorted(arrays.keys()):
+        value = arrays[name]
+        if id(value) in names:
+            # preserve arrays that are shared, as later changes to one
+            # must be seen by the other
+            stored[name + _aliasSuffix] = numerix.array(names[id(value)])
+            continue
+        names[id(value)] = name
+
+        stored[name] = MA.getdata(value)
+        if isinstance(value, MA.MaskedArray):
+            stored[name + _maskSuffix] = MA.getmask(value)
+
+    tmp = None
+    try:
+        if not os.path.isdir(cacheDirectory):
+            os.makedirs(cacheDirectory)
+        # write to a temporary file first, so that concurrent processes
+        # never see a partially written cache
+        (f, tmp) = tempfile.mkstemp(dir=cacheDirectory, suffix=".tmp")
+        with os.fdopen(f, "wb") as fileobj:
+            numerix.savez(fileobj, **stored)
+        os.rename(tmp, _path(key))
+    except (IOError, OSError) as e:
+        _log.info("Unable to store mesh cache in %s: %s", cacheDirectory, e)
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+    else:
+        _log.debug("Stored mesh cache %s", _path(key))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
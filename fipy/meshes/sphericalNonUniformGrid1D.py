@@ -53,6 +53,8 @@ class SphericalNonUniformGrid1D(NonUniformGrid1D):
                                                         *args,
                                                         **kwargs)
 
+        # the geometry already accounts for `origin`
+        self._calcAllGeometry()
         self.vertexCoords += origin
         self.args['origin'] = origin
 
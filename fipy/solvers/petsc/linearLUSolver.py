@@ -3,8 +3,6 @@ from builtins import range
 from past.utils import old_div
 __docformat__ = 'restructuredtext'
 
-from petsc4py import PETSc
-
 from fipy.solvers.petsc.petscSolver import PETScSolver
 
 __all__ = ["LinearLUSolver"]
@@ -28,19 +26,17 @@ class LinearLUSolver(PETScSolver):
         PETScSolver.__init__(self, tolerance=tolerance,
                              iterations=iterations, precon="lu")
 
-    def _solve_(self, L, x, b):
-        ksp = PETSc.KSP()
-        ksp.create(PETSc.COMM_WORLD)
+    def _setUpKSP(self, ksp):
         ksp.setType("preonly")
         ksp.getPC().setType(self.preconditioner)
         # TODO: SuperLU invoked with PCFactorSetMatSolverType(pc, MATSOLVERSUPERLU)
         #       see: http://www.mcs.anl.gov/petsc/petsc-dev/src/ksp/ksp/examples/tutorials/ex52.c.html
         # PETSc.PC().setFactorSolverType("superlu")
-
-        L.assemble()
-        ksp.setOperators(L)
         ksp.setFromOptions()
 
+    def _solve_(self, L, x, b):
+        ksp, _ = self._prepareKSP(L)
+
         for iteration in range(self.iterations):
             errorVector = L * x - b
             tol = errorVector.norm()
@@ -1,7 +1,5 @@
 __docformat__ = 'restructuredtext'
 
-from petsc4py import PETSc
-
 from fipy.solvers.petsc.petscSolver import PETScSolver
 
 __all__ = ["PETScKrylovSolver"]
@@ -35,12 +33,17 @@ class PETScKrylovSolver(PETScSolver):
 
     """
       
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=None):
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None,
+                 lagPreconditioner=1):
         """
         :Parameters:
           - `tolerance`: The required error tolerance.
           - `iterations`: The maximum number of iterative steps to perform.
           - `precon`: Preconditioner to use (string). 
+          - `lagPreconditioner`: Update the preconditioner only every
+            `lagPreconditioner` solves and apply the previous one in
+            between, as long as the nonzero pattern of the matrix is
+            unchanged.  The default updates it for every solve.
 
         """
         if self.__class__ is PETScKrylovSolver:
@@ -48,24 +51,31 @@ class PETScKrylovSolver(PETScSolver):
             
         PETScSolver.__init__(self, tolerance=tolerance,
                              iterations=iterations, precon=precon)
+        self.lagPreconditioner = lagPreconditioner
+        self._solvesSincePreconditioner = 0
 
-    def _solve_(self, L, x, b):
-        ksp = PETSc.KSP()
-        ksp.create(L.comm)
+    def _setUpKSP(self, ksp):
         ksp.setType(self.solver)
         if self.preconditioner is not None:
             ksp.getPC().setType(self.preconditioner)
         ksp.setTolerances(rtol=self.tolerance, max_it=self.iterations)
-        L.assemble()
-        ksp.setOperators(L)
         ksp.setFromOptions()
+
+    def _solve_(self, L, x, b):
+        ksp, samePattern = self._prepareKSP(L)
+
+        reuse = samePattern and self._solvesSincePreconditioner < self.lagPreconditioner
+        ksp.getPC().setReusePreconditioner(reuse)
+        if not reuse:
+            self._solvesSincePreconditioner = 0
+        self._solvesSincePreconditioner += 1
+
         ksp.solve(b, x)
 
         self._log.debug('solver: %s', ksp.type)
         self._log.debug('precon: %s', ksp.getPC().type)
+        self._log.debug('reused preconditioner: %s', reuse)
         self._log.debug('convergence: %s', _reason[ksp.reason])
         self._log.debug('iterations: %d / %d', ksp.its, self.iterations)
         self._log.debug('norm: %s', ksp.norm)
         self._log.debug('norm_type: %s', ksp.norm_type)
-
-        ksp.destroy()
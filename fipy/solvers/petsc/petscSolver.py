@@ -11,6 +11,13 @@ class PETScSolver(Solver):
     """
     .. attention:: This class is abstract. Always create one of its subclasses.
 
+    The PETSc `KSP` (with its preconditioner), the matrix it operates on
+    and the ghosted solution and right-hand side vectors are kept from one
+    solve to the next.  As long as the nonzero pattern of the matrix does
+    not change, the new values are copied into the kept operator, so that
+    PETSc only updates the preconditioner numerically
+    (``SAME_NONZERO_PATTERN``), rather than setting it up from scratch.
+
     """
     def __init__(self, *args, **kwargs):
         if self.__class__ is PETScSolver:
@@ -18,12 +25,121 @@ class PETScSolver(Solver):
         else:
             Solver.__init__(self, *args, **kwargs)
 
+        self._ksp = None
+        self._kspSettings = None
+        self._operator = None
+        self._operatorPattern = None
+        self._workVectors = None
+
+    def _setUpKSP(self, ksp):
+        """Set the type, preconditioner and tolerances of `ksp`
+        """
+        raise NotImplementedError
+
+    def _operatorPatternOf(self, L):
+        """Identify the nonzero pattern of `L`
+
+        Matrices assembled from the same `_PETScSparsityPattern` share
+        that object.  Otherwise, the pattern is the CSR structure of `L`.
+        """
+        pattern = self.matrix._sparsityPattern
+        if pattern is None:
+            indptr, indices, values = L.getValuesCSR()
+            pattern = (L.getSizes(), indptr, indices)
+        return pattern
+
+    def _sameOperatorPattern(self, pattern):
+        """Whether `pattern` is that of the kept operator"""
+        if self._operatorPattern is None:
+            return False
+        elif isinstance(pattern, tuple) and isinstance(self._operatorPattern, tuple):
+            sizes, indptr, indices = pattern
+            keptSizes, keptIndptr, keptIndices = self._operatorPattern
+            return (sizes == keptSizes
+                    and numerix.array_equal(indptr, keptIndptr)
+                    and numerix.array_equal(indices, keptIndices))
+        else:
+            return pattern is self._operatorPattern
+
+    def _prepareKSP(self, L):
+        """Obtain the kept `KSP`, operating on the values of `L`
+
+        :Parameters:
+          - `L`: The PETSc `Mat` to solve.
+
+        :Returns:
+          The `KSP` and whether the nonzero pattern of its operator is the
+          same as in the last solve.
+        """
+        L.assemble()
+        pattern = self._operatorPatternOf(L)
+
+        samePattern = self._sameOperatorPattern(pattern)
+        # every process must take the same branch
+        samePattern = self.matrix.mesh.communicator.all(numerix.array(samePattern))
+
+        if samePattern:
+            L.copy(self._operator, structure=PETSc.Mat.Structure.SAME_NONZERO_PATTERN)
+        else:
+            self._destroyKSP()
+            self._ksp = PETSc.KSP()
+            self._ksp.create(L.comm)
+            if getattr(self.matrix, 'cache', False):
+                # the term keeps `L`, so its values must not be overwritten
+                self._ksp.setOperators(L.duplicate(copy=True))
+            else:
+                # `L` is discarded after this solve, so keep it, rather
+                # than a copy of it
+                self._ksp.setOperators(L)
+            # our own reference, which outlives the destruction of `L`
+            self._operator = self._ksp.getOperators()[0]
+            self._operatorPattern = pattern
+
+        settings = (self.tolerance, self.iterations, self.preconditioner)
+        if not samePattern or settings != self._kspSettings:
+            self._setUpKSP(self._ksp)
+            self._kspSettings = settings
+
+        return self._ksp, bool(samePattern)
+
+    def _destroyKSP(self):
+        if self._ksp is not None:
+            self._ksp.destroy()
+            self._ksp = None
+        if self._operator is not None:
+            self._operator.destroy()
+            self._operator = None
+            self._operatorPattern = None
+
+    @property
+    def _ghostVectors(self):
+        """Ghosted solution and right-hand side vectors kept from the last
+        solve, if they fit the current matrix, or `None`
+        """
+        if self._workVectors is not None:
+            mesh, shape, vectors = self._workVectors
+            if mesh is self.matrix.mesh and shape == self.matrix._shape:
+                return vectors
+            self._destroyWorkVectors()
+
+        return (None, None)
+
+    def _destroyWorkVectors(self):
+        if self._workVectors is not None:
+            mesh, shape, vectors = self._workVectors
+            for vec in vectors:
+                vec.destroy()
+            self._workVectors = None
+
     @property
     def _globalMatrixAndVectors(self):
         if not hasattr(self, 'globalVectors'):
             globalMatrix = self.matrix
 
-            overlappingVector = self.matrix._fipy2petscGhost(var=self.var)
+            overlappingVector, overlappingRHSvector = self._ghostVectors
+
+            overlappingVector = self.matrix._fipy2petscGhost(var=self.var,
+                                                             vec=overlappingVector)
 
             from fipy.variables.coupledCellVariable import _CoupledCellVariable
             if isinstance(self.RHSvector, _CoupledCellVariable):
@@ -31,19 +147,20 @@ class PETScSolver(Solver):
             else:
                 RHSvector = numerix.reshape(numerix.asarray(self.RHSvector), self.var.shape)
                 
-            overlappingRHSvector = self.matrix._fipy2petscGhost(var=RHSvector)
+            overlappingRHSvector = self.matrix._fipy2petscGhost(var=RHSvector,
+                                                                vec=overlappingRHSvector)
 
+            self._workVectors = (self.matrix.mesh, self.matrix._shape,
+                                 (overlappingVector, overlappingRHSvector))
             self.globalVectors = (globalMatrix, overlappingVector, overlappingRHSvector)
 
         return self.globalVectors
 
     def _deleteGlobalMatrixAndVectors(self):
         del self.matrix
+        # the vectors are kept in `_workVectors` for the next solve
         if hasattr(self, "globalVectors"):
-            globalMatrix, overlappingVector, overlappingRHSvector = self._globalMatrixAndVectors
-            overlappingVector.destroy()
-            overlappingRHSvector.destroy()
-        del self.globalVectors
+            del self.globalVectors
         
     def _solve(self):
         from fipy.terms import SolutionVariableNumberError
@@ -105,7 +222,8 @@ class PETScSolver(Solver):
 
     def __del__(self):
         if hasattr(self, "globalVectors"):
-            globalMatrix, overlappingVector, overlappingRHSvector = self._globalMatrixAndVectors
-            del globalMatrix
-            overlappingVector.destroy()
-            overlappingRHSvector.destroy()
+            del self.globalVectors
+        if hasattr(self, "_workVectors"):
+            self._destroyWorkVectors()
+        if hasattr(self, "_ksp"):
+            self._destroyKSP()
@@ -22,7 +22,7 @@ class LinearBicgstabSolver(_ScipyKrylovSolver):
             Required error tolerance.
         iterations : int
             Maximum number of iterative steps to perform.
-        precon
+        precon : ~fipy.solvers.scipy.preconditioners.preconditioner.Preconditioner, optional
             Preconditioner to use.
         """
 
@@ -4,6 +4,7 @@ __docformat__ = 'restructuredtext'
 from scipy.sparse.linalg import gmres
 
 from fipy.solvers.scipy.scipyKrylovSolver import _ScipyKrylovSolver
+from fipy.tools import numerix
 
 __all__ = ["LinearGMRESSolver"]
 from future.utils import text_to_native_str
@@ -13,8 +14,24 @@ class LinearGMRESSolver(_ScipyKrylovSolver):
     """
     The `LinearGMRESSolver` is an interface to the GMRES solver in
     Scipy, with no preconditioning by default.
+
+    `iterations` limits the number of restart cycles, each of which
+    performs up to 20 inner iterations
+
+    >>> from fipy import Grid1D, CellVariable, DiffusionTerm
+    >>> mesh = Grid1D(nx=20)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(1., mesh.facesLeft)
+    >>> var.constrain(0., mesh.facesRight)
+    >>> DiffusionTerm().solve(var, solver=LinearGMRESSolver(tolerance=1e-10, iterations=1))
+    >>> print(numerix.allclose(var, 1 - mesh.x / 20))
+    True
     """
 
+    # call `callback` for each inner iteration, without changing the
+    # meaning of `maxiter`, which counts restart cycles
+    _callbackArgs = dict(callback_type='pr_norm')
+
     def __init__(self, tolerance=1e-15, iterations=2000, precon=None):
         """
         Parameters
@@ -23,9 +40,16 @@ class LinearGMRESSolver(_ScipyKrylovSolver):
             Required error tolerance.
         iterations : int
             Maximum number of iterative steps to perform.
-        precon
+        precon : ~fipy.solvers.scipy.preconditioners.preconditioner.Preconditioner, optional
             Preconditioner to use.
         """
 
         super(LinearGMRESSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
         self.solveFnc = gmres
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -17,8 +17,85 @@ class LinearLUSolver(_ScipySolver):
     The `LinearLUSolver` solves a linear system of equations using
     LU-factorization.  The `LinearLUSolver` is a wrapper class for the
     the Scipy `scipy.sparse.linalg.splu` module.
+
+    The factorization is retained between solves and is only recomputed
+    when the matrix changes, so that problems with constant coefficients
+    and a fixed time step only perform the forward and back substitution.
+
+    >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm
+    >>> mesh = Grid1D(nx=10)
+    >>> var = CellVariable(mesh=mesh, value=mesh.x)
+    >>> eq = TransientTerm() == DiffusionTerm()
+    >>> solver = LinearLUSolver()
+    >>> eq.solve(var=var, solver=solver, dt=1.)
+    >>> LU = solver._LU
+    >>> eq.solve(var=var, solver=solver, dt=1.)
+    >>> print(solver._LU is LU)
+    True
+    >>> eq.solve(var=var, solver=solver, dt=0.5)
+    >>> print(solver._LU is LU)
+    False
     """
 
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None,
+                 cacheFactorization=True):
+        """
+        Parameters
+        ----------
+        tolerance : float
+            Required error tolerance.
+        iterations : int
+            Maximum number of iterative steps to perform.
+        precon : ~fipy.solvers.scipy.preconditioners.preconditioner.Preconditioner, optional
+            *ignored*
+        cacheFactorization : bool
+            Whether to retain the LU factorization for reuse by subsequent
+            solves of an identical matrix.
+        """
+        super(LinearLUSolver, self).__init__(tolerance=tolerance,
+                                             iterations=iterations,
+                                             precon=precon)
+        self.cacheFactorization = cacheFactorization
+        self._LU = None
+        self._factoredMatrix = None
+
+    def _factorize(self, A):
+        """Obtain the LU factorization of `A`, reusing the last one if possible
+
+        Parameters
+        ----------
+        A : ~scipy.sparse.csc_matrix
+            Matrix to factorize.
+
+        Returns
+        -------
+        ~scipy.sparse.linalg.SuperLU
+        """
+        if self._LU is not None and self._isFactoredMatrix(A):
+            self._log.debug('reusing LU factorization')
+            return self._LU
+
+        LU = splu(A, diag_pivot_thresh=1.,
+                     relax=1,
+                     panel_size=10,
+                     permc_spec=3)
+
+        if self.cacheFactorization:
+            self._LU = LU
+            self._factoredMatrix = (A.shape,
+                                    A.indptr.copy(),
+                                    A.indices.copy(),
+                                    A.data.copy())
+
+        return LU
+
+    def _isFactoredMatrix(self, A):
+        shape, indptr, indices, data = self._factoredMatrix
+        return (A.shape == shape
+                and numerix.array_equal(A.indptr, indptr)
+                and numerix.array_equal(A.indices, indices)
+                and numerix.array_equal(A.data, data))
+
     def _solve_(self, L, x, b):
         diag = L.takeDiagonal()
         maxdiag = max(numerix.absolute(diag))
@@ -26,10 +103,7 @@ class LinearLUSolver(_ScipySolver):
         L = L * (1 / maxdiag)
         b = b * (1 / maxdiag)
 
-        LU = splu(L.matrix.asformat("csc"), diag_pivot_thresh=1.,
-                                            relax=1,
-                                            panel_size=10,
-                                            permc_spec=3)
+        LU = self._factorize(L.matrix.asformat("csc"))
 
         error0 = numerix.sqrt(numerix.sum((L * x - b)**2))
 
@@ -46,3 +120,10 @@ class LinearLUSolver(_ScipySolver):
         self._log.debug('residual: %s', numerix.sqrt(numerix.sum(errorVector**2)))
 
         return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
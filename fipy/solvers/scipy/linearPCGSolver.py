@@ -23,7 +23,7 @@ class LinearPCGSolver(_ScipyKrylovSolver):
             Required error tolerance.
         iterations : int
             Maximum number of iterative steps to perform.
-        precon
+        precon : ~fipy.solvers.scipy.preconditioners.preconditioner.Preconditioner, optional
             Preconditioner to use.
         """
 
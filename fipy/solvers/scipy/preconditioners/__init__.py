@@ -0,0 +1,9 @@
+from __future__ import unicode_literals
+from fipy.solvers.scipy.preconditioners.jacobiPreconditioner import *
+from fipy.solvers.scipy.preconditioners.iluPreconditioner import *
+from fipy.solvers.scipy.preconditioners.ssorPreconditioner import *
+
+__all__ = []
+__all__.extend(jacobiPreconditioner.__all__)
+__all__.extend(iluPreconditioner.__all__)
+__all__.extend(ssorPreconditioner.__all__)
@@ -0,0 +1,80 @@
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+from scipy.sparse.linalg import LinearOperator, spilu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+
+__all__ = ["ILUPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class ILUPreconditioner(Preconditioner):
+    """
+    Incomplete LU preconditioner for the SciPy solvers.
+    Really just a wrapper class for `scipy.sparse.linalg.spilu`.
+
+    >>> from fipy import Grid2D, CellVariable, DiffusionTerm, ConvectionTerm
+    >>> from fipy import LinearGMRESSolver
+    >>> from fipy.tools import numerix
+    >>> mesh = Grid2D(nx=20, ny=20)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(0., mesh.facesLeft)
+    >>> var.constrain(1., mesh.facesRight)
+    >>> eq = DiffusionTerm() + ConvectionTerm(coeff=(1., 0.))
+    >>> eq.solve(var=var, solver=LinearGMRESSolver(tolerance=1e-10))
+    >>> unpreconditioned = var.copy()
+    >>> var.value = 0.
+    >>> precon = ILUPreconditioner(rebuildInterval=None, iterationGrowth=2.)
+    >>> solver = LinearGMRESSolver(tolerance=1e-10, precon=precon)
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(numerix.allclose(var, unpreconditioned, atol=1e-6))
+    True
+
+    The factorization is reused for the next solve, and rebuilt if the
+    number of iterations grows
+
+    >>> M = precon._M
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(precon._M is M)
+    True
+    >>> precon._recordIterations(precon._initialIterations * 3 + 1)
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(precon._M is M)
+    False
+    """
+
+    def __init__(self, dropTolerance=1e-4, fillFactor=10,
+                 rebuildInterval=1, iterationGrowth=None):
+        """
+        Parameters
+        ----------
+        dropTolerance : float
+            Drop tolerance for the incomplete factorization.
+        fillFactor : float
+            Upper bound on the fill-in of the factors, relative to the
+            matrix.
+        rebuildInterval : int, optional
+            Number of solves between rebuilds of the preconditioner.
+        iterationGrowth : float, optional
+            Rebuild the preconditioner when the iterations needed by a
+            solve grow by this factor.
+        """
+        super(ILUPreconditioner, self).__init__(rebuildInterval=rebuildInterval,
+                                                iterationGrowth=iterationGrowth)
+        self.dropTolerance = dropTolerance
+        self.fillFactor = fillFactor
+
+    def _buildPreconditioner(self, A):
+        ILU = spilu(A.asformat("csc"),
+                    drop_tol=self.dropTolerance,
+                    fill_factor=self.fillFactor)
+
+        return LinearOperator(A.shape, matvec=ILU.solve, dtype=A.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,58 @@
+from __future__ import division
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+from scipy.sparse.linalg import LinearOperator
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["JacobiPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class JacobiPreconditioner(Preconditioner):
+    """
+    Jacobi preconditioner for the SciPy solvers.
+
+    Scales the residual by the inverse of the matrix diagonal.
+
+    >>> from fipy import Grid1D, CellVariable, DiffusionTerm
+    >>> from fipy import LinearLUSolver, LinearPCGSolver
+    >>> mesh = Grid1D(nx=100)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(0., mesh.facesLeft)
+    >>> var.constrain(1., mesh.facesRight)
+    >>> eq = DiffusionTerm(coeff=1. + mesh.x)
+    >>> eq.solve(var=var, solver=LinearLUSolver())
+    >>> direct = var.copy()
+    >>> var.value = 0.
+    >>> precon = JacobiPreconditioner(rebuildInterval=None)
+    >>> solver = LinearPCGSolver(tolerance=1e-10, precon=precon)
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(numerix.allclose(var, direct, atol=1e-6))
+    True
+
+    With `rebuildInterval=None`, the same preconditioner is used for
+    subsequent solves
+
+    >>> M = precon._M
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(precon._M is M)
+    True
+    """
+
+    def _buildPreconditioner(self, A):
+        diagonal = numerix.array(A.diagonal(), dtype=float)
+        diagonal[diagonal == 0] = 1.
+        inverse = 1. / diagonal
+
+        return LinearOperator(A.shape, matvec=lambda x: inverse * x,
+                              dtype=inverse.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,89 @@
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+__all__ = ["Preconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class Preconditioner(object):
+    """
+    The base Preconditioner class for the SciPy solvers.
+
+    A built preconditioner can be kept across sweeps and time steps, being
+    rebuilt only every `rebuildInterval` solves, when the matrix changes
+    shape, or when the number of iterations needed by the solver grows.
+
+    .. attention:: This class is abstract. Always create one of its subclasses.
+    """
+
+    def __init__(self, rebuildInterval=1, iterationGrowth=None):
+        """
+        Create a `Preconditioner` object.
+
+        Parameters
+        ----------
+        rebuildInterval : int, optional
+            Number of solves between rebuilds of the preconditioner. The
+            default rebuilds it for every solve. `None` only rebuilds it
+            when required by `iterationGrowth` or a change of matrix shape.
+        iterationGrowth : float, optional
+            Rebuild the preconditioner before the next solve when a solve
+            takes more than `iterationGrowth` times as many iterations as
+            the first solve with the current preconditioner.
+        """
+        if self.__class__ is Preconditioner:
+            raise NotImplementedError("can't instantiate abstract base class")
+
+        self.rebuildInterval = rebuildInterval
+        self.iterationGrowth = iterationGrowth
+        self._invalidate()
+
+    def _invalidate(self):
+        self._M = None
+        self._shape = None
+        self._uses = 0
+        self._initialIterations = None
+
+    def _buildPreconditioner(self, A):
+        """Build the preconditioning operator for `A`
+
+        Parameters
+        ----------
+        A : ~scipy.sparse.csr_matrix
+            The matrix to be preconditioned.
+
+        Returns
+        -------
+        ~scipy.sparse.linalg.LinearOperator
+            Approximation to the inverse of `A`.
+        """
+        raise NotImplementedError
+
+    def _needsRebuild(self, A):
+        return (self._M is None
+                or A.shape != self._shape
+                or (self.rebuildInterval is not None
+                    and self._uses >= self.rebuildInterval))
+
+    def _applyToMatrix(self, A):
+        """
+        Returns the preconditioning operator used by the SciPy solvers.
+        """
+        if self._needsRebuild(A):
+            self._invalidate()
+            self._M = self._buildPreconditioner(A)
+            self._shape = A.shape
+
+        self._uses += 1
+
+        return self._M
+
+    def _recordIterations(self, iterations):
+        """Note the number of iterations taken by a preconditioned solve
+        """
+        if self._initialIterations is None:
+            self._initialIterations = iterations
+        elif (self.iterationGrowth is not None
+              and iterations > self.iterationGrowth * max(self._initialIterations, 1)):
+            self._invalidate()
@@ -0,0 +1,94 @@
+from __future__ import division
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, splu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["SSORPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class SSORPreconditioner(Preconditioner):
+    r"""
+    Symmetric successive over-relaxation preconditioner for the SciPy
+    solvers.
+
+    For :math:`A = D + L + U`, applies the inverse of
+
+    .. math::
+
+       M = \frac{\omega}{2 - \omega}
+           \left(\frac{D}{\omega} + L\right)
+           \left(\frac{D}{\omega}\right)^{-1}
+           \left(\frac{D}{\omega} + U\right)
+
+    using triangular solves.
+
+    >>> from fipy import Grid1D, CellVariable, DiffusionTerm
+    >>> from fipy import LinearLUSolver, LinearPCGSolver
+    >>> mesh = Grid1D(nx=100)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(0., mesh.facesLeft)
+    >>> var.constrain(1., mesh.facesRight)
+    >>> eq = DiffusionTerm(coeff=1. + mesh.x)
+    >>> eq.solve(var=var, solver=LinearLUSolver())
+    >>> direct = var.copy()
+    >>> var.value = 0.
+    >>> solver = LinearPCGSolver(tolerance=1e-10,
+    ...                          precon=SSORPreconditioner(omega=1.5))
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(numerix.allclose(var, direct, atol=1e-6))
+    True
+    """
+
+    def __init__(self, omega=1., rebuildInterval=1, iterationGrowth=None):
+        """
+        Parameters
+        ----------
+        omega : float
+            Relaxation parameter, between 0 and 2.
+        rebuildInterval : int, optional
+            Number of solves between rebuilds of the preconditioner.
+        iterationGrowth : float, optional
+            Rebuild the preconditioner when the iterations needed by a
+            solve grow by this factor.
+        """
+        super(SSORPreconditioner, self).__init__(rebuildInterval=rebuildInterval,
+                                                 iterationGrowth=iterationGrowth)
+        self.omega = omega
+
+    @staticmethod
+    def _triangularFactor(T):
+        # with natural ordering and no pivoting, the factors of a
+        # triangular matrix are the matrix itself, so the
+        # substitution is performed by SuperLU without any fill
+        return splu(T.asformat("csc"),
+                    permc_spec="NATURAL",
+                    diag_pivot_thresh=0.,
+                    options=dict(SymmetricMode=True))
+
+    def _buildPreconditioner(self, A):
+        A = A.asformat("csr")
+        diagonal = numerix.array(A.diagonal(), dtype=float)
+        diagonal[diagonal == 0] = 1.
+        D = sp.diags(diagonal / self.omega, format="csr")
+
+        lower = self._triangularFactor(sp.tril(A, k=-1) + D)
+        upper = self._triangularFactor(sp.triu(A, k=1) + D)
+        scale = (2. - self.omega) / self.omega * (diagonal / self.omega)
+
+        def matvec(x):
+            return upper.solve(scale * lower.solve(numerix.asarray(x).ravel()))
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
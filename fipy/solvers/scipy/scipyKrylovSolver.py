@@ -12,6 +12,10 @@ class _ScipyKrylovSolver(_ScipySolver):
     .. attention:: This class is abstract. Always create one of its subclasses.
     """
 
+    # keyword arguments needed for `solveFnc` to call `callback`
+    # once per iteration
+    _callbackArgs = {}
+
     def _solve_(self, L, x, b):
         A = L.matrix
         if self.preconditioner is None:
@@ -19,11 +23,23 @@ class _ScipyKrylovSolver(_ScipySolver):
         else:
             M = self.preconditioner._applyToMatrix(A)
 
+        iterations = [0]
+
+        def callback(*args):
+            iterations[0] += 1
+
         x, info = self.solveFnc(A, b, x,
                                 tol=self.tolerance,
                                 maxiter=self.iterations,
                                 M=M,
-                                atol='legacy')
+                                atol='legacy',
+                                callback=callback,
+                                **self._callbackArgs)
+
+        if self.preconditioner is not None:
+            self.preconditioner._recordIterations(iterations[0])
+
+        self._log.debug('iterations: %d / %d', iterations[0], self.iterations)
 
         if info < 0:
             self._log.debug('failure: %s', self._warningList[info].__class__.__name__)
@@ -1,12 +1,22 @@
 from __future__ import unicode_literals
 __all__ = []
 
-from fipy.tests.lateImportTest import _LateImportTestSuite
+from fipy.tests.doctestPlus import _LateImportDocTestSuite
 import fipy.tests.testProgram
+from fipy.solvers import solver
+
+if solver == 'scipy':
+    docTestModuleNames = ('scipy.linearLUSolver',
+                          'scipy.linearGMRESSolver',
+                          'scipy.preconditioners.jacobiPreconditioner',
+                          'scipy.preconditioners.iluPreconditioner',
+                          'scipy.preconditioners.ssorPreconditioner')
+else:
+    docTestModuleNames = ()
 
 def _suite():
-    return _LateImportTestSuite(testModuleNames = (),
-                                base = __name__)
+    return _LateImportDocTestSuite(docTestModuleNames=docTestModuleNames,
+                                   base=__name__)
 
 if __name__ == '__main__':
     fipy.tests.testProgram.main(defaultTest='_suite')
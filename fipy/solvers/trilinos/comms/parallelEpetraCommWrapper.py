@@ -50,6 +50,14 @@ class ParallelEpetraCommWrapper(EpetraCommWrapper):
         """
         return self.mpi4py_comm.allgather(sendobj=obj)
 
+    def gather(self, obj, root=0):
+        """mpi4py `gather`
+
+        Communicates copies of each `obj` to `root`, creating a
+        rank-dimensional list of `obj` objects there, and `None` elsewhere.
+        """
+        return self.mpi4py_comm.gather(sendobj=obj, root=root)
+
     def MaxAll(self, obj):
         """return max across all processes
         """
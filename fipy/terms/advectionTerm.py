@@ -172,21 +172,58 @@ class AdvectionTerm(FirstOrderAdvectionTerm):
 
     The maximum error is 2 % when using a higher order contribution.
 
-    """
-    def _getDifferences(self, adjacentValues, cellValues, oldArray, cellToCellIDs, mesh):
-
-        dAP = mesh._cellToCellDistances
+    A `DistanceVariable` with a `narrowBandWidth` is only advected in its
+    band, with the same result there as for the whole mesh.
+
+    >>> from fipy.variables.distanceVariable import DistanceVariable
+    >>> r = numerix.sqrt((x - 5.)**2 + (y - 5.)**2) - 3.
+    >>> bandVar = DistanceVariable(mesh=mesh, value=r, narrowBandWidth=2., hasOld=True)
+    >>> bandVar.calcDistanceFunction()
+    >>> bandVar.updateOld()
+    >>> band = bandVar._narrowBandCells
+    >>> fullVar = DistanceVariable(mesh=mesh, value=bandVar.value, hasOld=True)
+    >>> v, L, bBand = AdvectionTerm(x)._buildMatrix(bandVar, SparseMatrix)
+    >>> v, L, bFull = AdvectionTerm(x)._buildMatrix(fullVar, SparseMatrix)
+    >>> print(numerix.allclose(bBand[band], bFull[band]))
+    True
+    >>> print(numerix.count_nonzero(bBand) <= len(band) < mesh.numberOfCells)
+    True
 
-##        adjacentGradient = numerix.take(oldArray.grad, cellToCellIDs)
-        adjacentGradient = numerix.take(oldArray.grad, mesh._cellToCellIDs, axis=-1)
-        adjacentNormalGradient = numerix.dot(adjacentGradient, mesh._cellNormals)
+    """
+    def _getDifferences(self, adjacentValues, cellValues, oldArray, cellToCellIDs, mesh, cells=None):
+
+        if cells is None:
+            dAP = mesh._cellToCellDistances
+
+##            adjacentGradient = numerix.take(oldArray.grad, cellToCellIDs)
+            adjacentGradient = numerix.take(oldArray.grad, mesh._cellToCellIDs, axis=-1)
+            cellNormals = mesh._cellNormals
+
+            cellIDs = numerix.repeat(numerix.arange(mesh.numberOfCells)[numerix.newaxis, ...],
+                    mesh._maxFacesPerCell, axis=0)
+            cellIDs = MA.masked_array(cellIDs, mask = MA.getmask(mesh._cellToCellIDs))
+            cellGradient = numerix.take(oldArray.grad, cellIDs, axis=-1)
+        else:
+            ## gradients of only the band `cells` and their neighbors
+            dAP = mesh._cellToCellDistances[..., cells]
+            cellNormals = MA.array(mesh._cellNormals)[..., cells]
+
+            neighbors = mesh._cellToCellIDs[..., cells]
+            gradientCells, inverse = numerix.unique(numerix.concatenate((cells, numerix.array(cellToCellIDs).flatten())),
+                                                    return_inverse=True)
+            gradients = mesh._cellGradientsAt(numerix.array(oldArray), gradientCells)
+
+            adjacentGradient = MA.masked_array(
+                numerix.take(gradients, numerix.reshape(inverse[len(cells):], cellToCellIDs.shape), axis=-1),
+                mask=numerix.repeat(MA.getmaskarray(neighbors)[numerix.newaxis, ...], mesh.dim, axis=0))
+            cellGradient = numerix.repeat(numerix.take(gradients, inverse[:len(cells)], axis=-1)[:, numerix.newaxis, :],
+                                          mesh._maxFacesPerCell, axis=1)
+            cellGradient = MA.masked_array(cellGradient, mask=adjacentGradient.mask)
+
+        adjacentNormalGradient = numerix.dot(adjacentGradient, cellNormals)
         adjacentUpValues = cellValues + 2 * dAP * adjacentNormalGradient
 
-        cellIDs = numerix.repeat(numerix.arange(mesh.numberOfCells)[numerix.newaxis, ...],
-                mesh._maxFacesPerCell, axis=0)
-        cellIDs = MA.masked_array(cellIDs, mask = MA.getmask(mesh._cellToCellIDs))
-        cellGradient = numerix.take(oldArray.grad, cellIDs, axis=-1)
-        cellNormalGradient = numerix.dot(cellGradient, mesh._cellNormals)
+        cellNormalGradient = numerix.dot(cellGradient, cellNormals)
         cellUpValues = adjacentValues - 2 * dAP * cellNormalGradient
 
         cellLaplacian = (cellUpValues + adjacentValues - 2 * cellValues) / dAP**2
@@ -201,7 +238,7 @@ class AdvectionTerm(FirstOrderAdvectionTerm):
                                          adjacentLaplacian,
                                          cellLaplacian))
 
-        return FirstOrderAdvectionTerm._getDifferences(self, adjacentValues, cellValues, oldArray, cellToCellIDs, mesh) -  mm * dAP / 2.
+        return FirstOrderAdvectionTerm._getDifferences(self, adjacentValues, cellValues, oldArray, cellToCellIDs, mesh, cells=cells) -  mm * dAP / 2.
 
 class __AdvectionTerm(FirstOrderAdvectionTerm):
     """
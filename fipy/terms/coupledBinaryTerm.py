@@ -60,6 +60,49 @@ class _CoupledBinaryTerm(_AbstractBinaryTerm):
 
         Only called at top-level by `_prepareLinearSystem()`
 
+        Each block is added directly to the coupled matrix.  Blocks of
+        variables that an equation does not involve are empty and are not
+        built at all.  A separate matrix of each equation is only assembled
+        if the equation caches it.
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=3)
+        >>> v0 = CellVariable(mesh=m, value=1.)
+        >>> v1 = CellVariable(mesh=m, value=2.)
+        >>> v2 = CellVariable(mesh=m, value=3.)
+        >>> eq0 = TransientTerm(var=v0) == DiffusionTerm(var=v0) + ImplicitSourceTerm(coeff=-1., var=v2)
+        >>> eq1 = TransientTerm(var=v1) == DiffusionTerm(var=v1) + 1.
+        >>> eq2 = TransientTerm(var=v2) == ImplicitSourceTerm(coeff=1., var=v0) + ImplicitSourceTerm(coeff=1., var=v1)
+        >>> eq = eq0 & eq1 & eq2
+        >>> eq.cacheMatrix()
+        >>> eq.cacheRHSvector()
+        >>> eq1.cacheMatrix()
+        >>> eq1.cacheRHSvector()
+        >>> eq.solve(dt=1., solver=DummySolver())
+        >>> print(eq.matrix.numpyArray) # doctest: +NORMALIZE_WHITESPACE
+        [[ 2. -1.  0.  0.  0.  0.  1.  0.  0.]
+         [-1.  3. -1.  0.  0.  0.  0.  1.  0.]
+         [ 0. -1.  2.  0.  0.  0.  0.  0.  1.]
+         [ 0.  0.  0.  2. -1.  0.  0.  0.  0.]
+         [ 0.  0.  0. -1.  3. -1.  0.  0.  0.]
+         [ 0.  0.  0.  0. -1.  2.  0.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.  1.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.  0.  1.  0.]
+         [ 0.  0.  0.  0.  0.  0.  0.  0.  1.]]
+        >>> print(numerix.array(eq.RHSvector))
+        [ 1.  1.  1.  3.  3.  3.  6.  6.  6.]
+        >>> print(eq1.matrix.numpyArray) # doctest: +NORMALIZE_WHITESPACE
+        [[ 0.  0.  0.  0.  0.  0.  0.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.  0.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.  0.  0.  0.]
+         [ 0.  0.  0.  2. -1.  0.  0.  0.  0.]
+         [ 0.  0.  0. -1.  3. -1.  0.  0.  0.]
+         [ 0.  0.  0.  0. -1.  2.  0.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.  0.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.  0.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.  0.  0.  0.]]
+        >>> print(eq1.RHSvector)
+        [ 3.  3.  3.]
         """
 
         from fipy.matrices.offsetSparseMatrix import OffsetSparseMatrix
@@ -72,11 +115,19 @@ class _CoupledBinaryTerm(_AbstractBinaryTerm):
         for equationIndex, uncoupledTerm in enumerate(self._uncoupledTerms):
 
             SparseMatrix.equationIndex = equationIndex
-            termRHSvector = 0
-            termMatrix = SparseMatrix(mesh=var.mesh)
+            termRHSvector = numerix.zeros((var.mesh.numberOfCells,), 'd')
+            if uncoupledTerm._cacheMatrix:
+                termMatrix = SparseMatrix(mesh=var.mesh)
+            else:
+                termMatrix = matrix
+
+            termVarIDs = [id(termVar) for termVar in uncoupledTerm._vars]
 
             for varIndex, tmpVar in enumerate(var.vars):
 
+                if id(tmpVar) not in termVarIDs:
+                    continue
+
                 SparseMatrix.varIndex = varIndex
 
                 tmpVar, tmpMatrix, tmpRHSvector = uncoupledTerm._buildAndAddMatrices(tmpVar,
@@ -92,7 +143,8 @@ class _CoupledBinaryTerm(_AbstractBinaryTerm):
 
             uncoupledTerm._buildCache(termMatrix, termRHSvector)
             RHSvectors += [CellVariable(value=termRHSvector, mesh=var.mesh)]
-            matrix += termMatrix
+            if termMatrix is not matrix:
+                matrix += termMatrix
 
         return (var, matrix, _CoupledCellVariable(RHSvectors))
 
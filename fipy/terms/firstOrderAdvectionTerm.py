@@ -93,35 +93,56 @@ class FirstOrderAdvectionTerm(_NonDiffusionTerm):
         oldArray = var.old
 
         mesh = var.mesh
-        NCells = mesh.numberOfCells
         NCellFaces = mesh._maxFacesPerCell
 
-        cellValues = numerix.repeat(oldArray[numerix.newaxis, ...], NCellFaces, axis = 0)
+        ## a `DistanceVariable` in narrow band mode is only advected in its band
+        cells = getattr(var, "_narrowBandCells", None)
+        if cells is None:
+            NCells = mesh.numberOfCells
+            cellIDs = numerix.arange(NCells)
+            cellToCellIDs = mesh._cellToCellIDs
+        else:
+            NCells = len(cells)
+            cellIDs = cells
+            cellToCellIDs = mesh._cellToCellIDs[..., cells]
+
+        cellValues = numerix.repeat(numerix.take(oldArray, cellIDs)[numerix.newaxis, ...], NCellFaces, axis = 0)
 
-        cellIDs = numerix.repeat(numerix.arange(NCells)[numerix.newaxis, ...], NCellFaces, axis = 0)
-        cellToCellIDs = mesh._cellToCellIDs
+        cellIDs = numerix.repeat(cellIDs[numerix.newaxis, ...], NCellFaces, axis = 0)
 
         if NCells > 0:
             cellToCellIDs = MA.where(MA.getmask(cellToCellIDs), cellIDs, cellToCellIDs)
 
             adjacentValues = numerix.take(oldArray, cellToCellIDs)
 
-            differences = self._getDifferences(adjacentValues, cellValues, oldArray, cellToCellIDs, mesh)
+            differences = self._getDifferences(adjacentValues, cellValues, oldArray, cellToCellIDs, mesh, cells=cells)
             differences = MA.filled(differences, 0)
 
             minsq = numerix.sqrt(numerix.sum(numerix.minimum(differences, numerix.zeros((NCellFaces, NCells), 'l'))**2, axis=0))
             maxsq = numerix.sqrt(numerix.sum(numerix.maximum(differences, numerix.zeros((NCellFaces, NCells), 'l'))**2, axis=0))
 
             coeff = numerix.array(self._getGeomCoeff(var))
+            if cells is not None and coeff.shape != ():
+                coeff = coeff[..., cells]
 
             coeffXdifferences = coeff * ((coeff > 0.) * minsq + (coeff < 0.) * maxsq)
         else:
             coeffXdifferences = 0.
 
-        return (var, SparseMatrix(mesh=var.mesh), -coeffXdifferences * mesh.cellVolumes)
+        if cells is None:
+            b = -coeffXdifferences * mesh.cellVolumes
+        else:
+            b = numerix.zeros((mesh.numberOfCells,), 'd')
+            b[cells] = -coeffXdifferences * numerix.take(mesh.cellVolumes, cells)
 
-    def _getDifferences(self, adjacentValues, cellValues, oldArray, cellToCellIDs, mesh):
-        return (adjacentValues - cellValues) / mesh._cellToCellDistances
+        return (var, SparseMatrix(mesh=var.mesh), b)
+
+    def _getDifferences(self, adjacentValues, cellValues, oldArray, cellToCellIDs, mesh, cells=None):
+        if cells is None:
+            dAP = mesh._cellToCellDistances
+        else:
+            dAP = mesh._cellToCellDistances[..., cells]
+        return (adjacentValues - cellValues) / dAP
 
     def _getDefaultSolver(self, var, solver, *args, **kwargs):
         solver = solver or super(FirstOrderAdvectionTerm, self)._getDefaultSolver(var, solver, *args, **kwargs)
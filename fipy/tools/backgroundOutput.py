@@ -0,0 +1,164 @@
+"""Output that is written while the solution proceeds
+
+Viewers that write files (:class:`~fipy.viewers.tsvViewer.TSVViewer` and
+:class:`~fipy.viewers.vtkViewer.VTKViewer`), :func:`fipy.tools.dump.write`
+and :meth:`~fipy.meshes.gmshMesh.MSHFile.write` normally format and write
+their output before returning, stalling the time loop while they do.  With
+the :option:`--background-output` flag (or the
+:envvar:`FIPY_BACKGROUND_OUTPUT` environment variable), they only take a
+snapshot of the values to be written and hand it to a background thread,
+which formats, compresses and writes it while the solver goes on to the
+next steps.
+
+Snapshots are written in the order they are taken.  No more than
+`maxPending` snapshots wait to be written; once that many are waiting, the
+next output waits for the oldest to be written, which bounds the memory
+used.  :func:`flush` waits until everything has been written; this happens
+automatically when :term:`Python` exits, and before
+:func:`fipy.tools.dump.read` or :meth:`~fipy.meshes.gmshMesh.GmshFile.close`.
+
+    >>> import threading
+    >>> from fipy.tools import backgroundOutput
+    >>> backgroundOutput.doBackground = True
+
+    >>> release = threading.Event()
+    >>> written = []
+    >>> def write(step):
+    ...     _ = release.wait(10.)
+    ...     written.append(step)
+    >>> for step in range(3):
+    ...     backgroundOutput._submit(write, step)
+    >>> print(written)
+    []
+    >>> release.set()
+    >>> backgroundOutput.flush()
+    >>> print(written)
+    [0, 1, 2]
+
+A failure to write is reported by the next output, or by :func:`flush`
+
+    >>> def fail():
+    ...     raise RuntimeError("disk full")
+    >>> backgroundOutput._submit(fail)
+    >>> backgroundOutput.flush()
+    Traceback (most recent call last):
+        ...
+    RuntimeError: disk full
+    >>> backgroundOutput.flush()
+
+Without background output, everything is written immediately
+
+    >>> backgroundOutput.doBackground = False
+    >>> backgroundOutput._submit(write, 3)
+    >>> print(written)
+    [0, 1, 2, 3]
+
+    >>> backgroundOutput.doBackground = _background
+"""
+from __future__ import unicode_literals
+from builtins import object
+from future import standard_library
+standard_library.install_aliases()
+__docformat__ = 'restructuredtext'
+
+__all__ = ["flush"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+
+_log = logging.getLogger(__name__)
+
+if '--background-output' in [s.lower() for s in sys.argv[1:]]:
+    _background = True
+else:
+    _background = 'FIPY_BACKGROUND_OUTPUT' in os.environ
+
+doBackground = _background
+
+maxPending = 4
+
+class _Writer(object):
+    """Thread that performs output in the order it is submitted"""
+
+    def __init__(self, maxPending):
+        self._queue = queue.Queue(maxsize=maxPending)
+        self._error = None
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, function, args, kwargs):
+        self._raise()
+        self._queue.put((function, args, kwargs))
+
+    def flush(self):
+        if threading.current_thread() is self._thread:
+            # everything submitted before the current output
+            # has already been written
+            return
+        self._queue.join()
+        self._raise()
+
+    def _raise(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self):
+        while True:
+            function, args, kwargs = self._queue.get()
+            try:
+                function(*args, **kwargs)
+            except Exception as e:
+                _log.info("Background output failed: %s", e)
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
+
+_writer = None
+_writerLock = threading.Lock()
+
+def _submit(function, *args, **kwargs):
+    """Call `function` with a snapshot of the output, in the background
+    if `doBackground`
+    """
+    global _writer
+
+    if doBackground:
+        with _writerLock:
+            if _writer is None:
+                _writer = _Writer(maxPending)
+        _writer.submit(function, args, kwargs)
+    else:
+        # anything already waiting must be written first
+        flush()
+        function(*args, **kwargs)
+
+def flush():
+    """Wait for all output to be written
+
+    Raises
+    ------
+    Exception
+        The first error encountered in writing any output since the last
+        time it was checked.
+    """
+    if _writer is not None:
+        _writer.flush()
+
+atexit.register(flush)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
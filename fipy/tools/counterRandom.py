@@ -0,0 +1,199 @@
+r"""Reproducible random numbers for distributed meshes
+
+A counter-based generator draws each random number as a pure function of a
+key and a counter, rather than by advancing a shared state.  With the key
+set by a seed and the counter by the global ID of a cell, every process can
+draw the numbers for its own cells, and obtain exactly the same values as
+any other partitioning of the mesh would.
+
+The bits are those of the Philox4x32-10 generator of :cite:`Salmon:2011`
+
+    >>> print(["%08x" % word for word in _philox(numerix.zeros((4, 1), dtype="uint32"),
+    ...                                          numerix.zeros((2,), dtype="uint32"))[:, 0]])
+    ['6627e8d5', 'e169c58d', 'bc57ac4c', '9b00dbd8']
+
+The same numbers are drawn for the same IDs, however they are distributed
+
+    >>> ids = numerix.arange(10)
+    >>> whole = _CounterRandom(seed=42, step=3, ids=ids).normal()
+    >>> parts = [_CounterRandom(seed=42, step=3, ids=part).normal()
+    ...          for part in (ids[:4], ids[4:])]
+    >>> print(numerix.array_equal(whole, numerix.concatenate(parts)))
+    True
+
+but change with the seed and the step
+
+    >>> print(numerix.array_equal(whole, _CounterRandom(seed=42, step=4, ids=ids).normal()))
+    False
+    >>> print(numerix.array_equal(whole, _CounterRandom(seed=43, step=3, ids=ids).normal()))
+    False
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tools import numerix
+
+_M0, _M1 = 0xD2511F53, 0xCD9E8D57
+_W0, _W1 = 0x9E3779B9, 0xBB67AE85
+_MASK = 0xFFFFFFFF
+
+def _philox(counter, key, rounds=10):
+    """Philox4x32 bijection of `counter` for `key`
+
+    Parameters
+    ----------
+    counter : ndarray of uint32
+        Counters of shape `(4, N)`.
+    key : ndarray of uint32
+        Key of shape `(2,)`.
+    rounds : int
+        Number of rounds.
+
+    Returns
+    -------
+    ndarray of uint32
+        Random words of shape `(4, N)`.
+    """
+    c0, c1, c2, c3 = [numerix.array(c, dtype="uint64") for c in counter]
+    k0, k1 = [int(k) for k in key]
+
+    for r in range(rounds):
+        product0 = _M0 * c0
+        product1 = _M1 * c2
+        c0, c1, c2, c3 = ((product1 >> 32) ^ c1 ^ k0,
+                          product1 & _MASK,
+                          (product0 >> 32) ^ c3 ^ k1,
+                          product0 & _MASK)
+        k0 = (k0 + _W0) & _MASK
+        k1 = (k1 + _W1) & _MASK
+
+    return numerix.array([c0, c1, c2, c3], dtype="uint32")
+
+class _CounterRandom(object):
+    """Random numbers for elements with global `ids`, at a given `step`
+
+    Every distribution that is drawn uses a fresh stream of counters, so
+    successive draws from the same `_CounterRandom` are independent.
+
+    Parameters
+    ----------
+    seed : int
+        Key of the generator, up to 64 bits.
+    step : int
+        Number of the draw, e.g., of the time step, up to 32 bits.
+    ids : array_like of int
+        Global IDs of the elements to draw numbers for.
+    """
+
+    def __init__(self, seed, step, ids):
+        ids = numerix.asarray(ids, dtype="uint64")
+        self._ids = (ids & _MASK, ids >> 32)
+        self._key = numerix.array([seed & _MASK, (seed >> 32) & _MASK], dtype="uint32")
+        self._step = step & _MASK
+        self._stream = 0
+
+    def _blocks(self, attempt=0, ids=None):
+        """Random words of shape `(4, N)` for `attempt` in the current stream
+
+        Parameters
+        ----------
+        attempt : int
+            Index of the block within the stream, less than :math:`2^{16}`.
+        ids : ndarray of bool, optional
+            Selection of the elements to draw for.
+        """
+        low, high = self._ids
+        if ids is not None:
+            low, high = low[ids], high[ids]
+        counter = [low, high,
+                   numerix.zeros_like(low) + self._step,
+                   numerix.zeros_like(low) + ((self._stream << 16) | attempt)]
+        return _philox(counter, self._key)
+
+    def _uniforms(self, attempt=0, ids=None):
+        """Two independent uniform doubles in [0, 1) per element"""
+        words = self._blocks(attempt=attempt, ids=ids).astype("uint64")
+        # 53 random bits each
+        return (((words[0::2] >> 5) << 26) + (words[1::2] >> 6)) / 9007199254740992.
+
+    def _nextStream(self):
+        self._stream += 1
+        if self._stream >= 2**16:
+            raise ValueError("too many draws from the same step")
+
+    def _standardNormal(self, attempt=0, ids=None):
+        u1, u2 = self._uniforms(attempt=attempt, ids=ids)
+        return numerix.sqrt(-2. * numerix.log1p(-u1)) * numerix.cos(2. * numerix.pi * u2)
+
+    def uniform(self, low=0., high=1.):
+        self._nextStream()
+        u, _ = self._uniforms()
+        return low + (high - low) * u
+
+    def normal(self, loc=0., scale=1.):
+        self._nextStream()
+        return loc + scale * self._standardNormal()
+
+    def exponential(self, scale=1.):
+        self._nextStream()
+        u, _ = self._uniforms()
+        return -scale * numerix.log1p(-u)
+
+    def gamma(self, shape, scale=1.):
+        r"""Gamma distributed numbers, by the method of :cite:`Marsaglia:2000`
+
+        Each element repeats its trials until it is accepted, with counters
+        that only depend on the number of the trial, so the result does not
+        depend on the other elements.
+
+            >>> rnd = _CounterRandom(seed=1, step=0, ids=numerix.arange(100000))
+            >>> x = rnd.gamma(shape=numerix.where(numerix.arange(100000) % 2, 0.5, 3.))
+            >>> print(numerix.allclose([x[1::2].mean(), x[0::2].mean()], [0.5, 3.], rtol=0.02))
+            True
+        """
+        self._nextStream()
+        N = len(self._ids[0])
+        shape = numerix.zeros((N,)) + shape
+        boost = shape < 1.
+        # gamma(shape) = gamma(shape + 1) * U**(1 / shape)
+        d = numerix.where(boost, shape + 1., shape) - 1. / 3.
+        c = 1. / numerix.sqrt(9. * d)
+
+        value = numerix.empty((N,))
+        pending = numerix.ones((N,), dtype=bool)
+        attempt = 0
+        while pending.any():
+            x = self._standardNormal(attempt=2 * attempt, ids=pending)
+            u, uBoost = self._uniforms(attempt=2 * attempt + 1, ids=pending)
+            v = (1. + c[pending] * x)**3
+            with numerix.errstate(invalid="ignore", divide="ignore"):
+                accept = (v > 0) & (numerix.log(u) < 0.5 * x**2 + d[pending]
+                                    - d[pending] * v + d[pending] * numerix.log(v))
+                sample = d[pending] * v
+                sample = numerix.where(boost[pending],
+                                       sample * uBoost**(1. / shape[pending]),
+                                       sample)
+            ids = numerix.nonzero(pending)[0][accept]
+            value[ids] = sample[accept]
+            pending[ids] = False
+            attempt += 1
+            if attempt >= 2**15:
+                raise ValueError("gamma trials did not terminate")
+
+        return scale * value
+
+    def beta(self, a, b):
+        x = self.gamma(shape=a)
+        y = self.gamma(shape=b)
+        return x / (x + y)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
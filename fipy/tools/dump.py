@@ -4,23 +4,251 @@ standard_library.install_aliases()
 __docformat__ = 'restructuredtext'
 
 import io
+import json
 import pickle
 import os
-import sys
+import struct
 import gzip
 
+from fipy.tools import backgroundOutput
+from fipy.tools import numerix
 from fipy.tools import parallelComm
 
 __all__ = ["write", "read"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
+# Binary checkpoints consist of `_magic`, the length of a JSON header as
+# a little-endian 64 bit integer, the header, and then blocks of raw data,
+# each aligned to `_alignment` bytes and located by an offset from the end
+# of the header.  The first block holds a pickle of the object, in which
+# every plain array is replaced by a reference to one of the other blocks,
+# so that the arrays can be memory-mapped.
+_magic = b"\x93FIPYDUMP"
+_formatVersion = 1
+_alignment = 64
+
+def _aligned(n):
+    return -(-n // _alignment) * _alignment
+
+def _isBinaryCheckpoint(data):
+    return data[:len(_magic)] == _magic
+
+class _ArrayPickler(pickle.Pickler):
+    """Pickler that sets aside the contents of arrays as raw blocks
+
+    If `copy`, the blocks are copies that do not change with the arrays.
+    Each array is only set aside once, however many times it is referenced.
+    """
+
+    def __init__(self, file, protocol, copy=False):
+        pickle.Pickler.__init__(self, file, protocol)
+        self.blocks = []
+        self.ids = {}
+        self.copy = copy
+
+    def _block(self, arr, original=None):
+        """Index of the block that holds `arr`
+
+        The block is shared by every reference to `original`, which
+        defaults to `arr`.
+        """
+        if original is None:
+            original = arr
+        if id(original) not in self.ids:
+            fortran = (arr.ndim > 1
+                       and arr.flags.f_contiguous
+                       and not arr.flags.c_contiguous)
+            if fortran:
+                arr = arr.T
+            if self.copy:
+                arr = numerix.array(arr, order='C')
+            self.blocks.append((numerix.ascontiguousarray(arr),
+                                dict(dtype=arr.dtype.str,
+                                     shape=list(arr.shape)[::-1] if fortran else list(arr.shape),
+                                     fortran=fortran)))
+            # hold on to `original`, so that its id is not reused
+            self.ids[id(original)] = (len(self.blocks) - 1, original)
+        return self.ids[id(original)][0]
+
+    def persistent_id(self, obj):
+        if isinstance(obj, numerix.ndarray) and _isPlainDtype(obj.dtype):
+            if type(obj) is numerix.ndarray:
+                return ("array", self._block(obj))
+            elif type(obj) is numerix.MA.MaskedArray:
+                mask = numerix.MA.getmask(obj)
+                if mask is numerix.MA.nomask:
+                    maskID = None
+                else:
+                    maskID = self._block(mask)
+                return ("masked", self._block(numerix.MA.getdata(obj), original=obj), maskID,
+                        obj.fill_value.item())
+        return None
+
+def _isPlainDtype(dtype):
+    return not dtype.hasobject and dtype.names is None and dtype.subdtype is None
+
+class _Unpickler(pickle.Unpickler):
+    """Unpickler that retrieves arrays from raw blocks and, optionally,
+    corrects improper pickling of non-uniform meshes (ticket:243)
+    """
+
+    def __init__(self, file, blocks=None, mesh_unmangle=False):
+        pickle.Unpickler.__init__(self, file)
+        self.blocks = blocks
+        self.mesh_unmangle = mesh_unmangle
+
+    def persistent_load(self, pid):
+        if pid[0] == "array":
+            return self.blocks(pid[1])
+        elif pid[0] == "masked":
+            (_, dataID, maskID, fill_value) = pid
+            if maskID is None:
+                mask = numerix.MA.nomask
+            else:
+                mask = self.blocks(maskID)
+            return numerix.MA.array(self.blocks(dataID), mask=mask,
+                                    fill_value=fill_value, copy=False)
+        else:
+            raise pickle.UnpicklingError("unsupported persistent id %r" % (pid,))
+
+    def find_class(self, module, name):
+        klass = pickle.Unpickler.find_class(self, module, name)
+
+        if self.mesh_unmangle:
+            from fipy import meshes
+
+            if isinstance(klass, type) and issubclass(klass, meshes.mesh.Mesh):
+                class UnmangledMesh(klass):
+                    def __setstate__(self, dict):
+                        if ('cellFaceIDs' in dict
+                            and 'faceVertexIDs' in dict):
+
+                            dict = dict.copy()
+                            for key in ('cellFaceIDs', 'faceVertexIDs'):
+                                arr = dict[key]
+                                arr.data[:] = arr.transpose().flatten().reshape(arr.shape)
+
+                        klass.__setstate__(self, dict)
+
+                return UnmangledMesh
+
+        return klass
+
+def _snapshotBinaryCheckpoint(data, copy=False):
+    """Pickle `data` and set aside the contents of its arrays
+
+    Returns
+    -------
+    header : bytes
+    blocks : list of ndarray
+        The pickle, followed by the contents of the arrays.
+    """
+    objectStream = io.BytesIO()
+    pickler = _ArrayPickler(objectStream, protocol=2, copy=copy)
+    pickler.dump(data)
+
+    blocks = [(numerix.frombuffer(objectStream.getvalue(), dtype=numerix.uint8), None)]
+    blocks += pickler.blocks
+
+    header = dict(version=_formatVersion, arrays=[])
+    offset = 0
+    for arr, description in blocks:
+        if description is not None:
+            description["offset"] = offset
+            header["arrays"].append(description)
+        else:
+            header["pickle"] = [offset, arr.nbytes]
+        offset = _aligned(offset + arr.nbytes)
+    header = json.dumps(header).encode("utf-8")
+
+    return (header, [arr for arr, description in blocks])
+
+def _writeSnapshot(snapshot, fileStream):
+    (header, blocks) = snapshot
+
+    fileStream.write(_magic)
+    fileStream.write(struct.pack("<Q", len(header)))
+    fileStream.write(header)
+    written = len(_magic) + 8 + len(header)
+    fileStream.write(b"\0" * (_aligned(written) - written))
+
+    offset = 0
+    for arr in blocks:
+        fileStream.write(arr.tobytes())
+        padding = _aligned(offset + arr.nbytes) - (offset + arr.nbytes)
+        fileStream.write(b"\0" * padding)
+        offset += arr.nbytes + padding
+
+def _readHeader(data, filename=None):
+    """Return the header of a binary checkpoint and where its data begins"""
+    (headerLength,) = struct.unpack("<Q", data[len(_magic):len(_magic) + 8])
+    headerEnd = len(_magic) + 8 + headerLength
+    header = json.loads(data[len(_magic) + 8:headerEnd].decode("utf-8"))
+    if header["version"] > _formatVersion:
+        raise IOError("%s was written in a newer checkpoint format (%d) than can be read (%d)"
+                      % (filename, header["version"], _formatVersion))
+
+    return (header, _aligned(headerEnd))
+
+def _readBinaryCheckpoint(data, filename=None, mmap_mode=None, mesh_unmangle=False):
+    """Reconstruct an object from a binary checkpoint
+
+    Parameters
+    ----------
+    data : bytes
+        At least the header of the checkpoint; the entire checkpoint,
+        unless arrays are to be memory-mapped from `filename`.
+    filename : str
+        File to memory-map arrays from.
+    mmap_mode : {None, 'r', 'r+', 'c'}
+        If not `None`, arrays are memory-mapped from `filename` in this
+        mode (see :func:`numpy.memmap`).
+    mesh_unmangle : bool
+        Whether to correct improper pickling of non-uniform meshes (ticket:243)
+    """
+    (header, start) = _readHeader(data, filename)
+    loaded = {}
+
+    def blocks(i):
+        if i not in loaded:
+            loaded[i] = loadBlock(i)
+        return loaded[i]
+
+    def loadBlock(i):
+        description = header["arrays"][i]
+        dtype = numerix.dtype(str(description["dtype"]))
+        shape = tuple(description["shape"])
+        if description["fortran"]:
+            shape = shape[::-1]
+        count = int(numerix.prod(shape))
+        offset = start + description["offset"]
+        if count == 0:
+            # nothing to read, and nothing that can be memory-mapped
+            arr = numerix.empty(shape, dtype=dtype)
+        elif mmap_mode is not None:
+            arr = numerix.memmap(filename, dtype=dtype, mode=mmap_mode,
+                                 offset=offset, shape=shape)
+        else:
+            arr = numerix.frombuffer(data, dtype=dtype, count=count,
+                                     offset=offset).reshape(shape).copy()
+        if description["fortran"]:
+            arr = arr.T
+        return arr
+
+    (offset, length) = header["pickle"]
+    objectStream = io.BytesIO(data[start + offset:start + offset + length])
+
+    return _Unpickler(objectStream, blocks=blocks, mesh_unmangle=mesh_unmangle).load()
+
 # TODO: add test to show that round trip pickle of mesh doesn't work properly
 # FIXME: pickle fails to work properly on numpy 1.1 (run gapFillMesh.py)
 def write(data, filename = None, extension = '', communicator=parallelComm):
     """
-    Pickle an object and write it to a file. Wrapper for
-    `cPickle.dump()`.
+    Write an object to a binary checkpoint file.
+
+    The object is pickled, except for the contents of its arrays, which are
+    written as raw binary blocks that :func:`read` can memory-map.
 
     Test to check pickling and unpickling.
 
@@ -31,6 +259,37 @@ def write(data, filename = None, extension = '', communicator=parallelComm):
         >>> print(old.numberOfCells == new.numberOfCells)
         True
 
+    With :mod:`~fipy.tools.backgroundOutput`, the object is only pickled
+    before `write` returns, so later changes to it are not written
+
+        >>> from fipy.tools import backgroundOutput
+        >>> from fipy.variables.cellVariable import CellVariable
+        >>> backgroundOutput.doBackground = True
+        >>> var = CellVariable(mesh=old, value=(1., 2.))
+        >>> f, tempfile = write(var)
+        >>> var.value = (3., 4.)
+        >>> print(read(tempfile, f).value.tolist())
+        [1.0, 2.0]
+        >>> backgroundOutput.doBackground = backgroundOutput._background
+
+    An array that is referenced more than once is only written once, and
+    is still shared when it is read
+
+        >>> a = numerix.asfortranarray(numerix.arange(6.).reshape((2, 3)))
+        >>> m = numerix.MA.array(numerix.arange(3.), mask=[0, 1, 0])
+        >>> f, tempfile = write([a, a, m, m])
+        >>> new = read(tempfile, f)
+        >>> print(new[0] is new[1], numerix.allclose(new[0], a))
+        True True
+        >>> print(numerix.may_share_memory(new[2], new[3]))
+        True
+        >>> backgroundOutput.doBackground = True
+        >>> f, tempfile = write([a, a])
+        >>> new = read(tempfile, f)
+        >>> print(new[0] is new[1])
+        True
+        >>> backgroundOutput.doBackground = backgroundOutput._background
+
     Parameters
     ----------
     data
@@ -53,25 +312,76 @@ def write(data, filename = None, extension = '', communicator=parallelComm):
             (f, _filename) =  tempfile.mkstemp(extension)
         else:
             (f, _filename) = (None, filename)
-        _, ext = os.path.splitext(_filename)
-        if ext == ".gz":
-            fileStream = gzip.GzipFile(filename=_filename, mode='wb', fileobj=None)
-        else:
-            fileStream = open(_filename, mode='wb')
     else:
-        fileStream = open(os.devnull, mode='wb')
         (f, _filename) = (None, os.devnull)
 
-    pickle.dump(data, fileStream, 0)
-    fileStream.close()
+    # pickling may need every process, but only the first writes
+    snapshot = _snapshotBinaryCheckpoint(data, copy=backgroundOutput.doBackground)
+    if communicator.procID == 0:
+        backgroundOutput._submit(_writeFile, snapshot, _filename)
 
     if filename is None:
         return (f, _filename)
 
-def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=False):
+def _writeFile(snapshot, filename):
+    _, ext = os.path.splitext(filename)
+    if ext == ".gz":
+        fileStream = gzip.GzipFile(filename=filename, mode='wb', fileobj=None)
+    else:
+        fileStream = open(filename, mode='wb')
+
+    try:
+        _writeSnapshot(snapshot, fileStream)
+    finally:
+        fileStream.close()
+
+def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=False, mmap_mode=None):
     """
-    Read a pickled object from a file. Returns the unpickled object.
-    Wrapper for `cPickle.load()`.
+    Read an object from a file written by :func:`write`. Files pickled
+    by earlier versions of :term:`FiPy` can also be read.
+
+    Arrays in binary checkpoints can be memory-mapped, rather than read,
+    so that only the parts of them that are used are loaded from disk.
+    Variables and meshes copy the arrays they are reconstructed from, so
+    this chiefly benefits large arrays that are stored alongside them.
+
+        >>> from fipy import Grid2D, CellVariable
+        >>> mesh = Grid2D(nx=3, ny=2)
+        >>> var = CellVariable(mesh=mesh, value=mesh.x * mesh.y, name="var")
+        >>> history = numerix.outer(numerix.arange(4.), var.value)
+        >>> f, tempfile = write({"var": var, "history": history})
+        >>> data = read(tempfile, mmap_mode="r")
+        >>> print(isinstance(data["history"], numerix.memmap))
+        True
+        >>> print(numerix.allclose(data["history"][2], 2 * var.value))
+        True
+        >>> print(data["var"].allclose(var))
+        True
+        >>> del data
+        >>> os.close(f)
+        >>> os.remove(tempfile)
+
+    Empty arrays are not memory-mapped, wherever they are
+
+        >>> f, tempfile = write([numerix.arange(100.), numerix.zeros((0, 3))])
+        >>> data = read(tempfile, mmap_mode="r")
+        >>> print(data[1].shape)
+        (0, 3)
+        >>> del data
+        >>> os.close(f)
+        >>> os.remove(tempfile)
+
+    Compressed checkpoints, and older pickles, are read into memory
+
+        >>> f, tempfile = write(var, extension=".gz")
+        >>> print(read(tempfile, f).allclose(var))
+        True
+
+        >>> f, tempfile = write(None)
+        >>> with open(tempfile, "wb") as fileStream:
+        ...     pickle.dump(var, fileStream, 0)
+        >>> print(read(tempfile, f).allclose(var))
+        True
 
     Parameters
     ----------
@@ -84,14 +394,41 @@ def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=Fal
         A duck-typed object with `procID` and `Nproc` attributes is sufficient
     mesh_unmangle : bool
         Whether to correct improper pickling of non-uniform meshes (ticket:243)
+    mmap_mode : {None, 'r', 'r+', 'c'}
+        If not `None`, memory-map the arrays of an uncompressed binary
+        checkpoint in this mode (see :func:`numpy.memmap`), instead of
+        reading them. Use `'c'` (copy-on-write) if the values of the
+        variables will be changed. Ignored for temporary files, compressed
+        files, older pickles, and in parallel.
     """
+    # the file may still be being written
+    backgroundOutput.flush()
+
+    _, ext = os.path.splitext(filename)
+    mmap_mode = (mmap_mode
+                 if (ext != ".gz"
+                     and fileobject is None
+                     and communicator.Nproc == 1)
+                 else None)
+
     if communicator.procID == 0:
-        _, ext = os.path.splitext(filename)
         if ext == ".gz":
             fileStream = gzip.GzipFile(filename=filename, mode='r', fileobj=None)
         else:
             fileStream = open(filename, mode='rb')
-        data = fileStream.read()
+        if mmap_mode is not None:
+            # only read as far as the pickle; arrays are mapped later
+            data = fileStream.read(len(_magic) + 8)
+            if _isBinaryCheckpoint(data):
+                (headerLength,) = struct.unpack("<Q", data[len(_magic):])
+                data += fileStream.read(headerLength)
+                (header, start) = _readHeader(data, filename)
+                (offset, length) = header["pickle"]
+                data += fileStream.read(start + offset + length - len(data))
+            else:
+                data += fileStream.read()
+        else:
+            data = fileStream.read()
         fileStream.close()
         if fileobject is not None:
             os.close(fileobject)
@@ -102,39 +439,11 @@ def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=Fal
     if communicator.Nproc > 1:
         data = communicator.bcast(data, root=0)
 
-    f = io.BytesIO(data)
-
-    unpickler = pickle.Unpickler(f)
-
-    if mesh_unmangle:
-        def find_class(module, name):
-            __import__(module)
-            mod = sys.modules[module]
-            klass = getattr(mod, name)
-
-            from fipy import meshes
-            import types
-
-            if isinstance(klass, type) and issubclass(klass, meshes.mesh.Mesh):
-                class UnmangledMesh(klass):
-                    def __setstate__(self, dict):
-                        if ('cellFaceIDs' in dict
-                            and 'faceVertexIDs' in dict):
-
-                            dict = dict.copy()
-                            for key in ('cellFaceIDs', 'faceVertexIDs'):
-                                arr = dict[key]
-                                arr.data[:] = arr.transpose().flatten().reshape(arr.shape)
-
-                        klass.__setstate__(self, dict)
-
-                return UnmangledMesh
-            else:
-                return klass
-
-        unpickler.find_global = find_class
-
-    return unpickler.load()
+    if _isBinaryCheckpoint(data):
+        return _readBinaryCheckpoint(data, filename=filename, mmap_mode=mmap_mode,
+                                     mesh_unmangle=mesh_unmangle)
+    else:
+        return _Unpickler(io.BytesIO(data), mesh_unmangle=mesh_unmangle).load()
 
 def _test():
     import fipy.tests.doctestPlus
@@ -0,0 +1,545 @@
+r"""Distance functions and extensions on arbitrary meshes
+
+The distance from the zero level set of a cell variable :math:`\phi`
+satisfies
+
+.. math::
+
+   \abs{\nabla \phi} = 1
+
+and a variable :math:`u` is extended away from the zero level set by
+solving
+
+.. math::
+
+   \nabla u \cdot \nabla \phi = 0
+
+Both are solved to first order by the group marching method of
+:cite:`Kim:2001`.  Where fast marching accepts one cell at a time from a
+heap, here all the trial cells that are too close to each other for one to
+be upwind of another are accepted at once, so that each step is a
+vectorized operation over a group of cells.  A cell is updated from the
+simplices that can be formed from its face neighbors, using only the
+positions of the cell centers, so the same code serves 1D, 2D and 3D grids
+as well as unstructured meshes.
+
+    >>> from fipy.meshes import Grid1D
+    >>> from fipy.tools import serialComm
+    >>> mesh = Grid1D(dx=0.5, nx=8, communicator=serialComm)
+    >>> print(_GroupMarchingMethod(mesh).distance(phi=(-1., -1., -1., -1., 1., 1., 1., 1.)))
+    [-1.75 -1.25 -0.75 -0.25  0.25  0.75  1.25  1.75]
+
+The distance to a sphere in a 3D grid is recovered from another function
+with the same zero level set
+
+    >>> from fipy.meshes import Grid3D
+    >>> mesh = Grid3D(nx=20, ny=20, nz=20, dx=0.05, dy=0.05, dz=0.05,
+    ...               communicator=serialComm)
+    >>> x, y, z = mesh.cellCenters.value
+    >>> exact = numerix.sqrt((x - 0.5)**2 + (y - 0.5)**2 + (z - 0.5)**2) - 0.3
+    >>> phi = _GroupMarchingMethod(mesh).distance(phi=exact * (2 + x))
+    >>> print(numerix.allclose(phi, exact, atol=0.035))
+    True
+
+as is the distance to a circle in an unstructured triangular mesh
+
+    >>> from fipy.meshes import Tri2D
+    >>> mesh = Tri2D(nx=20, ny=20, dx=0.05, dy=0.05)
+    >>> x, y = mesh.cellCenters.value
+    >>> exact = numerix.sqrt((x - 0.5)**2 + (y - 0.5)**2) - 0.3
+    >>> phi = _GroupMarchingMethod(mesh).distance(phi=exact * (2 + x))
+    >>> print(numerix.allclose(phi, exact, atol=0.06))
+    True
+    >>> near = abs(exact) < 0.1
+    >>> print(numerix.allclose(phi[near], exact[near], atol=0.015))
+    True
+
+With a `narrowBandWidth`, the front stops at that distance from the zero
+level set, and cells further away are set to :math:`\pm` the width
+
+    >>> phi = _GroupMarchingMethod(mesh).distance(phi=exact * (2 + x),
+    ...                                           narrowBandWidth=0.1)
+    >>> print(numerix.allclose(phi[near], exact[near], atol=0.015))
+    True
+    >>> print(abs(phi).max())
+    0.1
+
+Neighbors across a periodic face are as far apart as the mesh says, not
+as their cell centers are, so the last cell is within a cell spacing of
+the zero level set where :math:`\phi = x - 2.2` jumps from 7.3 to -1.7
+across the periodic boundary
+
+    >>> from fipy.meshes import PeriodicGrid1D
+    >>> mesh = PeriodicGrid1D(nx=10, communicator=serialComm)
+    >>> x = mesh.cellCenters[0].value
+    >>> phi = _GroupMarchingMethod(mesh).distance(phi=x - 2.2)
+    >>> print(numerix.allclose(phi, (-1.7 / 9, -0.7, 0.3, 1.3, 2.3, 3.3,
+    ...                              4 - 1.7 / 9, 3 - 1.7 / 9, 2 - 1.7 / 9, 1 - 1.7 / 9)))
+    True
+
+A mesh without neighboring cells has nothing to march to, so its values
+are left as they are
+
+    >>> mesh = Grid1D(nx=1, communicator=serialComm)
+    >>> print(_GroupMarchingMethod(mesh).distance(phi=(-0.3,)))
+    [-0.3]
+    >>> print(_GroupMarchingMethod(mesh).extend(phi=(-0.3,), extension=(2.,)))
+    [ 2.]
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+from itertools import combinations
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+
+__all__ = []
+
+def _simplexUpdate(r, b):
+    r"""First order distance of a cell from a simplex of its neighbors
+
+    The gradient of the distance :math:`d` is approximated from the
+    differences :math:`b_i - d` to the `k` neighbors at displacements
+    :math:`\vec{r}_i`, as the smallest :math:`\nabla d` with
+    :math:`\vec{r}_i \cdot \nabla d = b_i - d`, i.e.,
+
+    .. math::
+
+       \nabla d = \sum_i w_i \vec{r}_i
+       \quad\text{with}\quad
+       \mathsf{G} \vec{w} = \vec{b} - d
+
+    where :math:`G_{ij} = \vec{r}_i \cdot \vec{r}_j`.  The larger root of
+    :math:`\abs{\nabla d} = 1` is only accepted if it is upwind of the
+    simplex, i.e., if all :math:`w_i \le 0`.
+
+    On an orthogonal grid, this is the usual fast marching update
+
+    >>> d, w = _simplexUpdate(r=numerix.array([[[-1., 0.]], [[0., -2.]]]),
+    ...                       b=numerix.array([[0., 0.]]))
+    >>> print(numerix.allclose(d, 1. / numerix.sqrt(1. + 1. / 4)))
+    True
+
+    and no update is made from opposite neighbors
+
+    >>> d, w = _simplexUpdate(r=numerix.array([[[-1., 1.]]]),
+    ...                       b=numerix.array([[0., 0.]]))
+    >>> print(d)
+    [ inf]
+
+    Parameters
+    ----------
+    r : ndarray
+        Displacements of the neighbors, of shape `(dim, V, k)`.
+    b : ndarray
+        Distances of the neighbors, of shape `(V, k)`.
+
+    Returns
+    -------
+    d : ndarray
+        Distances of shape `(V,)`, infinite where there is no update.
+    w : ndarray
+        Weights of shape `(V, k)`.
+    """
+    gram, regular = _gram(r)
+    adjugate, determinant = _adjugate(gram)
+    # degenerate simplices have no inverse, and are discarded below
+    with numerix.errstate(invalid="ignore", divide="ignore"):
+        inverse = adjugate / determinant[..., numerix.newaxis, numerix.newaxis]
+        p = (inverse * b[..., numerix.newaxis, :]).sum(axis=-1)
+        q = inverse.sum(axis=-1)
+
+        a = q.sum(axis=-1)
+        s = p.sum(axis=-1)
+        discriminant = s**2 - a * ((b * p).sum(axis=-1) - 1.)
+        regular &= (a > 0) & (discriminant > 0)
+        d = (s + numerix.sqrt(abs(discriminant))) / a
+        w = p - d[..., numerix.newaxis] * q
+
+    tolerance = 1e-10 * abs(w).max(axis=-1)
+    upwind = ((w <= tolerance[..., numerix.newaxis]).all(axis=-1)
+              & (d >= b.max(axis=-1) - 1e-10 * abs(d)))
+    d[~(regular & upwind)] = numerix.inf
+
+    return d, w
+
+def _gram(r):
+    """Gram matrices of the displacements `r` of shape `(dim, V, k)`
+
+    Also returns whether each set of displacements is far enough from
+    being collinear to be used as a simplex.
+    """
+    gram = (r[..., numerix.newaxis] * r[..., numerix.newaxis, :]).sum(axis=0)
+    adjugate, determinant = _adjugate(gram)
+    diagonal = (r**2).sum(axis=0)
+    return gram, determinant > 1e-4 * numerix.prod(diagonal, axis=-1)
+
+def _adjugate(gram):
+    """Adjugates and determinants of symmetric matrices of up to 3 x 3
+
+    >>> gram = numerix.array([[[2., 1., 0.], [1., 3., 1.], [0., 1., 4.]]])
+    >>> adjugate, determinant = _adjugate(gram)
+    >>> print(numerix.allclose(adjugate / determinant[:, numerix.newaxis, numerix.newaxis],
+    ...                        numerix.linalg.inv(gram)))
+    True
+    """
+    k = gram.shape[-1]
+    if k == 1:
+        return numerix.ones_like(gram), gram[:, 0, 0]
+    elif k == 2:
+        adjugate = numerix.empty_like(gram)
+        adjugate[:, 0, 0] = gram[:, 1, 1]
+        adjugate[:, 1, 1] = gram[:, 0, 0]
+        adjugate[:, 0, 1] = adjugate[:, 1, 0] = -gram[:, 0, 1]
+        return adjugate, gram[:, 0, 0] * gram[:, 1, 1] - gram[:, 0, 1]**2
+    else:
+        g00, g01, g02 = gram[:, 0, 0], gram[:, 0, 1], gram[:, 0, 2]
+        g11, g12, g22 = gram[:, 1, 1], gram[:, 1, 2], gram[:, 2, 2]
+        adjugate = numerix.empty_like(gram)
+        adjugate[:, 0, 0] = g11 * g22 - g12**2
+        adjugate[:, 1, 1] = g00 * g22 - g02**2
+        adjugate[:, 2, 2] = g00 * g11 - g01**2
+        adjugate[:, 0, 1] = adjugate[:, 1, 0] = g02 * g12 - g01 * g22
+        adjugate[:, 0, 2] = adjugate[:, 2, 0] = g01 * g12 - g02 * g11
+        adjugate[:, 1, 2] = adjugate[:, 2, 1] = g01 * g02 - g00 * g12
+        determinant = (g00 * adjugate[:, 0, 0] + g01 * adjugate[:, 0, 1]
+                       + g02 * adjugate[:, 0, 2])
+        return adjugate, determinant
+
+class _GroupMarchingMethod(object):
+    """Distances and extensions from the zero level set of a cell variable
+
+    Parameters
+    ----------
+    mesh : ~fipy.meshes.mesh.Mesh
+        The mesh of the level set variable.
+    """
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self._neighbors = MA.filled(mesh._cellToCellIDs, -1).swapaxes(0, 1)
+        exists = self._neighbors >= 0
+
+        # displacement of each neighbor from its cell
+        centers = numerix.array(mesh.cellCenters)
+        self._displacements = centers[:, self._neighbors] - centers[..., numerix.newaxis]
+        spacing = numerix.sqrt((self._displacements**2).sum(axis=0))
+
+        # across a periodic face, the centers are on opposite sides of the
+        # domain, but the mesh knows the distance through the face
+        normals = numerix.array(MA.filled(mesh._cellNormals, 0.)).swapaxes(1, 2)
+        distances = numerix.array(MA.filled(mesh._scaledCellToCellDistances, 0.)).swapaxes(0, 1)
+        wrapped = exists & ((abs(spacing - distances) > 1e-6 * distances)
+                            | ((self._displacements * normals).sum(axis=0) <= 0))
+        self._displacements[:, wrapped] = normals[:, wrapped] * distances[wrapped]
+        spacing[wrapped] = distances[wrapped]
+
+        # a cell is at least this much further from the level set than the
+        # closest of the neighbors it is updated from
+        if exists.any():
+            self._groupWidth = spacing[exists].min() / numerix.sqrt(mesh.dim)
+        else:
+            # no cell has a neighbor, so there is nothing to march to
+            self._groupWidth = numerix.inf
+
+        maxNeighbors = self._neighbors.shape[-1]
+        self._patterns = [numerix.array(list(combinations(list(range(maxNeighbors)), k)),
+                                        dtype=int).reshape((-1, k))
+                          for k in range(1, min(mesh.dim, maxNeighbors) + 1)]
+
+
+    def _updates(self, cells, usable, values, scale=None):
+        """Best update of each cell from its `usable` neighbors
+
+        Parameters
+        ----------
+        cells : ndarray of int
+            IDs of the `M` cells to update.
+        usable : ndarray of bool
+            Which neighbors of each cell can be used, of shape `(M, F)`.
+        values : ndarray
+            Distances of the neighbors, of shape `(M, F)`.
+        scale : ndarray, optional
+            Factors for the displacements of the neighbors, of shape `(M, F)`.
+
+        Returns
+        -------
+        rows : ndarray of int
+            Indices into `cells` of the cells that can be updated.
+        d : ndarray
+            Their new distances.
+        neighbors : ndarray of int
+            The neighbors they were updated from, of shape `(len(rows), dim)`.
+        weights : ndarray
+            The normalized weights of those neighbors in an extension.
+        """
+        M = len(cells)
+        maxSimplex = self._patterns[-1].shape[-1]
+
+        r = self._displacements[:, cells]
+        if scale is not None:
+            r = r * scale
+
+        # update through the nearest single neighbor
+        through = numerix.where(usable, values + numerix.sqrt((r**2).sum(axis=0)), numerix.inf)
+        nearest = through.argmin(axis=-1)
+        d = through[numerix.arange(M), nearest]
+        neighbors = numerix.zeros((M, maxSimplex), dtype=self._neighbors.dtype)
+        neighbors[:, 0] = self._neighbors[cells, nearest]
+        weights = numerix.zeros((M, maxSimplex))
+        weights[:, 0] = 1.
+
+        # only neighbors closer than that can be upwind of a better update
+        upwind = usable & (values < d[..., numerix.newaxis])
+        for pattern in self._patterns[1:]:
+            row, which = numerix.nonzero(upwind[:, pattern].all(axis=-1))
+            if len(row) == 0:
+                continue
+            slots = pattern[which]
+            rowk = row[..., numerix.newaxis]
+            dk, w = _simplexUpdate(r=r[:, rowk, slots], b=values[rowk, slots])
+
+            # keep the smallest distance of each cell
+            order = numerix.lexsort((dk, row))
+            first = order[numerix.concatenate(([True], row[order][1:] != row[order][:-1]))]
+            first = first[dk[first] < d[row[first]]]
+            row, slots, dk, w = row[first], slots[first], dk[first], w[first]
+
+            k = slots.shape[-1]
+            d[row] = dk
+            neighbors[row, :k] = self._neighbors[cells[row, numerix.newaxis], slots]
+            neighbors[row, k:] = 0
+            weights[row, :k] = w / w.sum(axis=-1)[..., numerix.newaxis]
+            weights[row, k:] = 0.
+
+        rows = numerix.nonzero(numerix.isfinite(d))[0]
+        return rows, d[rows], neighbors[rows], weights[rows]
+
+    def _interface(self, phi, cells):
+        """Distances of the `cells` that have a neighbor across the zero level set
+
+        The level set crosses the line to each such neighbor where the
+        linear interpolation of `phi` vanishes.
+        """
+        neighbors = self._neighbors[cells]
+        neighborPhi = phi[neighbors]
+        opposite = (neighbors >= 0) & (phi[cells, numerix.newaxis] * neighborPhi < 0)
+        which = opposite.any(axis=-1)
+        cells, neighborPhi, opposite = cells[which], neighborPhi[which], opposite[which]
+        with numerix.errstate(invalid="ignore", divide="ignore"):
+            scale = numerix.where(opposite,
+                                  phi[cells, numerix.newaxis]
+                                  / (phi[cells, numerix.newaxis] - neighborPhi),
+                                  0.)
+        rows, d, neighbors, weights = self._updates(cells=cells, usable=opposite,
+                                                    values=numerix.zeros(opposite.shape),
+                                                    scale=scale)
+        return cells[rows], d, neighbors, weights
+
+    def _relax(self, cells, distance, known, extension, width):
+        """Update `cells` from their `known` neighbors
+
+        Returns the cells whose distance or extension has changed.
+        """
+        neighborIDs = self._neighbors[cells]
+        usable = (neighborIDs >= 0) & known[neighborIDs]
+        rows, d, neighbors, weights = self._updates(cells=cells, usable=usable,
+                                                    values=distance[neighborIDs])
+        cells = cells[rows]
+        better = (d < distance[cells] * (1 - 1e-12)) & (d <= width)
+        distance[cells[better]] = d[better]
+
+        if extension is not None:
+            # the extension changes if the distance does, or if the
+            # neighbors that determine the distance have changed
+            current = better | (d <= distance[cells] * (1 + 1e-12))
+            u = (weights * extension[neighbors]).sum(axis=-1)
+            better |= current & (abs(u - extension[cells]) > 1e-12 * abs(u))
+            extension[cells[current]] = u[current]
+
+        return cells[better]
+
+    def _march(self, phi, extension=None, narrowBandWidth=None, cells=None):
+        """Distances, and optionally extensions, from the zero level set
+
+        Parameters
+        ----------
+        phi : array_like
+            Cell values, whose sign distinguishes the two sides of the
+            level set.
+        extension : array_like, optional
+            Cell values to extend.
+        narrowBandWidth : float, optional
+            Only march up to this distance from the zero level set.
+        cells : ndarray of int, optional
+            Cells that contain all of the zero level set.
+
+        Returns
+        -------
+        distance : ndarray
+            Unsigned distances, infinite where they were not calculated.
+        extension : ndarray
+            The extended values, if `extension` was given.
+        reached : ndarray of int
+            The cells whose distances were calculated.
+        """
+        phi = numerix.array(phi, dtype=float)
+        if narrowBandWidth is None:
+            width = numerix.inf
+        else:
+            width = narrowBandWidth
+        if cells is None:
+            cells = numerix.arange(len(phi))
+
+        distance = numerix.empty(phi.shape)
+        distance.fill(numerix.inf)
+        known = numerix.zeros(phi.shape, dtype=bool)
+        zero = cells[phi[cells] == 0]
+        distance[zero] = 0.
+        known[zero] = True
+
+        cells, d, neighbors, weights = self._interface(phi, cells)
+        distance[cells] = d
+        known[cells] = True
+
+        if extension is not None:
+            extension = numerix.array(extension, dtype=float)
+            # only the cells on the positive side of the level set are
+            # sources, the others interpolate from their neighbors across
+            negative = phi[cells] < 0
+            extension[cells[negative]] = (weights[negative]
+                                          * extension[neighbors[negative]]).sum(axis=-1)
+
+        accepted = numerix.concatenate((zero, cells))
+        reached = [accepted]
+        trial = numerix.zeros((0,), dtype=int)
+        while True:
+            neighbors = self._neighbors[accepted]
+            neighbors = numerix.unique(neighbors[neighbors >= 0])
+            neighbors = neighbors[~known[neighbors]]
+            self._relax(neighbors, distance, known, extension, width)
+            trial = numerix.union1d(trial, neighbors[numerix.isfinite(distance[neighbors])])
+
+            if len(trial) == 0:
+                break
+
+            # accept every trial cell that cannot be upwind of another
+            trialDistance = distance[trial]
+            group = trialDistance <= trialDistance.min() + self._groupWidth
+            accepted, trial = trial[group], trial[~group]
+            known[accepted] = True
+            reached.append(accepted)
+
+            # the accepted cells may still depend on each other
+            changed = accepted
+            while len(changed) > 0:
+                downwind = self._neighbors[changed]
+                downwind = downwind[(downwind >= 0)
+                                    & (distance[downwind] > distance[changed, numerix.newaxis])]
+                downwind = numerix.intersect1d(downwind, accepted)
+                changed = self._relax(downwind, distance, known, extension, width)
+
+        return distance, extension, numerix.concatenate(reached)
+
+    def distance(self, phi, narrowBandWidth=None):
+        r"""Signed distance from the zero level set of `phi`
+
+        Parameters
+        ----------
+        phi : array_like
+            Cell values, whose sign distinguishes the two sides of the
+            level set.
+        narrowBandWidth : float, optional
+            Only calculate distances up to this value.  Further cells are
+            set to :math:`\pm` `narrowBandWidth`.  Cells that cannot be
+            reached from the zero level set are left unchanged if no width
+            is given.
+        """
+        distance = self._march(phi=phi, narrowBandWidth=narrowBandWidth)[0]
+
+        if narrowBandWidth is None:
+            far = phi
+        else:
+            far = numerix.sign(phi) * narrowBandWidth
+        return numerix.where(numerix.isfinite(distance), numerix.sign(phi) * distance, far)
+
+    def narrowBandDistance(self, phi, narrowBandWidth, cells=None):
+        """Signed distance from the zero level set of `phi`, near it
+
+        Only the cells within `narrowBandWidth` are visited, so that the
+        cost is proportional to the number of those cells, rather than to
+        the size of the mesh.
+
+            >>> from fipy.meshes import Grid1D
+            >>> from fipy.tools import serialComm
+            >>> mesh = Grid1D(nx=10, communicator=serialComm)
+            >>> cells, distance = _GroupMarchingMethod(mesh).narrowBandDistance(
+            ...     phi=mesh.cellCenters[0].value - 4.8, narrowBandWidth=2.,
+            ...     cells=numerix.array([3, 4, 5, 6]))
+            >>> order = numerix.argsort(cells)
+            >>> print(cells[order])
+            [3 4 5 6]
+            >>> print(distance[order])
+            [-1.3 -0.3  0.7  1.7]
+
+        Parameters
+        ----------
+        phi : array_like
+            Cell values, whose sign distinguishes the two sides of the
+            level set.
+        narrowBandWidth : float
+            Only calculate distances up to this value.
+        cells : ndarray of int, optional
+            Cells that contain all of the zero level set.
+
+        Returns
+        -------
+        cells : ndarray of int
+            The cells within `narrowBandWidth` of the zero level set.
+        distance : ndarray
+            Their signed distances.
+        """
+        phi = numerix.asarray(phi)
+        distance, _, cells = self._march(phi=phi, narrowBandWidth=narrowBandWidth, cells=cells)
+        return cells, numerix.sign(phi[cells]) * distance[cells]
+
+    def extend(self, phi, extension, narrowBandWidth=None, cells=None):
+        """Extension of `extension` from the positive side of the zero level set of `phi`
+
+        The values of the cells next to the zero level set with positive
+        `phi` are kept and all other cells take values that are constant
+        along the normals to the level set.
+
+            >>> from fipy.meshes import Grid2D
+            >>> from fipy.tools import serialComm
+            >>> mesh = Grid2D(dx=1., dy=1., nx=2, ny=2, communicator=serialComm)
+            >>> print(_GroupMarchingMethod(mesh).extend(phi=(-1., 1., 1., 1.),
+            ...                                         extension=(-1., .5, 2., -1.)))
+            [ 1.25  0.5   2.    1.25]
+
+        Parameters
+        ----------
+        phi : array_like
+            Cell values, whose sign distinguishes the two sides of the
+            level set.
+        extension : array_like
+            Cell values to extend.
+        narrowBandWidth : float, optional
+            Only extend up to this distance from the zero level set.
+            Further cells keep their values.
+        cells : ndarray of int, optional
+            Cells that contain all of the zero level set.
+        """
+        return self._march(phi=phi, extension=extension,
+                           narrowBandWidth=narrowBandWidth, cells=cells)[1]
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
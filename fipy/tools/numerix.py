@@ -62,6 +62,22 @@ elif arch == '64bit':
 else:
     raise Exception('Cannot set integer dtype because architecture is unknown.')
 
+def _indexDtype(n):
+    """Compact integer type for indices into `n` elements
+
+    Connectivity arrays of meshes with fewer than :math:`2^{31}` elements
+    are stored as `int32`, which halves their memory on 64-bit platforms.
+
+        >>> print(_indexDtype(1000))
+        int32
+        >>> print(_indexDtype(2**31) == INT_DTYPE)
+        True
+    """
+    if n < NUMERIX.iinfo(NUMERIX.int32).max:
+        return NUMERIX.dtype(NUMERIX.int32)
+    else:
+        return NUMERIX.dtype(INT_DTYPE)
+
 py_max = max
 
 from numpy.core import umath
@@ -462,7 +478,23 @@ else:
         ## We can't use Numeric.dot on an array of vectors
         return sqrt(dot(a1, a2))
 
-def nearest(data, points, max_mem=1e8):
+def _kdtree(data):
+    """spatial index of the (D, N) `data` for use by `nearest`
+
+    Returns `None` if :mod:`scipy.spatial` is not available.
+    """
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return None
+
+    data = asarray(data)
+    if data.shape[-1] == 0:
+        return None
+
+    return cKDTree(data.T)
+
+def nearest(data, points, max_mem=1e8, tree=None):
     """find the indices of `data` that are closest to `points`
 
     >>> from fipy import *
@@ -474,6 +506,30 @@ def nearest(data, points, max_mem=1e8):
     [4 5 7 8]
     >>> print(nearest(m0.cellCenters.globalValue, m1.cellCenters.globalValue, max_mem=10000))
     [4 5 7 8]
+
+    The result is the same, whether or not a spatial index is used.
+
+    >>> tree = _kdtree(m0.cellCenters.globalValue)
+    >>> print(nearest(m0.cellCenters.globalValue, m1.cellCenters.globalValue, tree=tree))
+    [4 5 7 8]
+    >>> m2 = Grid2D(nx=4, ny=4)
+    >>> print(nearest(m2.cellCenters.globalValue, m2.vertexCoords, max_mem=100))
+    [ 0  0  1  2  3  0  0  1  2  3  4  4  5  6  7  8  8  9 10 11 12 12 13 14 15]
+    >>> print(nearest(m2.cellCenters.globalValue, m2.vertexCoords))
+    [ 0  0  1  2  3  0  0  1  2  3  4  4  5  6  7  8  8  9 10 11 12 12 13 14 15]
+
+    Parameters
+    ----------
+    data : array_like
+        (D, N) coordinates to search
+    points : array_like
+        (D, M) coordinates to find the nearest `data` to
+    max_mem : float
+        Approximate number of bytes of intermediate storage to use
+    tree : ~scipy.spatial.cKDTree
+        Spatial index of `data`, as returned by `_kdtree`, for
+        :math:`O(M \\log N)` searches. Built if not supplied and
+        :mod:`scipy.spatial` is available.
     """
     data = asanyarray(data)
     points = asanyarray(points)
@@ -485,6 +541,13 @@ def nearest(data, points, max_mem=1e8):
     if N == 0:
         return arange(0)
 
+    if (points.ndim == 2
+        and not (_isPhysical(data) or _isPhysical(points))):
+        if tree is None:
+            tree = _kdtree(data)
+        if tree is not None:
+            return _nearestInTree(data, points, tree, max_mem)
+
     # given (D, N) data and (D, M) points,
     # break points into (D, C) chunks of points
     # calculate the full factorial (D, N, C) distances between them
@@ -530,6 +593,29 @@ def nearest(data, points, max_mem=1e8):
 
     return nearestIndices
 
+def _nearestInTree(data, points, tree, max_mem):
+    D, M = points.shape
+
+    # enough candidates to include every cell that meets at a vertex
+    k = min(tree.n, 2**(D + 1))
+
+    numChunks = int(round(D * k * data.itemsize * M / max_mem + 0.5))
+
+    nearestIndices = empty((M,), dtype=INT_DTYPE)
+    for chunk in array_split(arange(M), numChunks):
+        chunkOfPoints = points[..., chunk]
+        _, candidates = tree.query(asarray(chunkOfPoints, dtype=float).T, k=k)
+        candidates = NUMERIX.sort(candidates.reshape((len(chunk), k)), axis=-1)
+
+        # choose among the candidates exactly as the exhaustive search
+        # does, so that ties and round-off are resolved identically
+        tmp = data[..., candidates] - chunkOfPoints[..., newaxis]
+        tmp = sum(tmp * tmp, axis=0)
+
+        nearestIndices[chunk] = candidates[arange(len(chunk)), argmin(tmp, axis=-1)]
+
+    return nearestIndices
+
 def allequal(first, second):
     """
     Returns `true` if every element of `first` is equal to the corresponding
@@ -9,6 +9,9 @@ def _suite():
             'dimensions.physicalField',
             'numerix',
             'dump',
+            'backgroundOutput',
+            'counterRandom',
+            'eikonal',
             'vector',
             'sharedtempfile'
         ), base = __name__)
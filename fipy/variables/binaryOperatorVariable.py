@@ -36,6 +36,8 @@ def _BinaryOperatorVariable(operatorClass=None):
     # declare a binary operator class with the desired base class
     class binOp(operatorClass):
 
+        _fusible = True
+
         def _calcValue_(self):
             from fipy.variables.variable import Variable
             if isinstance(self.var[1], Variable):
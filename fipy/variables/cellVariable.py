@@ -144,10 +144,14 @@ class CellVariable(_MeshVariable):
 
     def __call__(self, points=None, order=0, nearestCellIDs=None):
         r"""
-        Interpolates the `CellVariable` to a set of points using a
-        method that has a memory requirement on the order of `Ncells` by
-        `Npoints` in general, but uses only `Ncells` when the
-        `CellVariable`'s mesh is a `UniformGrid` object.
+        Interpolates the `CellVariable` to a set of points.
+
+        Each point takes the value of the cell that contains it (or, for
+        points outside the mesh, of the cell with the nearest center).
+        First order interpolation extrapolates linearly from that cell's
+        center using the gradient of the `CellVariable`.  This is not a
+        barycentric interpolation from the vertices of the cell, and the
+        interpolant is not continuous across the faces of cells.
 
         Tests
 
@@ -169,6 +173,16 @@ class CellVariable(_MeshVariable):
             [ 0.125  0.25   0.5    0.625  0.25   0.375  0.875  1.     0.5    0.875
               1.875  2.25   0.625  1.     2.25   2.625]
 
+        On a graded mesh, points are located in the cell that contains them,
+        which need not be the cell with the nearest center
+
+            >>> m = Grid1D(dx=(.1, 1., 10.))
+            >>> v = CellVariable(mesh=m, value=m.cellCenters[0])
+            >>> print(v(((0.05, 3., 11.),)))
+            [ 0.05  6.1   6.1 ]
+            >>> print(v(((0.05, 3., 11.),), order=1))
+            [ 0.05  4.55  8.55]
+
         Parameters
         ----------
         points : tuple or :obj:`list` of :obj:`tuple`
@@ -177,12 +191,12 @@ class CellVariable(_MeshVariable):
             The order of interpolation, default is 0
         nearestCellIDs : array_like
             Optional argument if user can calculate own
-            nearest cell IDs array, shape should be same as points
+            containing cell IDs array, shape should be same as points
         """
         if points is not None:
 
             if nearestCellIDs is None:
-                nearestCellIDs = self.mesh._getNearestCellID(points)
+                nearestCellIDs = self.mesh._getContainingCellID(points)
 
             if order == 0:
                 return self.globalValue[..., nearestCellIDs]
@@ -49,7 +49,7 @@ def _parseLSMSolver():
 LSM_SOLVER = _parseLSMSolver()
 
 register_skipper(flag="LSM",
-                 test=lambda : LSM_SOLVER is not None,
+                 test=lambda : LSM_SOLVER in ('lsmlib', 'skfmm'),
                  why="neither `lsmlib` nor `skfmm` can be found on the $PATH")
 
 register_skipper(flag="LSMLIB",
@@ -77,6 +77,11 @@ class DistanceVariable(CellVariable):
     by the zero level set.  The solution can either be first or second
     order.
 
+    On 1D, 2D and 3D grids, the distance is calculated with `lsmlib` or
+    `skfmm` when either is available.  Otherwise, or for any other mesh, or
+    if the :envvar:`FIPY_LSM` environment variable is set to ``fipy``, it
+    is calculated to first order by :term:`FiPy` itself.
+
     Here we will define a few test cases. Firstly a 1D test case
 
     >>> from fipy.meshes import Grid1D
@@ -84,9 +89,9 @@ class DistanceVariable(CellVariable):
     >>> mesh = Grid1D(dx = .5, nx = 8, communicator=serialComm)
     >>> from .distanceVariable import DistanceVariable
     >>> var = DistanceVariable(mesh = mesh, value = (-1., -1., -1., -1., 1., 1., 1., 1.))
-    >>> var.calcDistanceFunction() #doctest: +LSM
+    >>> var.calcDistanceFunction()
     >>> answer = (-1.75, -1.25, -.75, -0.25, 0.25, 0.75, 1.25, 1.75)
-    >>> print(var.allclose(answer)) #doctest: +LSM
+    >>> print(var.allclose(answer))
     1
 
     A 1D test case with very small dimensions.
@@ -94,9 +99,9 @@ class DistanceVariable(CellVariable):
     >>> dx = 1e-10
     >>> mesh = Grid1D(dx = dx, nx = 8, communicator=serialComm)
     >>> var = DistanceVariable(mesh = mesh, value = (-1., -1., -1., -1., 1., 1., 1., 1.))
-    >>> var.calcDistanceFunction() #doctest: +LSM
+    >>> var.calcDistanceFunction()
     >>> answer = numerix.arange(8) * dx - 3.5 * dx
-    >>> print(var.allclose(answer)) #doctest: +LSM
+    >>> print(var.allclose(answer))
     1
 
     A 2D test case to test `_calcTrialValue` for a pathological case.
@@ -107,7 +112,7 @@ class DistanceVariable(CellVariable):
     >>> mesh = Grid2D(dx = dx, dy = dy, nx = 2, ny = 3, communicator=serialComm)
     >>> var = DistanceVariable(mesh = mesh, value = (-1., 1., 1., 1., -1., 1.))
 
-    >>> var.calcDistanceFunction() #doctest: +LSM
+    >>> var.calcDistanceFunction()
     >>> vbl = -dx * dy / numerix.sqrt(dx**2 + dy**2) / 2.
     >>> vbr = dx / 2
     >>> vml = dy / 2.
@@ -118,7 +123,7 @@ class DistanceVariable(CellVariable):
     >>> sqrt = numerix.sqrt(max(sqrt, 0))
     >>> vmr = (top + sqrt) / dsq
     >>> answer = (vbl, vbr, vml, vmr, vbl, vbr)
-    >>> print(var.allclose(answer)) #doctest: +LSM
+    >>> print(var.allclose(answer))
     1
 
     The `extendVariable` method solves the following equation for a given
@@ -134,19 +139,19 @@ class DistanceVariable(CellVariable):
     >>> from fipy.variables.cellVariable import CellVariable
     >>> mesh = Grid2D(dx = 1., dy = 1., nx = 2, ny = 2, communicator=serialComm)
     >>> var = DistanceVariable(mesh = mesh, value = (-1., 1., 1., 1.))
-    >>> var.calcDistanceFunction() #doctest: +LSM
+    >>> var.calcDistanceFunction()
     >>> extensionVar = CellVariable(mesh = mesh, value = (-1, .5, 2, -1))
     >>> tmp = 1 / numerix.sqrt(2)
-    >>> print(var.allclose((-tmp / 2, 0.5, 0.5, 0.5 + tmp))) #doctest: +LSM
+    >>> print(var.allclose((-tmp / 2, 0.5, 0.5, 0.5 + tmp)))
     1
-    >>> var.extendVariable(extensionVar, order=1) #doctest: +LSM
-    >>> print(extensionVar.allclose((1.25, .5, 2, 1.25))) #doctest: +LSM
+    >>> var.extendVariable(extensionVar, order=1)
+    >>> print(extensionVar.allclose((1.25, .5, 2, 1.25)))
     1
     >>> mesh = Grid2D(dx = 1., dy = 1., nx = 3, ny = 3, communicator=serialComm)
     >>> var = DistanceVariable(mesh = mesh, value = (-1., 1., 1.,
     ...                                               1., 1., 1.,
     ...                                               1., 1., 1.))
-    >>> var.calcDistanceFunction(order=1) #doctest: +LSM
+    >>> var.calcDistanceFunction(order=1)
     >>> extensionVar = CellVariable(mesh = mesh, value = (-1., .5, -1.,
     ...                                                    2., -1., -1.,
     ...                                                   -1., -1., -1.))
@@ -156,11 +161,11 @@ class DistanceVariable(CellVariable):
     >>> tmp1 = (v1 + v2) / 2 + numerix.sqrt(2. - (v1 - v2)**2) / 2
     >>> tmp2 = tmp1 + 1 / numerix.sqrt(2)
     >>> print(var.allclose((-tmp / 2, 0.5, 1.5, 0.5, 0.5 + tmp,
-    ...                      tmp1, 1.5, tmp1, tmp2))) #doctest: +LSM
+    ...                      tmp1, 1.5, tmp1, tmp2)))
     1
     >>> answer = (1.25, .5, .5, 2, 1.25, 0.9544, 2, 1.5456, 1.25)
-    >>> var.extendVariable(extensionVar, order=1) #doctest: +LSM
-    >>> print(extensionVar.allclose(answer, rtol = 1e-4)) #doctest: +LSM
+    >>> var.extendVariable(extensionVar, order=1)
+    >>> print(extensionVar.allclose(answer, rtol = 1e-4))
     1
 
     Test case for a bug that occurs when initializing the distance
@@ -170,8 +175,8 @@ class DistanceVariable(CellVariable):
 
     >>> mesh = Grid1D(dx = 1., nx = 3, communicator=serialComm)
     >>> var = DistanceVariable(mesh = mesh, value = (-1., 1., -1.))
-    >>> var.calcDistanceFunction() #doctest: +LSM
-    >>> print(var.allclose((-0.5, 0.5, -0.5))) #doctest: +LSM
+    >>> var.calcDistanceFunction()
+    >>> print(var.allclose((-0.5, 0.5, -0.5)))
     1
 
     Testing second order. This example failed with Scikit-fmm.
@@ -223,8 +228,77 @@ class DistanceVariable(CellVariable):
     >>> print(numerix.allclose(var, answer, rtol=1e-9)) #doctest: +SKFMM
     True
 
+    3D grids and unstructured meshes are solved just the same. With a
+    `narrowBandWidth`, the distance is only calculated that far from the
+    zero level set.
+
+    >>> from fipy.meshes import Grid3D
+    >>> mesh = Grid3D(nx=10, ny=10, nz=10, communicator=serialComm)
+    >>> x, y, z = mesh.cellCenters
+    >>> var = DistanceVariable(mesh=mesh, value=x - 5.2)
+    >>> var.calcDistanceFunction(narrowBandWidth=2.)
+    >>> print(numerix.allclose(var, numerix.clip(x - 5.2, -2., 2.)))
+    True
+    >>> extensionVar = CellVariable(mesh=mesh, value=numerix.where(x > 5.2, y, 0.))
+    >>> var.extendVariable(extensionVar)
+    >>> print(numerix.allclose(extensionVar, y))
+    True
+
+    A `DistanceVariable` created with a `narrowBandWidth` only keeps track
+    of the band of cells within that distance of the zero level set.  The
+    interface areas and normals, the `AdvectionTerm` and the
+    reinitialization are then only evaluated in the band, at a cost
+    proportional to the size of the interface, rather than of the mesh.
+    Cells outside the band hold :math:`\pm` `narrowBandWidth`.
+
+    >>> from fipy.meshes import Grid2D
+    >>> mesh = Grid2D(dx=0.05, dy=0.05, nx=40, ny=40, communicator=serialComm)
+    >>> x, y = mesh.cellCenters
+    >>> rad = numerix.sqrt((x - 1.)**2 + (y - 1.)**2) - 0.5
+    >>> bandVar = DistanceVariable(mesh=mesh, value=rad, narrowBandWidth=0.2)
+    >>> bandVar.calcDistanceFunction()
+    >>> band = bandVar._narrowBandCells
+    >>> print(len(band) < mesh.numberOfCells // 3)
+    True
+    >>> print(numerix.allclose(bandVar, numerix.clip(rad, -0.2, 0.2), atol=0.02))
+    True
+
+    The band gives the same interface as the whole mesh
+
+    >>> fullVar = DistanceVariable(mesh=mesh, value=bandVar.value)
+    >>> print(numerix.allclose(bandVar.cellInterfaceAreas, fullVar.cellInterfaceAreas))
+    True
+    >>> print(numerix.allclose(bandVar._cellInterfaceFlag, fullVar._cellInterfaceFlag))
+    True
+    >>> print(numerix.allclose(bandVar._levelSetNormals[..., mesh.cellFaceIDs[..., band].flatten()],
+    ...                        fullVar._levelSetNormals[..., mesh.cellFaceIDs[..., band].flatten()]))
+    True
+
+    Values outside the band are expected to stay as they are, as they do
+    under an `AdvectionTerm`.  As long as the zero level set stays in the
+    core of the band, closer than half of `narrowBandWidth`,
+    reinitialization only visits the band
+
+    >>> bandVar[band] = bandVar[band] - 0.03
+    >>> bandVar.calcDistanceFunction()
+    >>> print(numerix.allclose(bandVar, numerix.clip(rad - 0.03, -0.2, 0.2), atol=0.02))
+    True
+
+    When it leaves the core, the whole mesh is used until the band is
+    rebuilt by the next reinitialization.
+
+    >>> band = bandVar._narrowBandCells
+    >>> bandVar[band] = bandVar[band] - 0.1
+    >>> print(bandVar._narrowBandCells is None)
+    True
+    >>> bandVar.calcDistanceFunction()
+    >>> print(bandVar._narrowBandCells is None)
+    False
+    >>> print(numerix.allclose(bandVar, numerix.clip(rad - 0.13, -0.2, 0.2), atol=0.02))
+    True
+
     """
-    def __init__(self, mesh, name = '', value = 0., unit = None, hasOld = 0):
+    def __init__(self, mesh, name = '', value = 0., unit = None, hasOld = 0, narrowBandWidth=None):
         """
         Creates a `distanceVariable` object.
 
@@ -240,15 +314,20 @@ class DistanceVariable(CellVariable):
             The physical units of the variable
         hasOld : bool
             Whether the variable maintains an old value.
+        narrowBandWidth : float, optional
+            If given, only evaluate the level set within this distance of
+            the zero level set.
 
         """
         CellVariable.__init__(self, mesh, name = name, value = value, unit = unit, hasOld = hasOld)
+        self.narrowBandWidth = narrowBandWidth
+        self._narrowBand = None
         self._markStale()
 
     def _calcValue(self):
         return self._value
 
-    def extendVariable(self, extensionVariable, order=2):
+    def extendVariable(self, extensionVariable, order=2, narrowBandWidth=None):
         """
 
         Calculates the extension of `extensionVariable` from the zero
@@ -258,9 +337,26 @@ class DistanceVariable(CellVariable):
         ----------
         extensionVariable : ~fipy.variables.cellVariable.CellVariable
             The variable to extend from the zero level set.
+        order : {`1`, `2`}
+            The order of accuracy for the extension with `lsmlib` or
+            `skfmm`.  :term:`FiPy`'s own solver is first order.
+        narrowBandWidth : float, optional
+            Only extend `extensionVariable` this far from the zero level
+            set.  Defaults to the `narrowBandWidth` of this variable.
         """
 
-        dx, shape = self.getLSMshape()
+        if narrowBandWidth is None:
+            narrowBandWidth = self.narrowBandWidth
+
+        gridShape = self._externalGridShape
+        if gridShape is None or narrowBandWidth is not None:
+            extensionVariable[:] = self._groupMarchingMethod.extend(phi=self._value,
+                                                                    extension=extensionVariable.value,
+                                                                    narrowBandWidth=narrowBandWidth,
+                                                                    cells=self._narrowBandCells)
+            return
+
+        dx, shape = gridShape
         extensionValue = numerix.reshape(extensionVariable.value, shape)
         phi = numerix.reshape(self._value, shape)
 
@@ -268,29 +364,97 @@ class DistanceVariable(CellVariable):
             from pylsmlib import computeExtensionFields as extension_velocities
         elif LSM_SOLVER == 'skfmm':
             from skfmm import extension_velocities
-        else:
-            raise Exception("Neither `lsmlib` nor `skfmm` can be found on the $PATH")
 
         tmp, extensionValue = extension_velocities(phi, extensionValue, ext_mask=phi < 0., dx=dx, order=order)
         extensionVariable[:] = extensionValue.flatten()
 
     def getLSMshape(self):
+        gridShape = self._gridShape
+        if gridShape is None:
+            raise Exception("Non grid meshes can not be used for solving the FMM.")
+
+        return gridShape
+
+    @property
+    def _gridShape(self):
+        """Spacing and shape of the mesh, if it is a uniformly spaced grid
+
+        Other meshes, even with `nx` and `ny`, cannot be reshaped to
+        the array of a grid
+
+            >>> from fipy.meshes import Grid2D, Tri2D, SkewedGrid2D, PeriodicGrid1D
+            >>> print(DistanceVariable(mesh=Grid2D(nx=3, ny=2, dx=0.5, dy=0.25))._gridShape)
+            ((0.25, 0.5), (2, 3))
+            >>> print(DistanceVariable(mesh=Grid2D(dx=(1., 2.), dy=(1.,)))._gridShape)
+            None
+            >>> print(DistanceVariable(mesh=Tri2D(nx=3, ny=3))._gridShape)
+            None
+            >>> print(DistanceVariable(mesh=SkewedGrid2D(nx=3, ny=3))._gridShape)
+            None
+
+        nor are the distances on a periodic grid those of an array
+
+            >>> print(DistanceVariable(mesh=PeriodicGrid1D(nx=10))._gridShape)
+            None
+
+        such meshes are always solved by :term:`FiPy`
+
+            >>> import fipy.variables.distanceVariable as distanceVariable
+            >>> solver, distanceVariable.LSM_SOLVER = distanceVariable.LSM_SOLVER, 'skfmm'
+            >>> mesh = Tri2D(nx=3, ny=3)
+            >>> phi = mesh.cellCenters[0].value - 1.5
+            >>> var = DistanceVariable(mesh=mesh, value=phi)
+            >>> var.calcDistanceFunction()
+            >>> print(numerix.allclose(var, var._groupMarchingMethod.distance(phi=phi)))
+            True
+            >>> distanceVariable.LSM_SOLVER = solver
+        """
+        from fipy.meshes.uniformGrid import UniformGrid
+        from fipy.meshes.nonUniformGrid1D import NonUniformGrid1D
+        from fipy.meshes.nonUniformGrid2D import NonUniformGrid2D
+        from fipy.meshes.nonUniformGrid3D import NonUniformGrid3D
+        from fipy.meshes.periodicGrid1D import PeriodicGrid1D
+        from fipy.meshes.periodicGrid2D import _BasePeriodicGrid2D
+        from fipy.meshes.periodicGrid3D import _BasePeriodicGrid3D
+
         mesh = self.mesh
 
+        if (not isinstance(mesh, (UniformGrid, NonUniformGrid1D, NonUniformGrid2D, NonUniformGrid3D))
+            or isinstance(mesh, (PeriodicGrid1D, _BasePeriodicGrid2D, _BasePeriodicGrid3D))):
+            return None
+
         if hasattr(mesh, 'nz'):
-            raise Exception("3D meshes not yet implemented")
+            dx = (mesh.dz, mesh.dy, mesh.dx)
+            shape = (mesh.nz, mesh.ny, mesh.nx)
         elif hasattr(mesh, 'ny'):
             dx = (mesh.dy, mesh.dx)
             shape = (mesh.ny, mesh.nx)
-        elif hasattr(mesh, 'nx'):
-            dx = (mesh.dx,)
-            shape = mesh.shape
         else:
-            raise Exception("Non grid meshes can not be used for solving the FMM.")
+            dx = (mesh.dx,)
+            shape = (mesh.nx,)
+
+        if (numerix.prod(shape) != mesh.numberOfCells
+            or any(numerix.size(d) != 1 for d in dx)):
+            return None
 
         return dx, shape
 
-    def calcDistanceFunction(self, order=2):
+    @property
+    def _externalGridShape(self):
+        """Spacing and shape of the mesh, if `lsmlib` or `skfmm` can solve on it"""
+        if LSM_SOLVER in ('lsmlib', 'skfmm'):
+            return self._gridShape
+        else:
+            return None
+
+    @property
+    def _groupMarchingMethod(self):
+        if not hasattr(self, "_groupMarchingMethodCache"):
+            from fipy.tools.eikonal import _GroupMarchingMethod
+            self._groupMarchingMethodCache = _GroupMarchingMethod(self.mesh)
+        return self._groupMarchingMethodCache
+
+    def calcDistanceFunction(self, order=2, narrowBandWidth=None):
         """
         Calculates the `distanceVariable` as a distance function.
 
@@ -298,20 +462,124 @@ class DistanceVariable(CellVariable):
         ----------
         order : {`1`, `2`}
             The order of accuracy for the distance function calculation
+            with `lsmlib` or `skfmm`.  :term:`FiPy`'s own solver is first
+            order.
+        narrowBandWidth : float, optional
+            Only calculate the distance function this far from the zero
+            level set.  Further cells are set to :math:`\pm`
+            `narrowBandWidth`.  Defaults to the `narrowBandWidth` of this
+            variable.
         """
 
-        dx, shape = self.getLSMshape()
+        if self.narrowBandWidth is not None:
+            self._calcNarrowBand(narrowBandWidth=narrowBandWidth or self.narrowBandWidth)
+            return
+
+        gridShape = self._externalGridShape
+        if gridShape is None:
+            self._value = self._groupMarchingMethod.distance(phi=self._value,
+                                                             narrowBandWidth=narrowBandWidth)
+            self._markFresh()
+            return
+
+        dx, shape = gridShape
 
         if LSM_SOLVER == 'lsmlib':
             from pylsmlib import distance
         elif LSM_SOLVER == 'skfmm':
             from skfmm import distance
+
+        value = distance(numerix.reshape(self._value, shape), dx=dx, order=order).flatten()
+        if narrowBandWidth is not None:
+            value = numerix.clip(value, -narrowBandWidth, narrowBandWidth)
+        self._value = value
+        self._markFresh()
+
+    def _calcNarrowBand(self, narrowBandWidth):
+        """Reinitialize the distance function in the narrow band only
+
+        While the zero level set is in the core of the band, only the cells
+        of the band are visited. Otherwise, the band is rebuilt from the
+        whole mesh.
+        """
+        band = self._narrowBandCells
+        cells, distance = self._groupMarchingMethod.narrowBandDistance(phi=self._value,
+                                                                        narrowBandWidth=narrowBandWidth,
+                                                                        cells=band)
+        if band is None:
+            value = numerix.sign(self._value) * narrowBandWidth
         else:
-            raise Exception("Neither `lsmlib` nor `skfmm` can be found on the $PATH")
+            value = numerix.asarray(self._value, dtype=float)
+            value[band] = numerix.sign(value[band]) * narrowBandWidth
+        value[cells] = distance
 
-        self._value = distance(numerix.reshape(self._value, shape), dx=dx, order=order).flatten()
+        self._value = value
+        self._narrowBand = (cells, abs(distance) < narrowBandWidth / 2.)
         self._markFresh()
 
+    @property
+    def _narrowBandCells(self):
+        """Cells of the narrow band, or `None` if the whole mesh is needed
+
+        The band is only used while every cell that the zero level set
+        crosses is in its core, where the distance was less than half of
+        `narrowBandWidth` when the band was built.
+        """
+        if self._narrowBand is None:
+            return None
+
+        cells, core = self._narrowBand
+        phi = numerix.asarray(self._value)
+        neighbors = self._groupMarchingMethod._neighbors[cells]
+        crossed = ((phi[cells] == 0)
+                   | ((neighbors >= 0)
+                      & (phi[cells, numerix.newaxis] * phi[neighbors] < 0)).any(axis=-1))
+        if not crossed.any() or (crossed & ~core).any():
+            return None
+
+        return cells
+
+    def _narrowBandFaces(self, cells):
+        """Faces of `cells`"""
+        faces = numerix.unique(MA.filled(self.mesh.cellFaceIDs[..., cells], -1))
+        return faces[faces >= 0]
+
+    def _levelSetNormalsAt(self, faces):
+        """`_levelSetNormals` at `faces` only"""
+        mesh = self.mesh
+        id1, id2 = [ids[faces] for ids in mesh._adjacentCellIDs]
+        cells, inverse = numerix.unique(numerix.concatenate((id1, id2)), return_inverse=True)
+        cellGrad = mesh._cellGradientsAt(self._value, cells)
+        grad1 = cellGrad[..., inverse[:len(faces)]]
+        grad2 = cellGrad[..., inverse[len(faces):]]
+        faceGrad = (grad2 - grad1) * mesh._faceToCellDistanceRatio[faces] + grad1
+
+        faceGradMag = numerix.sqrt(numerix.sum(faceGrad**2, axis=0))
+        faceGradMag = numerix.where(faceGradMag > 1e-10,
+                                    faceGradMag,
+                                    1e-10)
+
+        faceGrad[..., numerix.asarray(mesh.exteriorFaces)[faces]] = 0.
+
+        return faceGrad / faceGradMag
+
+    def _interfaceFlagAt(self, faces):
+        """`_interfaceFlag` at `faces` only"""
+        phi = numerix.asarray(self._value)
+        id1, id2 = [ids[faces] for ids in self.mesh._adjacentCellIDs]
+        return numerix.where(phi[id1] * phi[id2] < 0, 1, 0)
+
+    def _cellInterfaceNormalsAt(self, cells):
+        """`_cellInterfaceNormals` at `cells` only, with missing faces set to zero"""
+        cellFaceIDs = self.mesh.cellFaceIDs[..., cells]
+        faces, inverse = numerix.unique(MA.filled(cellFaceIDs, 0), return_inverse=True)
+        inverse = numerix.reshape(inverse, cellFaceIDs.shape)
+        interfaceNormals = numerix.where(self._interfaceFlagAt(faces),
+                                         self._levelSetNormalsAt(faces), 0)[..., inverse]
+
+        inside = (numerix.asarray(self._value)[cells] >= 0) & ~MA.getmaskarray(cellFaceIDs)
+        return numerix.where(inside, interfaceNormals, 0)
+
     @property
     def cellInterfaceAreas(self):
         """
@@ -398,6 +666,12 @@ class DistanceVariable(CellVariable):
 
         dim = self.mesh.dim
 
+        cells = self._narrowBandCells
+        if cells is not None:
+            normals = numerix.zeros((dim, self.mesh._maxFacesPerCell, self.mesh.numberOfCells))
+            normals[..., cells] = self._cellInterfaceNormalsAt(cells)
+            return normals
+
         valueOverFaces = numerix.repeat(self._cellValueOverFaces[numerix.newaxis, ...], dim, axis=0)
         cellFaceIDs = self.mesh.cellFaceIDs
         if cellFaceIDs.shape[-1] > 0:
@@ -428,6 +702,15 @@ class DistanceVariable(CellVariable):
         """
 
         M = self.mesh.dim
+
+        cells = self._narrowBandCells
+        if cells is not None:
+            faces = self._narrowBandFaces(cells)
+            normals = numerix.zeros((M, self.mesh.numberOfFaces))
+            normals[..., faces] = numerix.where(self._interfaceFlagAt(faces),
+                                                self._levelSetNormalsAt(faces), 0)
+            return normals
+
         interfaceFlag = numerix.repeat(self._interfaceFlag[numerix.newaxis, ...], M, axis=0)
         return numerix.where(interfaceFlag, self._levelSetNormals, 0)
 
@@ -448,6 +731,13 @@ class DistanceVariable(CellVariable):
            True
 
         """
+        cells = self._narrowBandCells
+        if cells is not None:
+            faces = self._narrowBandFaces(cells)
+            flag = numerix.zeros((self.mesh.numberOfFaces,), dtype=int)
+            flag[faces] = self._interfaceFlagAt(faces)
+            return flag
+
         adjacentCellIDs = self.mesh._adjacentCellIDs
         val0 = numerix.take(numerix.array(self._value), adjacentCellIDs[0])
         val1 = numerix.take(numerix.array(self._value), adjacentCellIDs[1])
@@ -517,6 +807,13 @@ class DistanceVariable(CellVariable):
            True
         """
 
+        cells = self._narrowBandCells
+        if cells is not None:
+            faces = self._narrowBandFaces(cells)
+            normals = numerix.zeros((self.mesh.dim, self.mesh.numberOfFaces))
+            normals[..., faces] = self._levelSetNormalsAt(faces)
+            return normals
+
         faceGrad = self.grad.arithmeticFaceValue
         faceGradMag = numerix.array(faceGrad.mag)
         faceGradMag = numerix.where(faceGradMag > 1e-10,
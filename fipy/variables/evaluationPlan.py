@@ -0,0 +1,456 @@
+"""Fused evaluation of `_OperatorVariable` expression trees
+
+Arithmetic on :class:`~fipy.variables.variable.Variable` objects builds a
+tree of lazily evaluated operator variables. Evaluated node by node, each
+operation allocates a temporary array for its result. With the
+:option:`--fuse` flag (or the :envvar:`FIPY_FUSE` environment variable), the
+uncached part of such a tree is instead flattened into a single
+`_EvaluationPlan` that calls the underlying :class:`~numpy.ufunc` objects
+with ``out=`` arguments, recycling a small set of preallocated buffers.
+With :option:`--fuse-numexpr` (or :envvar:`FIPY_FUSE` set to ``numexpr``)
+floating point expressions are handed to :mod:`numexpr` as a single string,
+when it is available.
+
+Operations that cannot be expressed as a ufunc, as well as cached
+variables, constrained variables and variables with physical units, are
+evaluated normally and enter the plan as leaves.
+"""
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+from builtins import zip
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+import dis
+import os
+import sys
+
+from fipy.tools import numerix
+
+_args = [s.lower() for s in sys.argv[1:]]
+if '--fuse-numexpr' in _args:
+    fuseMode = 'numexpr'
+elif '--fuse' in _args:
+    fuseMode = 'numpy'
+elif 'FIPY_FUSE' in os.environ:
+    if os.environ['FIPY_FUSE'].lower() == 'numexpr':
+        fuseMode = 'numexpr'
+    else:
+        fuseMode = 'numpy'
+else:
+    fuseMode = None
+del _args
+
+doFuse = fuseMode is not None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+_binarySymbols = {
+    '+': numerix.add,
+    '-': numerix.subtract,
+    '*': numerix.multiply,
+    '/': numerix.true_divide,
+    '//': numerix.floor_divide,
+    '**': numerix.power,
+    '%': numerix.remainder,
+    '&': numerix.bitwise_and,
+    '|': numerix.bitwise_or,
+    '^': numerix.bitwise_xor,
+    '<': numerix.less,
+    '<=': numerix.less_equal,
+    '==': numerix.equal,
+    '!=': numerix.not_equal,
+    '>': numerix.greater,
+    '>=': numerix.greater_equal
+}
+
+# opcodes of Python < 3.11
+_binaryOpcodes = {
+    'BINARY_ADD': '+',
+    'BINARY_SUBTRACT': '-',
+    'BINARY_MULTIPLY': '*',
+    'BINARY_TRUE_DIVIDE': '/',
+    'BINARY_FLOOR_DIVIDE': '//',
+    'BINARY_POWER': '**',
+    'BINARY_MODULO': '%',
+    'BINARY_AND': '&',
+    'BINARY_OR': '|',
+    'BINARY_XOR': '^'
+}
+
+_unaryOpcodes = {
+    'UNARY_NEGATIVE': numerix.negative,
+    'UNARY_POSITIVE': numerix.positive,
+    'UNARY_INVERT': numerix.invert
+}
+
+_builtins = {
+    'pow': numerix.power,
+    'abs': numerix.absolute
+}
+
+# instructions that do not affect the meaning of a simple function
+_ignoredOpnames = ('RESUME', 'PRECALL', 'PUSH_NULL', 'COPY_FREE_VARS',
+                   'NOP', 'CACHE', 'KW_NAMES')
+
+_callOpnames = ('CALL', 'CALL_FUNCTION', 'CALL_METHOD')
+
+_ufuncs = {}
+
+def _ufuncFromFunction(op):
+    """Identify the ufunc applied by a simple function, such as those
+    built by the arithmetic operators of `Variable`
+
+        >>> print(_ufuncFromFunction(lambda a, b: b - a))
+        (<ufunc 'subtract'>, (1, 0))
+        >>> print(_ufuncFromFunction(lambda a: -a))
+        (<ufunc 'negative'>, (0,))
+        >>> print(_ufuncFromFunction(lambda a, b: numerix.fmod(a, b)))
+        (<ufunc 'fmod'>, (0, 1))
+        >>> print(_ufuncFromFunction(lambda a, b: pow(b, a)))
+        (<ufunc 'power'>, (1, 0))
+        >>> print(_ufuncFromFunction(lambda a, b: a <= b))
+        (<ufunc 'less_equal'>, (0, 1))
+        >>> print(_ufuncFromFunction(lambda a: a.any(axis=0)))
+        None
+    """
+    code = getattr(op, '__code__', None)
+    if code is None:
+        return None
+
+    if code not in _ufuncs:
+        _ufuncs[code] = _disassemble(code)
+
+    return _ufuncs[code]
+
+def _disassemble(code):
+    args = code.co_varnames[:code.co_argcount]
+    instructions = [ins for ins in dis.get_instructions(code)
+                    if ins.opname not in _ignoredOpnames]
+
+    if len(instructions) < 2 or instructions[-1].opname != 'RETURN_VALUE':
+        return None
+    instructions = instructions[:-1]
+
+    ufunc = None
+    if instructions[0].opname == 'LOAD_GLOBAL':
+        # `numerix.func(...)` or `builtin(...)`
+        name = instructions.pop(0).argval
+        if instructions and instructions[0].opname in ('LOAD_ATTR', 'LOAD_METHOD'):
+            attr = instructions.pop(0).argval
+            if name == 'numerix':
+                ufunc = getattr(numerix, attr, None)
+        else:
+            ufunc = _builtins.get(name)
+
+        if not instructions or instructions[-1].opname not in _callOpnames:
+            return None
+        instructions = instructions[:-1]
+    else:
+        last = instructions.pop()
+        if last.opname == 'BINARY_OP':
+            ufunc = _binarySymbols.get(last.argrepr.rstrip('='))
+        elif last.opname in _binaryOpcodes:
+            ufunc = _binarySymbols.get(_binaryOpcodes[last.opname])
+        elif last.opname == 'COMPARE_OP':
+            ufunc = _binarySymbols.get(last.argval)
+        elif last.opname in _unaryOpcodes:
+            ufunc = _unaryOpcodes[last.opname]
+
+    if (not isinstance(ufunc, numerix.ufunc)
+        or len(instructions) != ufunc.nin
+        or any(ins.opname != 'LOAD_FAST' or ins.argval not in args
+               for ins in instructions)):
+        return None
+
+    return ufunc, tuple(args.index(ins.argval) for ins in instructions)
+
+# exponents for which the `**` operator of NumPy substitutes cheaper ufuncs
+_scalarPowers = {
+    2: numerix.square,
+    0.5: numerix.sqrt,
+    1: numerix.positive,
+    -1: numerix.reciprocal
+}
+
+def _power(base, exponent, out=None):
+    """`numerix.power`, taking the same shortcuts as the `**` operator
+
+        >>> x = numerix.array((1., 2., 3.))
+        >>> print(_power(x, numerix.array(2)))
+        [ 1.  4.  9.]
+        >>> print(_power(x, numerix.array(-1)))
+        [ 1.          0.5         0.33333333]
+        >>> print(_power(numerix.array((1, 2, 3)), numerix.array(2)))
+        [1 4 9]
+    """
+    ufunc = None
+    if (numerix.shape(exponent) == ()
+        and numerix.issubdtype(getattr(base, "dtype", type(base)), numerix.inexact)):
+        ufunc = _scalarPowers.get(numerix.asarray(exponent).item())
+
+    if ufunc is None:
+        return numerix.power(base, exponent, out=out)
+    else:
+        return ufunc(base, out=out)
+
+_numexprFunctions = {
+    numerix.add: '({0} + {1})',
+    numerix.subtract: '({0} - {1})',
+    numerix.multiply: '({0} * {1})',
+    numerix.true_divide: '({0} / {1})',
+    numerix.power: '({0} ** {1})',
+    numerix.negative: '(-{0})',
+    numerix.absolute: 'abs({0})',
+    numerix.fabs: 'abs({0})',
+    numerix.less: '({0} < {1})',
+    numerix.less_equal: '({0} <= {1})',
+    numerix.equal: '({0} == {1})',
+    numerix.not_equal: '({0} != {1})',
+    numerix.greater: '({0} > {1})',
+    numerix.greater_equal: '({0} >= {1})',
+    numerix.arctan2: 'arctan2({0}, {1})'
+}
+for _name in ('sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan',
+              'sinh', 'cosh', 'tanh', 'arcsinh', 'arccosh', 'arctanh',
+              'exp', 'expm1', 'log', 'log10', 'log1p', 'sqrt'):
+    _numexprFunctions[getattr(numerix, _name)] = _name + '({0})'
+del _name
+
+class _EvaluationPlan(object):
+    """Flattened evaluation of the uncached part of an operator tree
+
+    Used when evaluating `_OperatorVariable` objects with :option:`--fuse`.
+
+    >>> from fipy import Grid1D, CellVariable
+    >>> from fipy.variables import evaluationPlan
+    >>> mesh = Grid1D(nx=5)
+    >>> a = CellVariable(mesh=mesh, value=mesh.x)
+    >>> b = CellVariable(mesh=mesh, value=2.)
+    >>> expr = (a * b + 1) / (b - a) - numerix.sin(a) ** 2
+    >>> plan = _EvaluationPlan(expr)
+    >>> print(len(plan.leaves))
+    4
+    >>> print(len(plan.steps))
+    7
+
+    Only two arrays are needed to hold the six intermediate results
+
+    >>> ordinary = expr.value.copy()
+    >>> print(numerix.allclose(plan.evaluate(), ordinary))
+    True
+    >>> print(numerix.allclose(plan.evaluate(), ordinary))
+    True
+    >>> print(len(set(id(buf) for buf in plan.buffers if buf is not None)))
+    2
+
+    When fused evaluation is enabled, intermediate variables are not
+    evaluated, but changes to the leaves still reach the result
+
+    >>> expr.cacheMe()
+    >>> evaluationPlan.doFuse = True
+    >>> print(numerix.allclose(expr, ordinary))
+    True
+    >>> a.value = a + 0.25
+    >>> fused = expr.value
+    >>> evaluationPlan.doFuse = False
+    >>> print(numerix.allclose(fused, (a * b + 1) / (b - a) - numerix.sin(a) ** 2))
+    True
+    >>> evaluationPlan.doFuse = fuseMode is not None
+    """
+
+    def __init__(self, root):
+        """
+        Parameters
+        ----------
+        root : ~fipy.variables.operatorVariable._OperatorVariable
+            The variable to evaluate.
+        """
+        self.leaves = []
+        self.internals = []
+        self.steps = []
+        self.expression = None
+        self.signature = None
+        self.buffers = None
+
+        if self._ufunc(root) is None:
+            return
+
+        operations = []
+        expressions = []
+        self._visit(root, operations, expressions, tags={}, isRoot=True)
+
+        numberOfLeaves = len(self.leaves)
+
+        def _slot(tag):
+            kind, index = tag
+            if kind == "leaf":
+                return index
+            else:
+                return numberOfLeaves + index
+
+        self.steps = [(_power if ufunc is numerix.power else ufunc,
+                       [_slot(tag) for tag in operands], numberOfLeaves + i)
+                      for i, (ufunc, operands) in enumerate(operations)]
+
+        self.expression = expressions[-1]
+
+    @staticmethod
+    def _ufunc(var):
+        """The ufunc applied by `var` and the order of its operands, if fusible"""
+        from fipy.variables.variable import Variable
+        if not (getattr(var, '_fusible', False) and var.canInline
+                and all(isinstance(v, Variable) for v in var.var)):
+            return None
+        elif isinstance(var.op, numerix.ufunc):
+            if var.op.nout != 1 or var.op.nin != len(var.var):
+                return None
+            return var.op, tuple(range(len(var.var)))
+        else:
+            return _ufuncFromFunction(var.op)
+
+    def _visit(self, var, operations, expressions, tags, isRoot=False):
+        """Return the tag of the leaf or operation that produces `var`"""
+        if id(var) in tags:
+            return tags[id(var)]
+
+        ufunc = self._ufunc(var)
+        if ufunc is not None and (isRoot
+                                  or (not var._isCached()
+                                      and len(var.constraints) == 0)):
+            ufunc, order = ufunc
+            operands = [self._visit(var.var[i], operations, expressions, tags)
+                        for i in order]
+            arguments = [self._expression(tag, expressions) for tag in operands]
+            template = _numexprFunctions.get(ufunc)
+            if template is None or None in arguments:
+                expressions.append(None)
+            else:
+                expressions.append(template.format(*arguments))
+            if not isRoot:
+                self.internals.append(var)
+            operations.append((ufunc, operands))
+            tag = ("operation", len(operations) - 1)
+        else:
+            self.leaves.append(var)
+            tag = ("leaf", len(self.leaves) - 1)
+
+        tags[id(var)] = tag
+        return tag
+
+    def _expression(self, tag, expressions):
+        """The :mod:`numexpr` representation of a leaf or operation"""
+        kind, index = tag
+        if kind == "operation":
+            return expressions[index]
+
+        from fipy.variables.constant import _Constant
+        leaf = self.leaves[index]
+        if isinstance(leaf, _Constant) and leaf.shape == ():
+            # literal scalars allow numexpr to simplify, e.g., `x**2`
+            value = numerix.asarray(leaf.value).item()
+            if type(value) in (type(1), type(1.)) and numerix.isfinite(value):
+                return repr(value)
+
+        return "v%d" % index
+
+    @property
+    def isValid(self):
+        """Whether intermediate variables are still uncached"""
+        return all(not var._isCached() for var in self.internals)
+
+    def evaluate(self):
+        """Compute the value of the root of the tree
+
+        Returns
+        -------
+        ndarray or None
+            `None` if the tree, or the values of its leaves, are unsuitable
+            for fused evaluation.
+        """
+        if len(self.steps) == 0:
+            return None
+
+        values = [leaf.value for leaf in self.leaves]
+        if any(type(value) is not numerix.ndarray for value in values):
+            return None
+
+        signature = [(value.shape, value.dtype) for value in values]
+        if signature != self.signature:
+            result = self._plan(values)
+            self.signature = signature
+        elif (fuseMode == 'numexpr' and numexpr is not None
+              and self.expression is not None
+              and all(value.dtype.kind == 'f'
+                      or (value.dtype.kind == 'i' and value.shape == ())
+                      for value in values)):
+            # integer scalars, such as those of `_Constant` exponents,
+            # are promoted by numexpr just as they are by NumPy
+            local_dict = dict(("v%d" % i, value) for i, value in enumerate(values))
+            result = numexpr.evaluate(self.expression, local_dict=local_dict)
+            if result.shape == ():
+                # match the scalar returned by a ufunc
+                result = result[()]
+        else:
+            result = self._run(values)
+
+        # intermediates are never evaluated, but must not remain stale,
+        # or they would stop later changes from reaching the root. Any
+        # value they hold is out of date and must be discarded.
+        for var in self.internals:
+            var._value = None
+            var.stale = 0
+
+        return result
+
+    def _run(self, values):
+        registers = values + [None] * len(self.steps)
+        for (ufunc, operands, slot), out in zip(self.steps, self.buffers):
+            args = [registers[i] for i in operands]
+            registers[slot] = ufunc(*args, out=out)
+
+        return registers[-1]
+
+    def _plan(self, values):
+        """Evaluate without buffers, then assign buffers to the intermediates
+
+        Buffers are recycled as soon as the intermediate they hold has
+        been consumed by its last operation.
+        """
+        registers = values + [None] * len(self.steps)
+        lastUse = {}
+        for step, (ufunc, operands, slot) in enumerate(self.steps):
+            registers[slot] = ufunc(*[registers[i] for i in operands])
+            for i in operands:
+                lastUse[i] = step
+
+        numberOfLeaves = len(values)
+        free = {}
+        self.buffers = []
+        for step, (ufunc, operands, slot) in enumerate(self.steps[:-1]):
+            for i in set(operands):
+                if i >= numberOfLeaves and lastUse[i] == step:
+                    buf = self.buffers[i - numberOfLeaves]
+                    free.setdefault((buf.shape, buf.dtype), []).append(buf)
+            value = registers[slot]
+            pool = free.get((value.shape, value.dtype), [])
+            if pool:
+                self.buffers.append(pool.pop())
+            else:
+                self.buffers.append(numerix.empty(value.shape, value.dtype))
+        # the result is handed to the caller and must not be recycled
+        self.buffers.append(None)
+
+        return registers[-1]
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
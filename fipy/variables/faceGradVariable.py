@@ -7,6 +7,7 @@ __all__ = []
 from fipy.variables.faceVariable import FaceVariable
 from fipy.tools import numerix
 from fipy.tools import inline
+from fipy.variables import gradientOperators
 
 class _FaceGradVariable(FaceVariable):
     """
@@ -42,11 +43,20 @@ class _FaceGradVariable(FaceVariable):
         self.var = self._requires(var)
 
     def _calcValue(self):
-        if inline.doInline and self.var.rank == 0:
+        if gradientOperators._canPrecompute(self.mesh):
+            return self._calcValuePrecomputed()
+        elif inline.doInline and self.var.rank == 0:
             return self._calcValueInline()
         else:
             return self._calcValueNoInline()
 
+    def _calcValuePrecomputed(self):
+        fromCells, fromFaces = gradientOperators._faceGradientOperators(self.mesh)
+        D = self.mesh.dim
+
+        return (gradientOperators._apply(fromCells, self.var.numericValue, D)
+                + gradientOperators._apply(fromFaces, self.var.faceValue.numericValue, D))
+
     def _calcValueInline(self):
 
         id1, id2 = self.mesh._adjacentCellIDs
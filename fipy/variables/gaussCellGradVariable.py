@@ -7,6 +7,7 @@ __all__ = []
 from fipy.variables.cellVariable import CellVariable
 from fipy.tools import numerix
 from fipy.tools import inline
+from fipy.variables import gradientOperators
 from fipy.variables.faceGradContributionsVariable import _FaceGradContributions
 
 class _GaussCellGradVariable(CellVariable):
@@ -68,24 +69,25 @@ class _GaussCellGradVariable(CellVariable):
 
         return self._makeValue(value = val)
 
-    def _calcValueNoInline(self, N, M, ids, orientations, volumes):
-        contributions = numerix.take(self.faceGradientContributions, ids, axis=-1)
-        grad = numerix.array(numerix.sum(orientations * contributions, -2))
-        return grad / volumes
+    def _calcValueNoInline(self, volumes):
+        return self.mesh._sumOverCellFaces(self.faceGradientContributions.numericValue) / volumes
+
+    def _calcValuePrecomputed(self):
+        return gradientOperators._apply(gradientOperators._cellGradientOperator(self.mesh),
+                                        self.var.arithmeticFaceValue.numericValue,
+                                        self.mesh.dim)
 
     def _calcValue(self):
-        if inline.doInline and self.var.rank == 0:
+        if gradientOperators._canPrecompute(self.mesh):
+            return self._calcValuePrecomputed()
+        elif inline.doInline and self.var.rank == 0:
             return self._calcValueInline(N=self.mesh.numberOfCells,
                                          M=self.mesh._maxFacesPerCell,
                                          ids=self.mesh.cellFaceIDs,
                                          orientations=self.mesh._cellToFaceOrientations,
                                          volumes=self.mesh.cellVolumes)
         else:
-            return self._calcValueNoInline(N=self.mesh.numberOfCells,
-                                           M=self.mesh._maxFacesPerCell,
-                                           ids=self.mesh.cellFaceIDs,
-                                           orientations=self.mesh._cellToFaceOrientations,
-                                           volumes=self.mesh.cellVolumes)
+            return self._calcValueNoInline(volumes=self.mesh.cellVolumes)
 
 
 def _test():
@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
+from fipy.tools import numerix
 from fipy.tools.numerix import random, sqrt
 from fipy.variables.noiseVariable import NoiseVariable
 
@@ -106,7 +107,7 @@ class GaussianNoiseVariable(NoiseVariable):
       :alt: histogram of random values with a Gaussian distribution
 
     """
-    def __init__(self, mesh, name = '', mean = 0., variance = 1., hasOld = 0):
+    def __init__(self, mesh, name = '', mean = 0., variance = 1., hasOld = 0, seed = None):
         """
         Parameters
         ----------
@@ -116,10 +117,14 @@ class GaussianNoiseVariable(NoiseVariable):
             The mean of the noise distribution, :math:`\mu`.
         variance : float
             The variance of the noise distribution, :math:`\sigma^2`.
+        seed : int, optional
+            Seed of a counter-based generator, which draws the same noise
+            however the mesh is partitioned.  See
+            :class:`~fipy.variables.noiseVariable.NoiseVariable`.
         """
         self.mean = mean
         self.variance = variance
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
 
     def parallelRandom(self):
 
@@ -134,6 +139,10 @@ class GaussianNoiseVariable(NoiseVariable):
         else:
             return None
 
+    def counterRandom(self, generator):
+        return generator.normal(numerix.array(self.mean),
+                                sqrt(numerix.array(self.variance)))
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
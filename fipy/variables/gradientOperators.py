@@ -0,0 +1,172 @@
+"""Precomputed sparse gradient operators
+
+The Gauss cell gradient and the face gradient of a
+:class:`~fipy.variables.cellVariable.CellVariable` are linear in its cell
+and face values, with coefficients that depend only on the geometry of the
+mesh. With the :option:`--precompute-gradients` flag (or the
+:envvar:`FIPY_PRECOMPUTE_GRADIENTS` environment variable), these
+coefficients are assembled once per mesh into :mod:`scipy.sparse` matrices,
+and every evaluation of `var.grad` or `var.faceGrad` becomes a sparse
+matrix-vector product, rather than a sequence of gathers and reductions
+that each allocate a temporary array.
+
+    >>> from fipy import *
+    >>> from fipy.variables import gradientOperators
+    >>> m = Grid2D(dx=(1., 2., 4.), dy=(.5, 1.))
+    >>> x, y = m.cellCenters
+    >>> v = CellVariable(mesh=m, value=x**2 * y)
+    >>> v.constrain(3., where=m.facesLeft)
+    >>> grad, faceGrad = v.grad.globalValue, v.faceGrad.globalValue
+
+    >>> gradientOperators.doPrecompute = True
+    >>> w = CellVariable(mesh=m, value=x**2 * y)
+    >>> w.constrain(3., where=m.facesLeft)
+    >>> print(numerix.allclose(w.grad, grad))
+    True
+    >>> print(numerix.allclose(w.faceGrad, faceGrad))
+    True
+
+The operators are shared by every variable on the mesh
+
+    >>> operators = m._gradientOperators
+    >>> u = CellVariable(mesh=m, elementshape=(2,), value=(x, y))
+    >>> print(numerix.allclose(u.grad[:, 0], CellVariable(mesh=m, value=x).grad))
+    True
+    >>> print(m._gradientOperators is operators)
+    True
+
+    >>> gradientOperators.doPrecompute = _precompute
+"""
+from __future__ import division
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+import os
+import sys
+
+from fipy.tools import numerix
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+if '--precompute-gradients' in [s.lower() for s in sys.argv[1:]]:
+    _precompute = True
+else:
+    _precompute = 'FIPY_PRECOMPUTE_GRADIENTS' in os.environ
+
+doPrecompute = _precompute
+
+def _canPrecompute(mesh):
+    """Whether the gradients on `mesh` can be evaluated as sparse products
+
+    Meshes with physical dimensions are left to the general calculation.
+    """
+    return (doPrecompute
+            and sparse is not None
+            and not numerix._isPhysical(mesh.cellVolumes))
+
+def _operators(mesh):
+    """Cache of the gradient operators of `mesh`"""
+    if not hasattr(mesh, "_gradientOperators"):
+        mesh._gradientOperators = {}
+
+    return mesh._gradientOperators
+
+def _selection(rows, cols, shape):
+    return sparse.csr_matrix((numerix.ones(len(rows)), (rows, cols)), shape=shape)
+
+def _cellGradientOperator(mesh):
+    """Sparse matrix of the Gauss gradient of cell values from face values
+
+    Rows are ordered by direction, then by cell.
+    """
+    operators = _operators(mesh)
+    if "cell" not in operators:
+        D = mesh.dim
+        N = mesh.numberOfCells
+        F = mesh.numberOfFaces
+
+        ids = numerix.MA.filled(mesh.cellFaceIDs, 0)
+        orientations = numerix.MA.filled(mesh._cellToFaceOrientations, 0)
+        volumes = numerix.array(mesh.cellVolumes)
+        areaProjections = numerix.array(mesh._areaProjections)
+
+        cells = numerix.resize(numerix.arange(N), ids.shape)
+        weights = orientations / volumes
+        rows = numerix.concatenate([(d * N + cells).ravel() for d in range(D)])
+        cols = numerix.concatenate([ids.ravel()] * D)
+        data = numerix.concatenate([(weights * areaProjections[d][ids]).ravel()
+                                    for d in range(D)])
+
+        operators["cell"] = sparse.csr_matrix((data, (rows, cols)), shape=(D * N, F))
+
+    return operators["cell"]
+
+def _faceGradientOperators(mesh):
+    """Sparse matrices of the face gradient from cell values and from face values
+
+    The normal component is the difference of the adjacent cell values (or
+    of the cell and face value on the exterior) and the tangential
+    components are the average of the Gauss gradients of the adjacent cells.
+    Rows are ordered by direction, then by face.
+    """
+    operators = _operators(mesh)
+    if "face" not in operators:
+        D = mesh.dim
+        N = mesh.numberOfCells
+        F = mesh.numberOfFaces
+
+        id1, id2 = [numerix.array(ids) for ids in mesh._adjacentCellIDs]
+        exterior = numerix.array(mesh.exteriorFaces, dtype=bool)
+        interior = ~exterior
+        dAP = numerix.array(mesh._cellDistances)
+        normals = numerix.array(numerix.MA.filled(mesh._orientedFaceNormals))
+        tangents1 = numerix.array(mesh._faceTangents1)
+        tangents2 = numerix.array(mesh._faceTangents2)
+
+        faces = numerix.arange(F)
+        difference = (_selection(faces[interior], id2[interior], (F, N))
+                      - _selection(faces, id1, (F, N)))
+        exteriorValue = _selection(faces[exterior], faces[exterior], (F, F))
+        average = (_selection(faces, id1, (F, N)) + _selection(faces, id2, (F, N))) / 2.
+
+        cellGrad = _cellGradientOperator(mesh)
+        averageGrad = [average * cellGrad[e * N:(e + 1) * N] for e in range(D)]
+
+        fromCells = []
+        fromFaces = []
+        for d in range(D):
+            normal = sparse.diags(normals[d] / dAP)
+            fromCells.append(normal * difference)
+            tangential = normal * exteriorValue
+            for e in range(D):
+                projection = tangents1[d] * tangents1[e] + tangents2[d] * tangents2[e]
+                tangential = tangential + sparse.diags(projection) * averageGrad[e]
+            fromFaces.append(tangential)
+
+        operators["face"] = (sparse.vstack(fromCells).tocsr(),
+                             sparse.vstack(fromFaces).tocsr())
+
+    return operators["face"]
+
+def _apply(operator, value, D):
+    """Product of `operator` with each element of `value`
+
+    Returns an array of shape `(D,) + value.shape[:-1] + (rows / D,)`.
+    """
+    value = numerix.asarray(value)
+    elementshape = value.shape[:-1]
+    result = operator * value.reshape((-1, value.shape[-1])).T
+    result = result.reshape((D, -1) + result.shape[-1:])
+    return result.transpose((0, 2, 1)).reshape((D,) + elementshape + (-1,))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
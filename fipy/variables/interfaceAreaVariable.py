@@ -20,6 +20,14 @@ class _InterfaceAreaVariable(CellVariable):
         self.distanceVar = self._requires(distanceVar)
 
     def _calcValue(self):
+        cells = self.distanceVar._narrowBandCells
+        if cells is not None:
+            normals = self.distanceVar._cellInterfaceNormalsAt(cells)
+            areas = numerix.array(MA.filled(self.mesh._cellAreaProjections[..., cells], 0))
+            value = numerix.zeros((self.mesh.numberOfCells,))
+            value[cells] = numerix.sum(abs(numerix.dot(normals, areas)), axis=0)
+            return value
+
         normals = numerix.array(MA.filled(self.distanceVar._cellInterfaceNormals, 0))
         areas = numerix.array(MA.filled(self.mesh._cellAreaProjections, 0))
         return numerix.sum(abs(numerix.dot(normals, areas)), axis=0)
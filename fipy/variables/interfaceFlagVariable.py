@@ -20,6 +20,16 @@ class _InterfaceFlagVariable(CellVariable):
         self.distanceVar = self._requires(distanceVar)
 
     def _calcValue(self):
+        cells = self.distanceVar._narrowBandCells
+        if cells is not None:
+            cellFaceIDs = self.mesh.cellFaceIDs[..., cells]
+            flag = MA.filled(MA.array(self.distanceVar._interfaceFlagAt(MA.filled(cellFaceIDs, 0)),
+                                      mask=MA.getmask(cellFaceIDs)), 0)
+            flag = numerix.sum(flag, axis=0)
+            value = numerix.zeros((self.mesh.numberOfCells,), dtype=int)
+            value[cells] = numerix.where(numerix.logical_and(self.distanceVar.value[cells] > 0, flag > 0), 1, 0)
+            return value
+
         flag = MA.filled(numerix.take(self.distanceVar._interfaceFlag, self.mesh.cellFaceIDs), 0)
         flag = numerix.sum(flag, axis=0)
         return numerix.where(numerix.logical_and(self.distanceVar.value > 0, flag > 0), 1, 0)
@@ -1,6 +1,5 @@
 from __future__ import division
 from __future__ import unicode_literals
-from builtins import range
 __docformat__ = 'restructuredtext'
 
 __all__ = []
@@ -11,7 +10,32 @@ from fipy.tools import numerix
 class _LeastSquaresCellGradVariable(CellVariable):
     """
     Look at `CellVariable.leastSquarseGrad` for documentation
-     """
+
+    The gradient of every cell is found at once, even in 3D
+
+    >>> from fipy import *
+    >>> m = Grid3D(dx=(1., 2., 4.), dy=(.5, 1., 2.), dz=(3., 1., 2.))
+    >>> x, y, z = m.cellCenters
+    >>> v = CellVariable(mesh=m, value=x * y - z**2)
+    >>> grad = v.leastSquaresGrad.globalValue
+    >>> cellDistanceNormals = m._cellToCellDistances * m._cellNormals
+    >>> mat = numerix.sum(cellDistanceNormals[:, numerix.newaxis]
+    ...                   * cellDistanceNormals[numerix.newaxis, :], axis=2)
+    >>> vec = numerix.sum((v._leastSquaresGrad._neighborValue - v.value)
+    ...                   * cellDistanceNormals, axis=1)
+    >>> print(numerix.allclose(grad.T,
+    ...                        [numerix.linalg.solve(mat[..., i], vec[..., i])
+    ...                         for i in range(m.numberOfCells)]))
+    True
+
+    The normal equations depend only on the mesh and are not reassembled
+    when the variable changes
+
+    >>> inverse = v._leastSquaresGrad._inverseNormalMatrix
+    >>> v.value = x + 2 * y + 3 * z
+    >>> print(v._leastSquaresGrad._inverseNormalMatrix is inverse)
+    True
+    """
     def __init__(self, var, name = ''):
         CellVariable.__init__(self, mesh=var.mesh, name=name, rank=var.rank + 1)
         self.var = self._requires(var)
@@ -20,39 +44,56 @@ class _LeastSquaresCellGradVariable(CellVariable):
     def _neighborValue(self):
         return numerix.take(numerix.array(self.var), self.mesh._cellToCellIDs)
 
-    def _calcValue(self):
-        cellToCellDistances = self.mesh._cellToCellDistances
-        cellNormals = self.mesh._cellNormals
-        neighborValue = self._neighborValue
-        value = numerix.array(self.var)
-        cellDistanceNormals = cellToCellDistances * cellNormals
+    @property
+    def _cellDistanceNormals(self):
+        return self.mesh._cellToCellDistances * self.mesh._cellNormals
+
+    @property
+    def _inverseNormalMatrix(self):
+        """Inverse of the D x D matrix of the normal equations of every cell
+        """
+        if not hasattr(self, "_inverse"):
+            cellDistanceNormals = self._cellDistanceNormals
+            D = self.mesh.dim
+
+            mat = numerix.sum(cellDistanceNormals[:, numerix.newaxis]
+                              * cellDistanceNormals[numerix.newaxis, :], axis=2)
 
-        N = self.mesh.numberOfCells
-        M = self.mesh._maxFacesPerCell
-        D = self.mesh.dim
+            inverse = numerix.empty(mat.shape, 'd')
+            if D == 1:
+                inverse[0, 0] = 1. / mat[0, 0]
+            elif D == 2:
+                divisor = mat[0, 0] * mat[1, 1] - mat[0, 1] * mat[1, 0]
+                inverse[0, 0] = mat[1, 1] / divisor
+                inverse[0, 1] = -mat[0, 1] / divisor
+                inverse[1, 0] = -mat[1, 0] / divisor
+                inverse[1, 1] = mat[0, 0] / divisor
+            else:
+                # adjugate, whose first row is also used for the determinant
+                for i in range(3):
+                    for j in range(3):
+                        i1, i2 = (j + 1) % 3, (j + 2) % 3
+                        j1, j2 = (i + 1) % 3, (i + 2) % 3
+                        inverse[i, j] = (mat[i1, j1] * mat[i2, j2]
+                                         - mat[i1, j2] * mat[i2, j1])
+                divisor = numerix.sum(mat[0] * inverse[:, 0], axis=0)
+                inverse /= divisor
 
-        mat = numerix.zeros((D, D, M, N), 'd')
+            self._inverse = inverse
 
-        ## good god! numpy.outer should have an axis argument!!!
-        for i in range(D):
-            for j in range(D):
-                mat[i, j] = cellDistanceNormals[i] * cellDistanceNormals[j]
+        return self._inverse
+
+    def _calcValue(self):
+        neighborValue = self._neighborValue
+        value = numerix.array(self.var)
 
-        mat = numerix.sum(mat, axis=2)
+        vec = numerix.array(numerix.sum((neighborValue - value) * self._cellDistanceNormals, axis=1))
 
-        vec = numerix.array(numerix.sum((neighborValue - value) * cellDistanceNormals, axis=1))
+        return numerix.sum(self._inverseNormalMatrix * vec[numerix.newaxis], axis=1)
 
-        if D == 1:
-            vec[0] = vec[0] / mat[0, 0]
-        elif D == 2:
-            divisor = mat[0, 0] * mat[1, 1] - mat[0, 1] * mat[1, 0]
-            gradx = (vec[0] * mat[1, 1] - vec[1] * mat[1, 0]) / divisor
-            grady = (vec[1] * mat[0, 0] - vec[0] * mat[0, 1]) / divisor
-            vec[0] = gradx
-            vec[1] = grady
-        else:
-            ## very stuppy! numerix.linalg.solve should have an axis argument!!!
-            for i in range(N):
-                vec[..., i] = numerix.linalg.solve(mat[..., i], vec[..., i])
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
 
-        return vec
+if __name__ == "__main__":
+    _test()
@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
+from fipy.tools import numerix
 from fipy.variables.cellVariable import CellVariable
 
 __all__ = ["NoiseVariable"]
@@ -20,11 +21,32 @@ class NoiseVariable(CellVariable):
     The `seed()` and `get_seed()` functions of the
     `fipy.tools.numerix.random` module can be set and query the random
     number generated used by all `NoiseVariable` objects.
+
+    Alternatively, a `NoiseVariable` declared with a `seed` draws its
+    values from a counter-based generator, as a function of the `seed`, of
+    the number of times it has been scrambled, and of the global ID of
+    each cell.  Each process then only draws the values of its own cells,
+    rather than the whole mesh, and the noise is identical however the
+    mesh is partitioned.
+
+    >>> from fipy import Grid1D, GaussianNoiseVariable
+    >>> mesh = Grid1D(nx=10)
+    >>> noise = GaussianNoiseVariable(mesh=mesh, seed=1234)
+    >>> first = noise.globalValue
+    >>> print(numerix.array_equal(first,
+    ...                           GaussianNoiseVariable(mesh=mesh, seed=1234).globalValue))
+    True
+    >>> noise.scramble()
+    >>> print(numerix.array_equal(first, noise.globalValue))
+    False
     """
-    def __init__(self, mesh, name = '', hasOld = 0):
+    def __init__(self, mesh, name = '', hasOld = 0, seed = None):
         if self.__class__ is NoiseVariable:
             raise NotImplementedError("can't instantiate abstract base class")
 
+        self.seed = seed
+        self._step = -1
+
         CellVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
         self.scramble()
 
@@ -41,6 +63,7 @@ class NoiseVariable(CellVariable):
         """
         Generate a new random distribution.
         """
+        self._step += 1
         self._markStale()
 
     def random(self):
@@ -53,9 +76,25 @@ class NoiseVariable(CellVariable):
         else:
             return None
 
+    def counterRandom(self, generator):
+        """Draw the noise of the local cells from `generator`
+
+        Parameters
+        ----------
+        generator : ~fipy.tools.counterRandom._CounterRandom
+            Counter-based generator for the global IDs of the local cells.
+        """
+        raise NotImplementedError
+
     def _calcValue(self):
         from fipy.tools import parallelComm
 
+        if self.seed is not None:
+            from fipy.tools.counterRandom import _CounterRandom
+            generator = _CounterRandom(seed=self.seed, step=self._step,
+                                       ids=self.mesh._globalOverlappingCellIDs)
+            return self.counterRandom(generator)
+
         rnd = self.parallelRandom()
 
         if parallelComm.Nproc > 1:
@@ -64,3 +103,10 @@ class NoiseVariable(CellVariable):
             return rnd[self.mesh._globalOverlappingCellIDs]
         else:
             return rnd
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
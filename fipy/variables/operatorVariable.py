@@ -44,16 +44,32 @@ def _OperatorVariableClass(baseClass=object):
         def setValue(self, value, unit=None, where=None):
             raise TypeError("The value of an `_OperatorVariable` cannot be assigned")
 
+        _fusible = False
+
         def _calcValue(self):
             if not self.canInline:
                 return self._calcValue_()
             else:
                 from fipy.tools import inline
+                from fipy.variables import evaluationPlan
                 if inline.doInline:
                     return self._execInline(comment=self.comment)
+                elif evaluationPlan.doFuse and self._fusible:
+                    return self._calcValueFused()
                 else:
                     return self._calcValue_()
 
+        def _calcValueFused(self):
+            from fipy.variables.evaluationPlan import _EvaluationPlan
+            plan = getattr(self, "_evaluationPlan", None)
+            if plan is None or not plan.isValid:
+                plan = self._evaluationPlan = _EvaluationPlan(self)
+            value = plan.evaluate()
+            if value is None:
+                return self._calcValue_()
+            else:
+                return value
+
         def _calcValue_(self):
             pass
 
@@ -72,6 +72,20 @@ class SurfactantConvectionVariable(FaceVariable):
            >>> print(numerix.allclose(SurfactantConvectionVariable(distanceVar).globalValue, answer))
            True
 
+        With a `narrowBandWidth`, only the band around the interface is
+        evaluated, which gives the same coefficient near the interface:
+
+           >>> mesh = Grid2D(nx = 20, ny = 20, dx = .1, dy = .1)
+           >>> x, y = mesh.cellCenters
+           >>> rad = numerix.sqrt((x - 1.)**2 + (y - 1.)**2) - .5
+           >>> bandVar = DistanceVariable(mesh, value = rad, narrowBandWidth = .3)
+           >>> bandVar.calcDistanceFunction()
+           >>> distanceVar = DistanceVariable(mesh, value = bandVar.value)
+           >>> faces = numerix.array(mesh.cellFaceIDs)[..., abs(bandVar.value) < .15].flatten()
+           >>> print(numerix.allclose(SurfactantConvectionVariable(bandVar).value[..., faces],
+           ...                        SurfactantConvectionVariable(distanceVar).value[..., faces]))
+           True
+
         """
 
         FaceVariable.__init__(self, mesh=distanceVar.mesh, name='surfactant convection', rank=1)
@@ -83,11 +97,28 @@ class SurfactantConvectionVariable(FaceVariable):
         M = self.mesh._maxFacesPerCell
         dim = self.mesh.dim
         cellFaceIDs = self.mesh.cellFaceIDs
+        phi = numerix.array(self.distanceVar.value)
+        volumes = numerix.array(self.mesh.cellVolumes)
 
-        faceNormalAreas = self.distanceVar._levelSetNormals * self.mesh._faceAreas
+        cells = self.distanceVar._narrowBandCells
+        if cells is None:
+            faceNormalAreas = self.distanceVar._levelSetNormals * self.mesh._faceAreas
 
-        cellFaceNormalAreas = numerix.array(MA.filled(numerix.take(faceNormalAreas, cellFaceIDs, axis=-1), 0))
-        norms = numerix.array(MA.filled(MA.array(self.mesh._cellNormals), 0))
+            cellFaceNormalAreas = numerix.array(MA.filled(numerix.take(faceNormalAreas, cellFaceIDs, axis=-1), 0))
+            norms = numerix.array(MA.filled(MA.array(self.mesh._cellNormals), 0))
+        else:
+            ## only the cells of the band inside the interface contribute
+            cells = cells[phi[cells] <= 0]
+            cellFaceIDs = cellFaceIDs[..., cells]
+            faces, inverse = numerix.unique(MA.filled(cellFaceIDs, 0), return_inverse=True)
+            inverse = numerix.reshape(inverse, cellFaceIDs.shape)
+
+            faceNormalAreas = self.distanceVar._levelSetNormalsAt(faces) * self.mesh._faceAreas[faces]
+
+            cellFaceNormalAreas = faceNormalAreas[..., inverse] * ~MA.getmaskarray(cellFaceIDs)
+            norms = numerix.array(MA.filled(MA.array(self.mesh._cellNormals)[..., cells], 0))
+            phi = phi[cells]
+            volumes = volumes[cells]
 
         alpha = numerix.dot(cellFaceNormalAreas, norms)
         alpha = numerix.where(alpha > 0, alpha, 0)
@@ -96,10 +127,9 @@ class SurfactantConvectionVariable(FaceVariable):
         alphasum += (alphasum < 1e-100) * 1.0
         alpha = alpha / alphasum
 
-        phi = numerix.repeat(self.distanceVar[numerix.newaxis, ...], M, axis=0)
+        phi = numerix.repeat(phi[numerix.newaxis, ...], M, axis=0)
         alpha = numerix.where(phi > 0., 0, alpha)
 
-        volumes = numerix.array(self.mesh.cellVolumes)
         alpha = alpha * volumes * norms
 
         value = numerix.zeros((dim, Nfaces), 'd')
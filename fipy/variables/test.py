@@ -15,6 +15,9 @@ def _suite():
             'fipy.variables.cellVariable',
             'fipy.variables.faceVariable',
             'fipy.variables.operatorVariable',
+            'fipy.variables.evaluationPlan',
+            'fipy.variables.gradientOperators',
+            'fipy.variables.noiseVariable',
             'fipy.variables.betaNoiseVariable',
             'fipy.variables.exponentialNoiseVariable',
             'fipy.variables.gammaNoiseVariable',
@@ -27,6 +30,7 @@ def _suite():
             'fipy.variables.cellToFaceVariable',
             'fipy.variables.faceGradVariable',
             'fipy.variables.gaussCellGradVariable',
+            'fipy.variables.leastSquaresCellGradVariable',
             'fipy.variables.faceGradContributionsVariable',
             'fipy.variables.surfactantConvectionVariable',
             'fipy.variables.surfactantVariable',
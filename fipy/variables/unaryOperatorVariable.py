@@ -32,6 +32,8 @@ def _UnaryOperatorVariable(operatorClass=None):
     """
 
     class unOp(operatorClass):
+        _fusible = True
+
         def _calcValue_(self):
             return self.op(self.var[0].value)
 
@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
+from fipy.tools import numerix
 from fipy.tools.numerix import random
 from fipy.variables.noiseVariable import NoiseVariable
 
@@ -45,7 +46,7 @@ class UniformNoiseVariable(NoiseVariable):
        :align: center
        :alt: histogram of random values with a uniform distribution
     """
-    def __init__(self, mesh, name = '', minimum = 0., maximum = 1., hasOld = 0):
+    def __init__(self, mesh, name = '', minimum = 0., maximum = 1., hasOld = 0, seed = None):
         """
         Parameters
         ----------
@@ -55,15 +56,22 @@ class UniformNoiseVariable(NoiseVariable):
             The minimum (not-inclusive) value of the distribution.
         maximum : float
             The maximum (not-inclusive) value of the distribution.
+        seed : int, optional
+            Seed of a counter-based generator, which draws the same noise
+            however the mesh is partitioned.  See
+            :class:`~fipy.variables.noiseVariable.NoiseVariable`.
         """
         self.minimum = minimum
         self.maximum = maximum
-        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld)
+        NoiseVariable.__init__(self, mesh = mesh, name = name, hasOld = hasOld, seed = seed)
 
     def random(self):
         return random.uniform(self.minimum, self.maximum,
                               size=[self.mesh.globalNumberOfCells])
 
+    def counterRandom(self, generator):
+        return generator.uniform(numerix.array(self.minimum), numerix.array(self.maximum))
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()
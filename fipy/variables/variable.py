@@ -645,7 +645,7 @@ class Variable(object):
                 if isinstance(v, PF):
                     v = self._value.value
                 if type(value) in (type(1), type(1.)):
-                    if isinstance(v, type(numerix.array(1))):
+                    if isinstance(v, numerix.ndarray):
                         if v.shape is not ():
 ##                        if len(v) > 1:
                             value = numerix.resize(value, v.shape).astype(v.dtype)
@@ -658,7 +658,7 @@ class Variable(object):
             elif array is not None:
                 array[:] = value
                 value = array
-            elif type(value) not in (type(None), type(numerix.array(1)), type(numerix.MA.array(1))):
+            elif type(value) not in (type(None), numerix.ndarray, numerix.MA.MaskedArray):
                 value = numerix.array(value)
 ##                 # numerix does strange things with really large integers.
 ##                 # Even though Python knows how to do arithmetic with them,
@@ -800,26 +800,63 @@ class Variable(object):
         raise NotImplementedError
 
     def _getSubscribedVariables(self):
-        self._subscribedVariables = [sub for sub in self._subscribedVariables if sub() is not None]
+        if self._deadSubscribers:
+            self._subscribedVariables = [sub for sub in self._subscribedVariables if sub() is not None]
+            self._deadSubscribers = False
 
         return self._subscribedVariables
 
     def _setSubscribedVariables(self, sVars):
         self._subscribedVariables = sVars
+        self._deadSubscribers = True
 
     subscribedVariables = property(_getSubscribedVariables,
                                    _setSubscribedVariables)
 
     def __markStale(self):
-        for subscriber in self.subscribedVariables:
-            if subscriber() is not None:
+        """Mark everything that depends on this `Variable` as stale
+
+        A stale `Variable` never has fresh subscribers, so the traversal
+        stops at subscribers that are already stale and only visits the
+        part of the dependency graph that actually changes state. The
+        graph is walked with an explicit stack, rather than by recursion,
+        so that deep expressions neither pay for a Python call per node nor
+        run into the recursion limit.
+
+        >>> a = Variable(value=1.)
+        >>> b = a
+        >>> for i in range(100):
+        ...     b = b + 1
+        >>> c = a * 2
+        >>> print(b)
+        101.0
+        >>> a.value = 2.
+        >>> print(b.stale and c.stale)
+        1
+        >>> print(b)
+        102.0
+        >>> print(c)
+        4.0
+        >>> del c
+        >>> import gc
+        >>> _ = gc.collect()
+        >>> print(len(a.subscribedVariables))
+        1
+        """
+        stack = [self]
+        while stack:
+            var = stack.pop()
+            for ref in var.subscribedVariables:
                 ## Even though getSubscribedVariables() strips out dead
-                ## references, subscriber() might still be dead due to the
+                ## references, the subscriber might still be dead due to the
                 ## vagaries of garbage collection and the possibility that
                 ## later subscribedVariables were removed, changing the
                 ## dependencies of this subscriber.
                 ## See <https://github.com/usnistgov/fipy/issues/103> for more explanation.
-                subscriber()._markStale()
+                subscriber = ref()
+                if subscriber is not None and not subscriber.stale:
+                    subscriber.stale = 1
+                    stack.append(subscriber)
 
     def _markFresh(self):
         self.stale = 0
@@ -845,9 +882,17 @@ class Variable(object):
 
         # we retain a weak reference to avoid a memory leak
         # due to circular references between the subscriber
-        # and the subscribee
+        # and the subscribee. The callback, which must not refer to
+        # this Variable either, flags that the list needs pruning.
         import weakref
-        self.subscribedVariables.append(weakref.ref(var))
+        subscribee = weakref.ref(self)
+
+        def _subscriberDied(ref, subscribee=subscribee):
+            subscribee = subscribee()
+            if subscribee is not None:
+                subscribee._deadSubscribers = True
+
+        self.subscribedVariables.append(weakref.ref(var, _subscriberDied))
 
     @property
     def _variableClass(self):
@@ -0,0 +1,181 @@
+r"""Hand frames from a `MayaviClient` to its `MayaviDaemon`
+
+The client and the daemon talk over a local socket, one :term:`JSON`
+message per line.  The client sends a frame, then waits for the daemon to
+acknowledge that it has rendered it before sending the next one.  This
+waiting happens in a background thread, so that the solver is never
+blocked by the renderer.  If the solver produces frames faster than the
+daemon can render them, only the most recent one is kept; the frames it
+replaces are dropped and counted, unless they are to be saved to a file.
+
+    >>> import subprocess
+    >>> import sys
+    >>> import threading
+    >>> daemon = '''
+    ... import json, socket, sys
+    ... connection = socket.create_connection(("127.0.0.1", int(sys.argv[1])))
+    ... messages = connection.makefile("rb")
+    ... for line in messages:
+    ...     frame = json.loads(line.decode("utf-8"))
+    ...     sys.stdout.write("rendered %s\\n" % frame["name"])
+    ...     sys.stdout.flush()
+    ...     _ = sys.stdin.readline()
+    ...     connection.sendall(b"done\\n")
+    ... '''
+    >>> dropped = []
+    >>> channel = _FrameChannel(discard=dropped.append)
+    >>> process = subprocess.Popen([sys.executable, "-c", daemon, str(channel.port)],
+    ...                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+The daemon stalls in the middle of rendering the first frame, so the
+later frames pile up, and all but the last are dropped
+
+    >>> channel.send({"name": "first"})
+    >>> print(process.stdout.readline().decode("utf-8").strip())
+    rendered first
+    >>> for name in ["second", "third", "fourth"]:
+    ...     channel.send({"name": name})
+    >>> print([frame["name"] for frame in dropped])
+    ['second', 'third']
+    >>> print(channel.skippedFrames)
+    2
+
+Frames that are to be saved are never dropped, but replace any earlier
+frames
+
+    >>> channel.send({"name": "fifth", "filename": "fifth.png"})
+    >>> channel.send({"name": "sixth"})
+    >>> print(channel.skippedFrames)
+    3
+    >>> for step in range(2):
+    ...     _ = process.stdin.write(b"\n")
+    ...     process.stdin.flush()
+    ...     print(process.stdout.readline().decode("utf-8").strip())
+    rendered fifth
+    rendered sixth
+    >>> _ = process.stdin.write(b"\n")
+    >>> process.stdin.flush()
+    >>> channel.close()
+    >>> print(process.wait())
+    0
+    >>> process.stdin.close()
+    >>> process.stdout.close()
+"""
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+import json
+import logging
+import socket
+import threading
+
+_log = logging.getLogger(__name__)
+
+class _FrameChannel(object):
+    """Sender of frames to a `MayaviDaemon`
+
+    Parameters
+    ----------
+    discard : callable, optional
+        Called with each frame that is dropped, or that is never sent,
+        e.g., to remove its files.
+    """
+
+    def __init__(self, discard=None):
+        self._discard = discard or (lambda frame: None)
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(("127.0.0.1", 0))
+        self._server.listen(1)
+
+        self._pending = []
+        self._closed = False
+        self._condition = threading.Condition()
+        self.skippedFrames = 0
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def port(self):
+        """The port for the daemon to connect to"""
+        return self._server.getsockname()[1]
+
+    def send(self, frame):
+        """Queue `frame`, a :obj:`dict`, for the daemon, without waiting
+
+        Any queued frame that does not have a `filename` to be saved to
+        is replaced.
+        """
+        with self._condition:
+            if self._closed:
+                self._discard(frame)
+                return
+
+            for stale in [f for f in self._pending if not f.get("filename")]:
+                self._pending.remove(stale)
+                self.skippedFrames += 1
+                _log.info("viewer: SKIPPED frame; %d skipped so far", self.skippedFrames)
+                self._discard(stale)
+
+            self._pending.append(frame)
+            self._condition.notify()
+
+    def close(self):
+        """Stop sending frames and close the connection"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        self._server.close()
+        self._thread.join(1.)
+
+    def _next(self):
+        with self._condition:
+            while not (self._pending or self._closed):
+                self._condition.wait()
+
+            if self._closed:
+                return None
+            else:
+                return self._pending.pop(0)
+
+    def _run(self):
+        try:
+            connection, address = self._server.accept()
+        except (socket.error, OSError):
+            # closed before the daemon connected
+            return
+
+        acknowledgements = connection.makefile("rb")
+        try:
+            while True:
+                frame = self._next()
+                if frame is None:
+                    break
+
+                connection.sendall((json.dumps(frame) + "\n").encode("utf-8"))
+                if not acknowledgements.readline():
+                    _log.info("viewer: daemon stopped")
+                    break
+        except (socket.error, OSError) as e:
+            _log.info("viewer: lost connection to daemon: %s", e)
+        finally:
+            acknowledgements.close()
+            connection.close()
+            with self._condition:
+                self._closed = True
+                for frame in self._pending:
+                    self._discard(frame)
+                self._pending = []
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -4,12 +4,13 @@ from builtins import str
 __docformat__ = 'restructuredtext'
 
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
-import time
 
 from fipy.viewers.viewer import AbstractViewer
+from fipy.viewers.mayaviViewer.frameChannel import _FrameChannel
 
 __all__ = ["MayaviClient"]
 from future.utils import text_to_native_str
@@ -19,6 +20,10 @@ class MayaviClient(AbstractViewer):
     """
     The `MayaviClient` uses the Mayavi_ python plotting package.
 
+    Plotting runs in a separate daemon process.  Each frame is handed to
+    it without waiting for it to be displayed; frames that the daemon is
+    too slow to display are skipped, and counted in `skippedFrames`.
+
     .. _Mayavi: http://code.enthought.com/projects/mayavi
 
     """
@@ -48,7 +53,7 @@ class MayaviClient(AbstractViewer):
         self._vtkdir = tempfile.mkdtemp()
         self._vtkcellfname = os.path.join(self._vtkdir, "cell.vtk")
         self._vtkfacefname = os.path.join(self._vtkdir, "face.vtk")
-        self._vtklockfname = os.path.join(self._vtkdir, "lock")
+        self._frameNumber = 0
 
         from fipy.viewers.vtkViewer import VTKCellViewer, VTKFaceViewer
 
@@ -68,7 +73,13 @@ class MayaviClient(AbstractViewer):
 
         AbstractViewer.__init__(self, vars=cell_vars + face_vars, title=title, **kwlimits)
 
-        self.plot()
+        # the daemon sets up its pipeline from the initial files
+        if self._vtkCellViewer is not None:
+            self._vtkCellViewer.plot(filename=self._vtkcellfname)
+        if self._vtkFaceViewer is not None:
+            self._vtkFaceViewer.plot(filename=self._vtkfacefname)
+
+        self._channel = _FrameChannel(discard=self._discardFrame)
 
         from pkg_resources import Requirement, resource_filename
         daemon_file = (daemon_file
@@ -79,8 +90,8 @@ class MayaviClient(AbstractViewer):
 
         cmd = [pyth,
                daemon_file,
-               "--lock",
-               self._vtklockfname,
+               "--port",
+               str(self._channel.port),
                "--fps",
                str(self._fps)]
 
@@ -107,11 +118,15 @@ class MayaviClient(AbstractViewer):
         """The frames per second to attempt to display."""
         return self._fps
 
+    @property
+    def skippedFrames(self):
+        """The number of frames dropped because the daemon was busy."""
+        return self._channel.skippedFrames
+
     def __del__(self):
-        for fname in [self._vtkcellfname, self._vtkfacefname, self._vtklockfname]:
-            if fname and os.path.isfile(fname):
-                os.unlink(fname)
-        os.rmdir(self._vtkdir)
+        if hasattr(self, "_channel"):
+            self._channel.close()
+        shutil.rmtree(self._vtkdir, ignore_errors=True)
 
     def _getLimit(self, key, default=None):
         """
@@ -138,25 +153,25 @@ class MayaviClient(AbstractViewer):
         else:
             return []
 
+    @staticmethod
+    def _discardFrame(frame):
+        for key in ["cell", "face"]:
+            fname = frame.get(key)
+            if fname and os.path.isfile(fname):
+                os.unlink(fname)
+
     def plot(self, filename=None):
-        start = time.time()
-        plotted = False
-        while not plotted:
-            if not os.path.isfile(self._vtklockfname):
-                if self._vtkCellViewer is not None:
-                    self._vtkCellViewer.plot(filename=self._vtkcellfname)
-                if self._vtkFaceViewer is not None:
-                    self._vtkFaceViewer.plot(filename=self._vtkfacefname)
-                with open(self._vtklockfname, 'w') as lock:
-                    if filename is not None:
-                        lock.write(filename)
-                plotted = True
-
-            if (time.time() - start > 30. / self._fps) and not plotted:
-                print("viewer: NOT READY")
-                start = time.time()
-        if not plotted:
-            print("viewer: SKIPPED")
+        # each frame gets its own files, which the daemon takes over
+        self._frameNumber += 1
+        frame = {"filename": filename or ""}
+        if self._vtkCellViewer is not None:
+            frame["cell"] = os.path.join(self._vtkdir, "cell-%d.vtk" % self._frameNumber)
+            self._vtkCellViewer.plot(filename=frame["cell"])
+        if self._vtkFaceViewer is not None:
+            frame["face"] = os.path.join(self._vtkdir, "face-%d.vtk" % self._frameNumber)
+            self._vtkFaceViewer.plot(filename=frame["face"])
+
+        self._channel.send(frame)
 
     def _validFileExtensions(self):
         return [".png", ".jpg", ".bmp", ".tiff", ".ps", ".eps", ".pdf", ".rib", ".oogl", ".iv", ".vrml", ".obj"]
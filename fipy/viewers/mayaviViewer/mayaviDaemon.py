@@ -1,5 +1,5 @@
-"""A simple script that polls a data file for changes and then updates
-the Mayavi pipeline automatically.
+"""A simple script that receives frames from a `MayaviClient` and then
+updates the Mayavi pipeline automatically.
 
 This script is based heavily on the `poll_file.py` example in the Mayavi distribution.
 
@@ -23,9 +23,12 @@ from __future__ import unicode_literals
 __docformat__ = 'restructuredtext'
 
 # Standard imports.
+import json
 import os
 import signal
+import socket
 import sys
+import threading
 
 # Enthought library imports
 try:
@@ -50,8 +53,12 @@ __all__ = [text_to_native_str(n) for n in __all__]
 ######################################################################
 class MayaviDaemon(Mayavi):
     """Given a file name and a mayavi2 data reader object, this class
-    polls the file for any changes and automatically updates the
-    mayavi pipeline.
+    receives new versions of the file from a `MayaviClient` and
+    automatically updates the mayavi pipeline.
+
+    The client announces each frame on a local socket and waits for it
+    to be acknowledged before announcing another, so the daemon only
+    ever holds one frame.
     """
 
     _viewers = []
@@ -68,8 +75,8 @@ class MayaviDaemon(Mayavi):
         usage = "usage: %prog [options]"
         parser = OptionParser(usage)
 
-        parser.add_option("-l", "--lock", action="store", dest="lock", type="string", default=None,
-                          help="path of lock file")
+        parser.add_option("-p", "--port", action="store", dest="port", type="int", default=None,
+                          help="local port of the client to receive frames from")
 
         parser.add_option("-c", "--cell", action="store", dest="cell", type="string", default=None,
                           help="path of cell vtk file")
@@ -106,7 +113,7 @@ class MayaviDaemon(Mayavi):
 
         (options, args) = parser.parse_args(argv)
 
-        self._lockfname = options.lock
+        self._port = options.port
         self._cellfname = options.cell
         self._facefname = options.face
         self._bounds = [options.xmin, options.xmax,
@@ -188,12 +195,19 @@ class MayaviDaemon(Mayavi):
 
         self.view_data()
 
-        # Poll the lock file.
-        self.timer = Timer(1000 / self._fps, self.poll_file)
+        # Receive frames in the background and display them on a timer.
+        self._frame = None
+        self._frameLock = threading.Lock()
+        self._connection = socket.create_connection(("127.0.0.1", self._port))
+        self._receiver = threading.Thread(target=self.receive_frames)
+        self._receiver.daemon = True
+        self._receiver.start()
+
+        self.timer = Timer(1000 / self._fps, self.poll_frame)
 
     def __del__(self):
         dir = None
-        for fname in [self._cellfname, self._facefname, self._lockfname]:
+        for fname in [self._cellfname, self._facefname]:
             if fname and os.path.isfile(fname):
                 os.unlink(fname)
                 if not dir:
@@ -207,15 +221,34 @@ class MayaviDaemon(Mayavi):
             viewer.__del__()
         raise SystemExit("MayaviDaemon cleaned up")
 
-    def poll_file(self):
-        if os.path.isfile(self._lockfname):
-            self.update_pipeline(self.cellsource)
-            self.update_pipeline(self.facesource)
-            with open(self._lockfname, 'r') as lock:
-                filename = lock.read()
-            if len(filename) > 0:
-                mlab.savefig(filename)
-            os.unlink(self._lockfname)
+    def receive_frames(self):
+        """Collect frame announcements from the client.
+        """
+        for line in self._connection.makefile("rb"):
+            with self._frameLock:
+                self._frame = json.loads(line.decode("utf-8"))
+
+    def poll_frame(self):
+        with self._frameLock:
+            frame, self._frame = self._frame, None
+
+        if frame is not None:
+            # the readers always read the same files
+            for source, fname, key in [(self.cellsource, self._cellfname, "cell"),
+                                       (self.facesource, self._facefname, "face")]:
+                if frame.get(key):
+                    self._replace(frame[key], fname)
+                    self.update_pipeline(source)
+            if len(frame["filename"]) > 0:
+                mlab.savefig(frame["filename"])
+            self._connection.sendall(b"done\n")
+
+    @staticmethod
+    def _replace(src, dst):
+        # `rename` only overwrites on POSIX
+        if os.name == "nt" and os.path.exists(dst):
+            os.unlink(dst)
+        os.rename(src, dst)
 
     def update_pipeline(self, source):
         """Override this to do something else if needed.
@@ -13,6 +13,7 @@ def _suite():
         'vtkViewer.test',),
                                    docTestModuleNames = (
         'tsvViewer',
+        'mayaviViewer.frameChannel',
         ), base = __name__)
 
 if __name__ == '__main__':
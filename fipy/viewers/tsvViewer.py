@@ -4,6 +4,7 @@ __docformat__ = 'restructuredtext'
 
 import sys
 
+from fipy.tools import backgroundOutput
 from fipy.tools import numerix
 from fipy.viewers.viewer import AbstractViewer
 from fipy.variables.cellVariable import CellVariable
@@ -64,37 +65,91 @@ class TSVViewer(AbstractViewer):
             assert mesh is var.mesh
 
 
-    def _plot(self, values, f, dim):
-        for index in range(values.shape[-1]):
-            lineValues = values[..., index]
+    # number of rows formatted at once
+    _rowsPerChunk = 10000
 
-            # omit any elements whose cell centers lie outside of the specified limits
-            skip = False
-            for axis in range(dim):
-                mini = self._getLimit("%smin" % self._axis[axis])
-                maxi = self._getLimit("%smax" % self._axis[axis])
+    def _plot(self, values, f, dim, time=None):
+        if values is None:
+            return
 
-                if (mini and lineValues[axis] < mini) or (maxi and lineValues[axis] > maxi):
-                    skip = True
-                    break
+        values = numerix.array(values, dtype=float)
 
-            if skip:
-                continue
+        # omit any elements whose centers lie outside of the specified limits
+        keep = numerix.ones(values.shape[-1], dtype=bool)
+        for axis in range(dim):
+            mini = self._getLimit("%smin" % self._axis[axis])
+            maxi = self._getLimit("%smax" % self._axis[axis])
 
-            # replace any values that lie outside of the specified datalimits with 'nan'
-            for valIndex in range(dim, len(lineValues)):
-                mini = self._getLimit("datamin")
-                maxi = self._getLimit("datamax")
+            if mini:
+                keep &= ~(values[axis] < mini)
+            if maxi:
+                keep &= ~(values[axis] > maxi)
 
-                if (mini and lineValues[valIndex] < mini) or (maxi and lineValues[valIndex] > maxi):
-                    lineValues[valIndex] = float("NaN")
-                    break
+        values = values[..., keep]
 
-            line = ["%.15g" % value for value in lineValues]
-            f.write("\t".join(line))
-            f.write("\n")
+        # replace any values that lie outside of the specified datalimits with 'nan'
+        data = values[dim:]
+        mini = self._getLimit("datamin")
+        maxi = self._getLimit("datamax")
+        if mini:
+            data[data < mini] = float("NaN")
+        if maxi:
+            data[data > maxi] = float("NaN")
+
+        if time is not None:
+            values = numerix.concatenate(([[time] * values.shape[-1]], values))
+
+        # format whole blocks of rows at once
+        row = "\t".join(["%.15g"] * values.shape[0]) + "\n"
+        for start in range(0, values.shape[-1], self._rowsPerChunk):
+            chunk = values[..., start:start + self._rowsPerChunk]
+            f.write((row * chunk.shape[-1]) % tuple(chunk.T.ravel().tolist()))
 
-    def plot(self, filename=None):
+    def _gatherValues(self, centers, localIDs, globalIDs):
+        """Coordinates and values of the variables, as rows of a table
+
+        Every process contributes the elements it owns in a single
+        communication.  Only the root process receives the table;
+        the others return `None`.
+        """
+        mesh = self.vars[0].mesh
+
+        values = [numerix.array(centers.value)]
+        for var in self.vars:
+            value = numerix.array(var.value)
+            if var.rank == 0:
+                value = value[numerix.newaxis]
+            values.append(value)
+        values = numerix.concatenate(values)
+
+        if mesh.communicator.Nproc == 1:
+            return values
+
+        pieces = mesh.communicator.gather((globalIDs, values[..., localIDs]))
+        if pieces is None:
+            return None
+
+        globalIDs = numerix.concatenate([IDs for IDs, piece in pieces])
+        gathered = numerix.empty(values.shape[:-1] + (max(globalIDs) + 1,),
+                                 dtype=values.dtype)
+        gathered[..., globalIDs] = numerix.concatenate([piece for IDs, piece in pieces],
+                                                      axis=-1)
+
+        return gathered
+
+    def _open(self, filename, append):
+        import io
+        import os
+
+        mode = "a" if append else "w"
+        if os.path.splitext(filename)[1] == ".gz":
+            import gzip
+            return io.TextIOWrapper(gzip.GzipFile(filename=filename,
+                                                  mode=mode + "b"))
+        else:
+            return io.open(filename, mode)
+
+    def plot(self, filename=None, append=False, time=None):
         """
         "plot" the coordinates and values of the variables to `filename`.
         If `filename` is not provided, "plots" to `stdout`.
@@ -119,33 +174,77 @@ class TSVViewer(AbstractViewer):
         0.05    0.45    -2      35      -3.33333333333333
         0.15    0.45    5       35      5
 
+        Limits omit elements and blank out values
+
+        >>> TSVViewer(vars = v, xmax = 0.1, datamin = -1).plot() #doctest: +NORMALIZE_WHITESPACE
+        var
+        x       y       var
+        0.05    0.15    0
+        0.05    0.45    nan
+
+        A time series can be collected in a single file, which is only
+        given a title and headings when it is first written
+
+        >>> import os
+        >>> import tempfile
+        >>> (f, filename) = tempfile.mkstemp(suffix=".tsv")
+        >>> os.close(f)
+        >>> viewer = TSVViewer(vars = v, title = "series")
+        >>> viewer.plot(filename, time=0.)
+        >>> v.value = (1, 3, -1, 6)
+        >>> viewer.plot(filename, append=True, time=0.5)
+        >>> backgroundOutput.flush()
+        >>> with open(filename) as f:
+        ...     print(f.read()) #doctest: +NORMALIZE_WHITESPACE
+        series
+        time    x       y       var
+        0       0.05    0.15    0
+        0       0.15    0.15    2
+        0       0.05    0.45    -2
+        0       0.15    0.45    5
+        0.5     0.05    0.15    1
+        0.5     0.15    0.15    3
+        0.5     0.05    0.45    -1
+        0.5     0.15    0.45    6
+        <BLANKLINE>
+        >>> os.remove(filename)
+
         Parameters
         ----------
         filename : str
             If not `None`, the name of a file to save the image into.
+            Files whose name ends in `.gz` are compressed.
+        append : bool
+            Whether to add rows to the end of an existing `filename`.
+        time : float, optional
+            If not `None`, written in a leading "time" column of every row,
+            to distinguish the steps of a series appended to one file.
         """
 
         mesh = self.vars[0].mesh
         dim = mesh.dim
 
-        if filename is not None:
-            import os
-            if mesh.communicator.procID == 0:
-                if os.path.splitext(filename)[1] == ".gz":
-                    import gzip
-                    f = gzip.GzipFile(filename = filename, mode = 'w', fileobj = None)
-                else:
-                    f = open(filename, "w")
-            else:
-                f = open(os.devnull, mode='w')
-        else:
-            f = sys.stdout
+        cellVars = [var for var in self.vars if isinstance(var, CellVariable)]
+        faceVars = [var for var in self.vars if isinstance(var, FaceVariable)]
 
-        if self.title and len(self.title) > 0:
-            f.write(self.title)
-            f.write("\n")
+        # gather everything before deciding who writes
+        cellValues = faceValues = None
+        if len(cellVars) > 0:
+            cellValues = self._gatherValues(mesh.cellCenters,
+                                            mesh._localNonOverlappingCellIDs,
+                                            mesh._globalNonOverlappingCellIDs)
+        if len(faceVars) > 0:
+            ownedFaceIDs = mesh.topology._ownedFaceIDs
+            faceValues = self._gatherValues(mesh.faceCenters,
+                                            ownedFaceIDs,
+                                            mesh._globalOverlappingFaceIDs[..., ownedFaceIDs])
+
+        if mesh.communicator.procID != 0:
+            return
 
         headings = []
+        if time is not None:
+            headings.append("time")
         for index in range(dim):
             headings.extend(self._axis[index])
 
@@ -157,31 +256,34 @@ class TSVViewer(AbstractViewer):
             else:
                 headings.extend([name])
 
-        f.write("\t".join(headings))
-        f.write("\n")
+        if filename is not None:
+            # the gathered values are already a snapshot
+            backgroundOutput._submit(self._write, filename, append, headings,
+                                     cellValues, faceValues, dim, time)
+        else:
+            self._write(None, append, headings, cellValues, faceValues, dim, time)
 
-        cellVars = [var for var in self.vars if isinstance(var, CellVariable)]
-        faceVars = [var for var in self.vars if isinstance(var, FaceVariable)]
+    def _write(self, filename, append, headings, cellValues, faceValues, dim, time):
+        if filename is not None:
+            import os
+            newFile = not (append
+                           and os.path.exists(filename)
+                           and os.path.getsize(filename) > 0)
+            f = self._open(filename, append)
+        else:
+            newFile = True
+            f = sys.stdout
 
-        if len(cellVars) > 0:
-            values = mesh.cellCenters.globalValue
-            for var in self.vars:
-                if isinstance(var, CellVariable) and var.rank == 1:
-                    values = numerix.concatenate((values, numerix.array(var.globalValue)))
-                else:
-                    values = numerix.concatenate((values, (numerix.array(var.globalValue),)))
+        if newFile:
+            if self.title and len(self.title) > 0:
+                f.write(self.title)
+                f.write("\n")
 
-            self._plot(values, f, dim)
+            f.write("\t".join(headings))
+            f.write("\n")
 
-        if len(faceVars) > 0:
-            values = mesh.faceCenters.globalValue
-            for var in self.vars:
-                if isinstance(var, FaceVariable) and var.rank == 1:
-                    values = numerix.concatenate((values, numerix.array(var.globalValue)))
-                else:
-                    values = numerix.concatenate((values, (numerix.array(var.globalValue),)))
-
-            self._plot(values, f, dim)
+        self._plot(cellValues, f, dim, time)
+        self._plot(faceValues, f, dim, time)
 
         if f is not sys.stdout:
             f.close()
@@ -3,12 +3,14 @@ __docformat__ = 'restructuredtext'
 
 from fipy.viewers.vtkViewer.vtkCellViewer import VTKCellViewer
 from fipy.viewers.vtkViewer.vtkFaceViewer import VTKFaceViewer
+from fipy.viewers.vtkViewer.vtkSeriesViewer import VTKSeriesViewer
 
 __all__ = ["VTKViewer"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 __all__.extend(vtkCellViewer.__all__)
 __all__.extend(vtkFaceViewer.__all__)
+__all__.extend(vtkSeriesViewer.__all__)
 
 def VTKViewer(vars, title=None, limits={}, **kwlimits):
     """Generic function for creating a `VTKViewer`.
@@ -0,0 +1,327 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+__all__ = ["VTKSeriesViewer"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+import os
+import struct
+from xml.sax.saxutils import quoteattr
+
+from fipy.tools import backgroundOutput
+from fipy.tools import numerix
+from fipy.variables.cellVariable import CellVariable
+from fipy.viewers.viewer import AbstractViewer
+
+# VTK cell types used for the cells of 1D, 2D and 3D meshes
+_VTK_LINE = 3
+_VTK_POLYGON = 7
+_VTK_CONVEX_POINT_SET = 41
+
+_VTKTypes = {
+    "float64": "Float64",
+    "float32": "Float32",
+    "int64": "Int64",
+    "int32": "Int32",
+    "int16": "Int16",
+    "int8": "Int8",
+    "uint8": "UInt8"
+}
+
+class VTKSeriesViewer(AbstractViewer):
+    r"""Writes a time series of `CellVariable` data in VTK XML format
+
+    Every call to :meth:`plot` adds a step to a ParaView data (`.pvd`)
+    collection.  Each process writes the cells it owns to its own
+    unstructured grid (`.vtu`) piece, and the first process writes a
+    parallel unstructured grid (`.pvtu`) that binds the pieces of the step
+    together, so nothing is gathered.  Arrays are stored as raw binary
+    appended data.  The geometry of the pieces is encoded only once, when
+    the viewer is created, and only the values of the variables are
+    encoded at each step.
+
+        >>> import os
+        >>> import shutil
+        >>> import struct
+        >>> import tempfile
+        >>> from xml.etree import ElementTree
+        >>> from fipy import CellVariable, Tri2D, Variable
+        >>> from fipy.tools import numerix
+
+        >>> mesh = Tri2D(nx=3, ny=2)
+        >>> x, y = mesh.cellCenters
+        >>> t = Variable(value=0.)
+        >>> phi = CellVariable(mesh=mesh, name="phi", value=x * y * (1 + t))
+        >>> viewer = VTKSeriesViewer(vars=(phi, phi.grad))
+
+        >>> dir = tempfile.mkdtemp()
+        >>> filename = os.path.join(dir, "run.pvd")
+        >>> for time in (0., 0.5):
+        ...     t.value = time
+        ...     viewer.plot(filename, time=time)
+        >>> backgroundOutput.flush()
+
+    The collection lists the steps
+
+        >>> steps = ElementTree.parse(filename).findall(".//DataSet")
+        >>> print([(step.get("timestep"), step.get("file")) for step in steps])
+        [('0', 'run_0.pvtu'), ('0.5', 'run_1.pvtu')]
+
+    and each step lists the piece written by each process
+
+        >>> step = ElementTree.parse(os.path.join(dir, "run_1.pvtu"))
+        >>> pieces = [piece.get("Source") for piece in step.findall(".//Piece")]
+        >>> print(pieces == ["run_1_%d.vtu" % proc
+        ...                  for proc in range(mesh.communicator.Nproc)])
+        True
+
+    The appended data of a piece can be read back
+
+        >>> def cellData(filename, name):
+        ...     with open(filename, "rb") as f:
+        ...         content = f.read()
+        ...     start = content.index(b"<AppendedData")
+        ...     raw = content[content.index(b"_", start) + 1:]
+        ...     piece = ElementTree.fromstring(content[:start] + b"</VTKFile>")
+        ...     array = piece.find(".//CellData/DataArray[@Name='%s']" % name)
+        ...     offset = int(array.get("offset"))
+        ...     (size,) = struct.unpack("<Q", raw[offset:offset + 8])
+        ...     value = numerix.frombuffer(raw[offset + 8:offset + 8 + size], dtype="<f8")
+        ...     return value.reshape((-1, int(array.get("NumberOfComponents")))).T
+
+        >>> piece = os.path.join(dir, "run_1_%d.vtu" % mesh.communicator.procID)
+        >>> local = mesh._localNonOverlappingCellIDs
+        >>> print(numerix.allclose(cellData(piece, "phi"), phi.value[local]))
+        True
+        >>> grad = cellData(piece, phi.grad.name)
+        >>> print(numerix.allclose(grad[:2], phi.grad.value[..., local]))
+        True
+        >>> print(numerix.allclose(grad[2], 0.))
+        True
+
+        >>> shutil.rmtree(dir)
+    """
+
+    def __init__(self, vars, title=None, limits={}, **kwlimits):
+        """Creates a `VTKSeriesViewer`
+
+        Parameters
+        ----------
+        vars : ~fipy.variables.cellVariable.CellVariable or list
+            the `CellVariable` objects to write.
+        title : str, optional
+            not used
+        limits : dict, optional
+            not used
+        xmin, xmax, ymin, ymax, zmin, zmax, datamin, datamax : float, optional
+            not used
+        """
+        kwlimits.update(limits)
+        AbstractViewer.__init__(self, vars=vars, title=title, **kwlimits)
+
+        mesh = self.vars[0].mesh
+        self._cellIDs = mesh._localNonOverlappingCellIDs
+        (self._numberOfPoints,
+         self._numberOfCells,
+         self._geometry) = self._encodeGeometry(mesh, self._cellIDs)
+
+        # the steps of each collection written so far
+        self._collections = {}
+
+    def _getSuitableVars(self, vars):
+        if type(vars) not in [type([]), type(())]:
+            vars = [vars]
+        vars = [var for var in vars if isinstance(var, CellVariable)]
+        if len(vars) == 0:
+            raise TypeError("%s can only display CellVariable" % self.__class__.__name__)
+        vars = [var for var in vars if var.mesh == vars[0].mesh]
+        return vars
+
+    @staticmethod
+    def _encodeGeometry(mesh, cellIDs):
+        """Points and cells of the piece of `mesh` made of `cellIDs`
+
+        Returns
+        -------
+        numberOfPoints : int
+        numberOfCells : int
+        arrays : list
+            The `DataArray` descriptions and contents of the points and cells.
+        """
+        cellVertexIDs = numerix.MA.array(mesh._orderedCellVertexIDs)[..., cellIDs]
+        counts = (~numerix.MA.getmaskarray(cellVertexIDs)).sum(axis=0)
+        connectivity = numerix.MA.compressed(cellVertexIDs.swapaxes(0, 1))
+
+        # number only the vertices of the piece
+        vertexIDs, connectivity = numerix.unique(connectivity, return_inverse=True)
+
+        points = numerix.array(mesh.vertexCoords)[..., vertexIDs]
+        points = numerix.concatenate((points,
+                                      numerix.zeros((3 - mesh.dim,) + points.shape[1:])))
+
+        cellType = {1: _VTK_LINE,
+                    2: _VTK_POLYGON}.get(mesh.dim, _VTK_CONVEX_POINT_SET)
+
+        arrays = [("Points", None, 3, points.swapaxes(0, 1)),
+                  ("Cells", "connectivity", 1, connectivity.astype("int64")),
+                  ("Cells", "offsets", 1, numerix.cumsum(counts).astype("int64")),
+                  ("Cells", "types", 1, numerix.zeros(len(counts), dtype="uint8") + cellType)]
+
+        return (points.shape[-1], len(counts), [VTKSeriesViewer._encode(*array)
+                                                for array in arrays])
+
+    @staticmethod
+    def _encode(section, name, components, value):
+        value = numerix.asarray(value)
+        if value.dtype.kind == "b":
+            value = value.astype("uint8")
+        elif value.dtype.name not in _VTKTypes:
+            value = value.astype("float64")
+        dtype = _VTKTypes[value.dtype.name]
+        data = numerix.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<")).tobytes()
+
+        return (section, name, components, dtype, struct.pack("<Q", len(data)) + data)
+
+    def _encodeValues(self):
+        """Snapshot of the values of the variables in this piece"""
+        arrays = []
+        for var in self.vars:
+            value = numerix.array(var.value)[..., self._cellIDs]
+            if var.rank == 1:
+                value = numerix.concatenate((value,
+                                             numerix.zeros((3 - var.mesh.dim,)
+                                                           + value.shape[1:],
+                                                           dtype=value.dtype)))
+            value = value.reshape((-1, value.shape[-1]))
+            arrays.append(self._encode("CellData", self._name(var),
+                                       value.shape[0], value.swapaxes(0, 1)))
+
+        return arrays
+
+    @staticmethod
+    def _name(var):
+        return var.name or "%s #%d" % (var.__class__.__name__, id(var))
+
+    @staticmethod
+    def _dataArray(tag, name, components, dtype, offset=None):
+        attributes = ['type="%s"' % dtype]
+        if name is not None:
+            attributes.append('Name=%s' % quoteattr(name))
+        attributes.append('NumberOfComponents="%d"' % components)
+        if offset is not None:
+            attributes.append('format="appended" offset="%d"' % offset)
+        return "<%s %s/>" % (tag, " ".join(attributes))
+
+    def _sections(self, arrays, tag, offsets=None):
+        """XML of the `Points`, `Cells` and `CellData` of `arrays`"""
+        prefix = "P" if tag == "PDataArray" else ""
+
+        lines = []
+        for section in ["Points", "Cells", "CellData"]:
+            found = [(i, array) for i, array in enumerate(arrays) if array[0] == section]
+            if len(found) == 0 or (section == "Cells" and prefix):
+                continue
+            scalars = [array[1] for i, array in found if array[2] == 1]
+            if section == "CellData" and len(scalars) > 0:
+                lines.append("<%s%s Scalars=%s>" % (prefix, section, quoteattr(scalars[0])))
+            else:
+                lines.append("<%s%s>" % (prefix, section))
+            for i, (_, name, components, dtype, data) in found:
+                lines.append("  " + self._dataArray(tag, name, components, dtype,
+                                                    None if offsets is None else offsets[i]))
+            lines.append("</%s%s>" % (prefix, section))
+
+        return lines
+
+    def plot(self, filename=None, time=None):
+        """Add a step to a time series
+
+        Parameters
+        ----------
+        filename : str
+            Name of the `.pvd` collection to add the step to.  The pieces
+            and the parallel file of each step are written next to it.
+        time : float, optional
+            Time of the step.  Defaults to the number of the step.
+        """
+        if filename is None:
+            raise ValueError("%s needs the name of a .pvd file" % self.__class__.__name__)
+
+        mesh = self.vars[0].mesh
+        communicator = mesh.communicator
+
+        steps = self._collections.setdefault(filename, [])
+        step = len(steps)
+        if time is None:
+            time = step
+
+        base = os.path.splitext(filename)[0]
+        parallelName = "%s_%d.pvtu" % (base, step)
+        pieceNames = ["%s_%d_%d.vtu" % (base, step, proc)
+                      for proc in range(communicator.Nproc)]
+        steps.append((float(time), os.path.basename(parallelName)))
+
+        arrays = self._geometry + self._encodeValues()
+        backgroundOutput._submit(self._writePiece, pieceNames[communicator.procID], arrays)
+
+        if communicator.procID == 0:
+            backgroundOutput._submit(self._writeParallel, parallelName,
+                                     [os.path.basename(name) for name in pieceNames],
+                                     arrays)
+            backgroundOutput._submit(self._writeCollection, filename, list(steps))
+
+    _header = ('<?xml version="1.0"?>\n'
+               '<VTKFile type="%s" version="1.0" byte_order="LittleEndian" header_type="UInt64">\n')
+
+    def _writePiece(self, filename, arrays):
+        offsets = []
+        offset = 0
+        for array in arrays:
+            offsets.append(offset)
+            offset += len(array[-1])
+
+        lines = ["<UnstructuredGrid>",
+                 '<Piece NumberOfPoints="%d" NumberOfCells="%d">' % (self._numberOfPoints,
+                                                                     self._numberOfCells)]
+        lines += self._sections(arrays, "DataArray", offsets)
+        lines += ["</Piece>",
+                  "</UnstructuredGrid>"]
+
+        with open(filename, "wb") as f:
+            f.write((self._header % "UnstructuredGrid" + "\n".join(lines)
+                     + '\n<AppendedData encoding="raw">\n_').encode("utf-8"))
+            for array in arrays:
+                f.write(array[-1])
+            f.write(b"\n</AppendedData>\n</VTKFile>\n")
+
+    def _writeParallel(self, filename, pieceNames, arrays):
+        lines = ['<PUnstructuredGrid GhostLevel="0">']
+        lines += self._sections(arrays, "PDataArray")
+        lines += ['<Piece Source=%s/>' % quoteattr(name) for name in pieceNames]
+        lines += ["</PUnstructuredGrid>",
+                  "</VTKFile>"]
+
+        with open(filename, "wb") as f:
+            f.write((self._header % "PUnstructuredGrid" + "\n".join(lines) + "\n").encode("utf-8"))
+
+    def _writeCollection(self, filename, steps):
+        lines = ['<?xml version="1.0"?>',
+                 '<VTKFile type="Collection" version="0.1" byte_order="LittleEndian">',
+                 "<Collection>"]
+        lines += ['<DataSet timestep="%.15g" group="" part="0" file=%s/>' % (time, quoteattr(name))
+                  for time, name in steps]
+        lines += ["</Collection>",
+                  "</VTKFile>"]
+
+        with open(filename, "wb") as f:
+            f.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -80,15 +80,24 @@ class VTKViewer(AbstractViewer):
         return (name, rank, value)
 
     def plot(self, filename=None):
-        data = self._data
-
+        from fipy.tools import backgroundOutput
         from fipy.tools import numerix
 
+        # `_write` may happen in the background, after the variables change
+        values = []
         for var in self.vars:
             name, rank, value = self._nameRankValue(var)
 
             if not (numerix.array(value.shape) == 0).any():
-                data.get_array(name).to_array()[:] = value
+                values.append((name, numerix.array(value)))
+
+        backgroundOutput._submit(self._write, values, filename)
+
+    def _write(self, values, filename):
+        data = self._data
+
+        for name, value in values:
+            data.get_array(name).to_array()[:] = value
 
         try:
             from tvtk.misc import write_data